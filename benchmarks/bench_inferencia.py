@@ -0,0 +1,61 @@
+# ==========================================================================
+# Benchmark: pipeline sklearn x backend compilado (árvores achatadas)
+# ==========================================================================
+# Uso: python benchmarks/bench_inferencia.py [--linhas 100000] [--repeticoes 200]
+
+# Bibliotecas do Sistema e Utilitários
+import argparse      # Interpreta os argumentos da linha de comando
+import sys           # Permite registrar a raiz do projeto no caminho de importação
+import time          # Relógio de alta resolução
+from pathlib import Path # Manipulação de caminhos
+
+# Processamento e Manipulação de Dados
+import numpy as np   # Estatísticas dos tempos
+import pandas as pd  # Leitura da base de alunos
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1])) # Torna o pacote importável
+from pede_analytics.arvores import EnsembleCompilado # Backend compilado
+from pede_analytics.esquema import FEATURES_MODELO, FEATURES_NUM # Colunas do modelo
+from pede_analytics.modelo import RAIZ_PROJETO, carregar_modelo # Carga do pipeline
+
+def cronometrar(funcao, repeticoes): # Mede a mediana do tempo de uma função
+    tempos = [] # Tempos individuais em segundos
+    for _ in range(repeticoes): # Executa a função várias vezes
+        inicio = time.perf_counter() # Marca o início
+        funcao() # Executa a chamada medida
+        tempos.append(time.perf_counter() - inicio) # Registra a duração
+    return float(np.median(tempos)) # Mediana é robusta a ruídos do sistema
+
+def main(argv=None): # Ponto de entrada do benchmark
+    parser = argparse.ArgumentParser(description="Compara o predict_proba do sklearn com o backend compilado.")
+    parser.add_argument('--linhas', type=int, default=100_000, help="Tamanho do lote grande")
+    parser.add_argument('--repeticoes', type=int, default=200, help="Repetições para a linha única")
+    args = parser.parse_args(argv) # Lê os argumentos
+
+    pipeline = carregar_modelo() # Pipeline salvo pelo notebook
+    compilado = EnsembleCompilado(pipeline) # Compila as árvores uma única vez
+
+    base = pd.read_csv(RAIZ_PROJETO / 'data_processed' / 'df_unificado.csv').dropna(subset=FEATURES_NUM) # Alunos completos
+    base['DEFASAGEM'] = base['FASE'] - base['FASE_IDEAL'] # Mesma regra do formulário
+    base = base[FEATURES_MODELO].reset_index(drop=True) # Apenas os atributos do modelo
+    lote = base.sample(args.linhas, replace=True, random_state=123).reset_index(drop=True) # Lote sintético grande
+    linha = base.iloc[[0]] # Uma única linha (cenário do formulário)
+
+    # 1. Equivalência numérica
+    diferenca = np.abs(pipeline.predict_proba(lote) - compilado.predict_proba(lote)).max() # Maior desvio absoluto
+    print(f"Maior diferença de probabilidade em {len(lote):,} linhas: {diferenca:.3e}") # Deve ser < 1e-9
+    assert diferenca < 1e-9, "Backend compilado divergiu do sklearn" # Interrompe se a réplica não bater
+
+    # 2. Latência de uma linha
+    t_sk = cronometrar(lambda: pipeline.predict_proba(linha), args.repeticoes) # sklearn
+    t_cp = cronometrar(lambda: compilado.predict_proba(linha), args.repeticoes) # compilado
+    print(f"Linha única   | sklearn: {t_sk * 1e3:8.3f} ms | compilado: {t_cp * 1e3:8.3f} ms | ganho: {t_sk / t_cp:5.1f}x")
+
+    # 3. Vazão em lote
+    t_sk = cronometrar(lambda: pipeline.predict_proba(lote), 3) # sklearn
+    t_cp = cronometrar(lambda: compilado.predict_proba(lote), 3) # compilado
+    print(f"{len(lote):,} linhas | sklearn: {t_sk:8.3f} s  | compilado: {t_cp:8.3f} s  | ganho: {t_sk / t_cp:5.1f}x"
+          f" ({len(lote) / t_cp:,.0f} linhas/s)")
+
+if __name__ == "__main__": # Execução direta do script
+    main() # Executa o benchmark
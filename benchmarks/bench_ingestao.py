@@ -0,0 +1,91 @@
+# ==========================================================================
+# Benchmark: pd.read_excel x leitura em fluxo (openpyxl read_only) das abas PEDE
+# ==========================================================================
+# Uso: python benchmarks/bench_ingestao.py [--copias 20] [--tamanho-bloco 5000]
+#
+# Cada leitor roda em um subprocesso próprio para que o pico de memória (ru_maxrss) de um
+# não contamine o do outro. A planilha sintética repete as linhas de cada aba `--copias` vezes,
+# simulando uma base com várias escolas e anos.
+
+# Bibliotecas do Sistema e Utilitários
+import argparse      # Interpreta os argumentos da linha de comando
+import json          # Resultado do subprocesso
+import resource      # Pico de memória residente do processo
+import subprocess    # Isola cada medição
+import sys           # Permite registrar a raiz do projeto no caminho de importação
+import tempfile      # Pasta da planilha sintética
+import time          # Relógio de alta resolução
+from pathlib import Path # Manipulação de caminhos
+
+# Processamento e Manipulação de Dados
+from openpyxl import Workbook, load_workbook # Geração da planilha sintética
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1])) # Torna o pacote importável
+from pede_analytics.ingestao.incremental import CAMINHO_XLSX, LEITORES, PADRAO_ABA, abrir_planilha, processar_aba # Pipeline de ingestão
+from pede_analytics.ingestao.leitura import TAMANHO_BLOCO # Bloco padrão do leitor em fluxo
+
+def pico_mb(): # Pico de memória residente do processo atual
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024 # Linux informa em KiB
+
+def gerar_planilha(destino, copias): # Planilha maior com as mesmas abas e colunas
+    """Grava em `destino` as abas PEDE da planilha versionada com as linhas repetidas `copias` vezes."""
+    origem = load_workbook(CAMINHO_XLSX, read_only=True, data_only=True) # Leitura em fluxo da original
+    saida = Workbook(write_only=True) # Escrita em fluxo (memória constante)
+    try:
+        for planilha in origem.worksheets: # Cada aba da planilha original
+            linhas = planilha.iter_rows(values_only=True) # Valores da aba
+            nova = saida.create_sheet(planilha.title) # Mesma aba na cópia
+            nova.append(next(linhas)) # Cabeçalho uma única vez
+            dados = list(linhas) # Linhas originais (planilha pequena)
+            for _ in range(copias): # Replica as linhas
+                for linha in dados: nova.append(linha)
+        saida.save(destino) # Grava o .xlsx sintético
+    finally:
+        origem.close() # Libera a planilha original
+
+def medir(caminho, leitor, tamanho_bloco): # Executado dentro do subprocesso
+    """Processa todas as abas PEDE com `leitor` e devolve tempo, linhas e memória."""
+    base = pico_mb() # Memória após as importações
+    inicio = time.perf_counter() # Marca o início (inclui a abertura do arquivo)
+    planilha = abrir_planilha(caminho, leitor) # Uma abertura para todas as abas, como em `atualizar`
+    try:
+        nomes = planilha.sheet_names if leitor == 'pandas' else planilha.sheetnames # Índice de abas
+        abas = {aba: int(m.group(1)) for aba in nomes if (m := PADRAO_ABA.fullmatch(aba.strip()))} # Abas anuais
+        linhas = sum(processar_aba(planilha, aba, ano, leitor, tamanho_bloco).num_rows for aba, ano in abas.items()) # Todas as abas
+    finally:
+        planilha.close() # Libera o arquivo
+    tempo = time.perf_counter() - inicio # Duração total
+    return {'leitor': leitor, 'tempo': tempo, 'linhas': linhas, 'base_mb': base, 'pico_mb': pico_mb()} # Resultado
+
+def main(argv=None): # Ponto de entrada do benchmark
+    parser = argparse.ArgumentParser(description="Compara pd.read_excel com a leitura em fluxo das abas PEDE.")
+    parser.add_argument('--copias', type=int, default=20, help="Repetições das linhas de cada aba na planilha sintética")
+    parser.add_argument('--tamanho-bloco', type=int, default=TAMANHO_BLOCO, help="Linhas por bloco do leitor em fluxo")
+    parser.add_argument('--medir', choices=LEITORES, help=argparse.SUPPRESS) # Modo interno do subprocesso
+    parser.add_argument('--arquivo', help=argparse.SUPPRESS) # Planilha medida pelo subprocesso
+    args = parser.parse_args(argv) # Lê os argumentos
+
+    if args.medir: # Subprocesso: mede um único leitor e devolve JSON
+        print(json.dumps(medir(args.arquivo, args.medir, args.tamanho_bloco)))
+        return
+
+    with tempfile.TemporaryDirectory() as pasta: # Planilha sintética descartável
+        caminho = Path(pasta) / 'pede_sintetica.xlsx' # Destino da planilha
+        inicio = time.perf_counter() # Marca o início da geração
+        gerar_planilha(caminho, args.copias) # Base ampliada
+        print(f"Planilha sintética ({args.copias}x): {caminho.stat().st_size / 1e6:.1f} MB em {time.perf_counter() - inicio:.1f}s")
+
+        resultados = {} # leitor -> medição
+        for leitor in ('pandas', 'fluxo'): # Referência primeiro
+            comando = [sys.executable, __file__, '--medir', leitor, '--arquivo', str(caminho), '--tamanho-bloco', str(args.tamanho_bloco)]
+            saida = subprocess.run(comando, check=True, capture_output=True, text=True).stdout # Processo isolado
+            r = resultados[leitor] = json.loads(saida.strip().splitlines()[-1]) # Última linha é o JSON
+            print(f"{leitor:<6} | {r['linhas']:>9,} linhas | {r['tempo']:7.2f} s | pico RSS: {r['pico_mb']:7.1f} MB"
+                  f" (+{r['pico_mb'] - r['base_mb']:6.1f} MB sobre as importações)")
+
+    ref, novo = resultados['pandas'], resultados['fluxo'] # Comparação final
+    print(f"Ganho | tempo: {ref['tempo'] / novo['tempo']:4.1f}x | memória adicional:"
+          f" {(ref['pico_mb'] - ref['base_mb']) / max(novo['pico_mb'] - novo['base_mb'], 1e-9):4.1f}x menor")
+
+if __name__ == "__main__": # Execução direta do script
+    main() # Executa o benchmark
@@ -0,0 +1,130 @@
+# ==========================================================================
+# Teste de carga: serviço HTTP de pontuação com e sem micro-lotes
+# ==========================================================================
+# Uso: python benchmarks/bench_servico.py [--concorrencias 1 8 32 64] [--duracao 5] [--espera-ms 5]
+#      python benchmarks/bench_servico.py --assincrono --trabalhadores 1 2 4 8  # Frente asyncio + processos
+#      python benchmarks/bench_servico.py --url http://127.0.0.1:8000   # Serviço já em execução
+#
+# Sem --url, sobe o serviço com threads duas vezes em subprocessos: com `--max-lote 1` (um
+# predict_proba por requisição) e com micro-lotes; com --assincrono, sobe o serviço asyncio uma
+# vez para cada quantidade de processos. Cada cliente é uma thread com conexão persistente
+# enviando um aluno por requisição, como o sistema de gestão escolar faria. Os clientes também
+# disputam a CPU: para medir muitos núcleos, rode o gerador de carga em outra máquina com --url.
+
+# Bibliotecas do Sistema e Utilitários
+import argparse      # Interpreta os argumentos da linha de comando
+import http.client   # Conexões keep-alive leves para os clientes
+import json          # Corpo das requisições
+import socket        # Porta livre para o serviço
+import subprocess    # Serviço em processo próprio
+import sys           # Permite registrar a raiz do projeto no caminho de importação
+import threading     # Clientes concorrentes
+import time          # Relógio de alta resolução
+from pathlib import Path # Manipulação de caminhos
+from urllib.parse import urlsplit # Host e porta do --url
+
+# Processamento e Manipulação de Dados
+import numpy as np   # Percentis das latências
+import pandas as pd  # Leitura da base de alunos
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1])) # Torna o pacote importável
+from pede_analytics.esquema import FEATURES_MODELO, FEATURES_NUM # Colunas do modelo
+from pede_analytics.modelo import RAIZ_PROJETO # Base de alunos
+from pede_analytics.servico import ESPERA_MS # Janela padrão do micro-lote
+
+def corpos_alunos(): # Um corpo JSON por aluno completo
+    base = pd.read_csv(RAIZ_PROJETO / 'data_processed' / 'df_unificado.csv').dropna(subset=FEATURES_NUM) # Alunos completos
+    base['DEFASAGEM'] = base['FASE'] - base['FASE_IDEAL'] # Mesma regra do formulário
+    return [json.dumps(r).encode('utf-8') for r in json.loads(base[FEATURES_MODELO].to_json(orient='records'))]
+
+def porta_livre(): # Porta efêmera escolhida pelo sistema
+    with socket.socket() as s:
+        s.bind(('127.0.0.1', 0))
+        return s.getsockname()[1]
+
+def consultar(host, porta, metodo, rota, corpo=None, conexao=None): # Uma requisição JSON
+    conexao = conexao or http.client.HTTPConnection(host, porta, timeout=30) # Reaproveita a conexão do cliente
+    conexao.request(metodo, rota, body=corpo, headers={'Content-Type': 'application/json'})
+    resposta = conexao.getresponse() # Lê status e corpo
+    return resposta.status, json.loads(resposta.read())
+
+def subir_servico(modulo, argumentos): # Serviço em subprocesso; retorna (processo, porta)
+    porta = porta_livre() # Porta exclusiva desta configuração
+    processo = subprocess.Popen([sys.executable, '-m', modulo, '--porta', str(porta), *argumentos],
+                                cwd=RAIZ_PROJETO, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL) # Logs descartados
+    limite = time.perf_counter() + 300 # Carga do modelo + importações (+ aquecimento dos processos)
+    while time.perf_counter() < limite: # Aguarda /saude responder
+        try:
+            consultar('127.0.0.1', porta, 'GET', '/saude')
+            return processo, porta # Pronto
+        except OSError: time.sleep(0.2)
+    processo.kill() # Não subiu a tempo
+    raise RuntimeError("O serviço não respondeu em /saude.")
+
+def carga(host, porta, corpos, concorrencia, duracao): # Clientes simultâneos por `duracao` segundos
+    latencias, erros = [[] for _ in range(concorrencia)], [0] * concorrencia # Resultados por cliente (sem trava)
+    prazo = time.perf_counter() + duracao # Fim do teste
+
+    def cliente(i): # Uma thread com conexão persistente
+        conexao = http.client.HTTPConnection(host, porta, timeout=30) # Keep-alive
+        j = i # Alunos diferentes por cliente
+        while time.perf_counter() < prazo: # Até o fim do teste
+            inicio = time.perf_counter() # Latência vista pelo cliente
+            status, _ = consultar(host, porta, 'POST', '/prever', corpos[j % len(corpos)], conexao)
+            latencias[i].append(time.perf_counter() - inicio)
+            if status != 200: erros[i] += 1
+            j += concorrencia
+
+    antes = consultar(host, porta, 'GET', '/metricas')[1] # Contadores antes da carga
+    threads = [threading.Thread(target=cliente, args=(i,)) for i in range(concorrencia)] # Clientes
+    inicio = time.perf_counter() # Marca o início
+    for t in threads: t.start()
+    for t in threads: t.join()
+    segundos = time.perf_counter() - inicio # Duração real
+    depois = consultar(host, porta, 'GET', '/metricas')[1] # Contadores depois da carga
+    tempos = np.concatenate([np.asarray(l) for l in latencias]) * 1000 # Todas as latências em ms
+    lotes = max(depois['lotes'] - antes['lotes'], 1) # Lotes avaliados durante o teste
+    return {
+        'Clientes': concorrencia, 'Req/s': len(tempos) / segundos, 'p50 (ms)': np.percentile(tempos, 50),
+        'p95 (ms)': np.percentile(tempos, 95), 'p99 (ms)': np.percentile(tempos, 99),
+        'Pedidos/lote': (depois['requisicoes'] - antes['requisicoes']) / lotes, 'Erros': sum(erros),
+    } # Encerra a linha
+
+def main(argv=None): # Ponto de entrada do benchmark
+    parser = argparse.ArgumentParser(description="Vazão e latência do serviço de pontuação sob concorrência.")
+    parser.add_argument('--url', help="Serviço já em execução (mede apenas ele)")
+    parser.add_argument('--concorrencias', type=int, nargs='+', default=[1, 8, 32, 64], help="Clientes simultâneos")
+    parser.add_argument('--duracao', type=float, default=5.0, help="Segundos de carga por nível de concorrência")
+    parser.add_argument('--espera-ms', type=float, default=ESPERA_MS, help="Janela do micro-lote do serviço testado")
+    parser.add_argument('--assincrono', action='store_true', help="Testa pede_analytics.servico_assincrono")
+    parser.add_argument('--trabalhadores', type=int, nargs='+', default=[1], help="Processos do serviço assíncrono")
+    args = parser.parse_args(argv) # Lê os argumentos
+
+    corpos = corpos_alunos() # Um aluno por requisição
+    if args.url: # Alvo externo
+        alvo = urlsplit(args.url)
+        configuracoes = [(args.url, None, alvo.hostname, alvo.port or 80)]
+    else: # Sobe as configurações comparadas
+        if args.assincrono: # Uma configuração por quantidade de processos
+            variantes = [(f'asyncio + {n} processo(s)', 'pede_analytics.servico_assincrono',
+                          ['--trabalhadores', str(n), '--espera-ms', str(args.espera_ms)]) for n in args.trabalhadores]
+        else: # Serviço com threads, com e sem micro-lotes
+            variantes = [('sem micro-lote', 'pede_analytics.servico', ['--max-lote', '1', '--espera-ms', '0']),
+                         (f'micro-lote {args.espera_ms:g} ms', 'pede_analytics.servico', ['--espera-ms', str(args.espera_ms)])]
+        configuracoes = [] # (rótulo, processo, host, porta)
+        for rotulo, modulo, argumentos in variantes: # Todos os serviços sobem antes da carga
+            processo, porta = subir_servico(modulo, argumentos)
+            configuracoes.append((rotulo, processo, '127.0.0.1', porta))
+
+    try: # Encerra os subprocessos mesmo em caso de erro
+        for rotulo, _, host, porta in configuracoes: # Uma tabela por configuração
+            carga(host, porta, corpos, 4, 1.0) # Aquecimento (conexões, caches do modelo)
+            tabela = pd.DataFrame([carga(host, porta, corpos, c, args.duracao) for c in args.concorrencias])
+            print(f"\n== {rotulo} ==")
+            print(tabela.to_string(index=False, float_format='{:.1f}'.format))
+    finally:
+        for _, processo, _, _ in configuracoes: # Apenas os subprocessos deste script
+            if processo is not None: processo.terminate(); processo.wait()
+
+if __name__ == "__main__": # Execução direta do script
+    main() # Executa o benchmark
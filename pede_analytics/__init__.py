@@ -0,0 +1 @@
+"""Biblioteca de apoio do PEDE Analytics (modelo de risco, dados e dashboard da Passos Mágicos)."""
@@ -0,0 +1,122 @@
+# ==========================================================================
+# Agregados do dashboard por combinação de filtros
+# ==========================================================================
+
+# Processamento e Manipulação de Dados
+import numpy as np   # Reamostragem vetorizada do bootstrap
+import pandas as pd  # Ferramenta principal para criação e manipulação de DataFrames
+
+# Módulos do projeto
+from pede_analytics.esquema import ORDEM_PEDRAS # Jornada evolutiva usada nos gráficos
+
+INDICADORES_ELITE = ['IDA', 'IEG', 'IPS', 'IPP'] # Pilares do perfil da elite (Q8)
+INDICADORES_PEDRA = ['INDE', 'IDA', 'IEG', 'IPS', 'IPP'] # Médias por pedra (Q10)
+INDICADORES_CORRELACAO = ['IDA', 'IEG', 'IPS', 'IAA', 'IPP', 'IPV'] # Correlação com o INDE (Q7)
+INDICADORES_SINTESE = ['IDA', 'IEG', 'IAA', 'IPS', 'IPP', 'IPV'] # Correlações da síntese final
+
+METODOS_IC = ('analitico', 'bootstrap') # Intervalos das barras de média (analítico por padrão)
+N_BOOTSTRAP = 1000 # Reamostragens do modo bootstrap (mesmo padrão do seaborn)
+SEMENTE_BOOTSTRAP = 42 # Semente fixa: o mesmo filtro sempre gera o mesmo intervalo
+
+# ==========================================================================
+# Filtros
+# ==========================================================================
+
+def normalizar_filtro(anos, pedras, generos): # Chave canônica da combinação de filtros
+    """Retorna (anos, pedras, gêneros) como tuplas ordenadas; nenhuma pedra selecionada equivale a todas (None)."""
+    return ( # Ordem de seleção nos widgets não altera a chave
+        tuple(sorted(int(a) for a in anos)),
+        tuple(sorted(pedras)) if pedras else None,
+        tuple(sorted(generos)),
+    ) # Encerra a chave
+
+def filtrar_base(df, filtro): # Aplica a chave de filtros à base
+    """Seleciona as linhas da combinação de filtros (sem cópia extra)."""
+    anos, pedras, generos = filtro # Desempacota a chave
+    mascara = df['ANO'].isin(anos) & df['GENERO'].isin(generos) # Anos e gêneros
+    if pedras is not None: mascara &= df['PEDRA'].isin(pedras) # Pedras (None = todas)
+    return df[mascara] # Subconjunto filtrado
+
+# ==========================================================================
+# Agregados
+# ==========================================================================
+
+def _por_ano(contagens, nome): # Ano como texto (eixo discreto) e faixa com o nome usado no gráfico
+    return contagens.rename(columns={'FAIXA': nome}).assign(ANO=lambda d: d['ANO'].astype(str))
+
+def _bootstrap_medias(df, valor, por, nivel=0.95, n_boot=N_BOOTSTRAP, semente=SEMENTE_BOOTSTRAP): # Intervalo percentil
+    """Mesmo formato de `CuboPEDE.medias_ic`, com o intervalo percentil de `n_boot` reamostragens (semente fixa)."""
+    rng = np.random.default_rng(semente) # Reprodutível entre execuções
+    linhas = {} # grupo -> (N, média, EP, IC_INF, IC_SUP)
+    for grupo, serie in df.groupby(por, observed=True)[valor]: # Cada grupo
+        x = serie.dropna().to_numpy(dtype=float) # Valores válidos
+        if len(x) == 0: continue # Grupo sem valores
+        medias = x[rng.integers(0, len(x), (n_boot, len(x)))].mean(axis=1) # Todas as reamostragens de uma vez
+        inf, sup = np.percentile(medias, [50 * (1 - nivel), 50 * (1 + nivel)]) # Percentis do intervalo
+        linhas[grupo] = (len(x), x.mean(), medias.std(ddof=1), inf, sup)
+    return pd.DataFrame.from_dict(linhas, orient='index', columns=['N', valor, 'EP', 'IC_INF', 'IC_SUP']).rename_axis(por)
+
+def _perfil_elite(df): # Médias da base geral vs Top 20% do INDE (Q8)
+    df_8 = df.dropna(subset=INDICADORES_ELITE + ['INDE']) # Filtra nulos essenciais
+    if df_8.empty: return None # Dados insuficientes para a comparação
+    limiar = df_8['INDE'].quantile(0.8) # Nota de corte dos melhores
+    grupos = {'Média Geral': df_8, 'Alunos Alta Performance (Top 20%)': df_8[df_8['INDE'] >= limiar]} # Os dois grupos
+    return pd.concat([ # Formato longo (Indicador, Nota, Grupo)
+        g[INDICADORES_ELITE].mean().rename_axis('Indicador').reset_index(name='Nota').assign(Grupo=nome)
+        for nome, g in grupos.items()
+    ]) # Encerra a concatenação
+
+def _agregados_chegada(cubo, sel, linhas, ic): # Ato I (Q1 e Q6)
+    return { # Tabelas do ato
+        'ian_por_ano': _por_ano(cubo.contagens(sel, 'IAN'), 'IAN_Descricao'), # Q1 (inclui N/A)
+        'ipp_por_ian': cubo.medias(sel, ['IPP'], por='IAN_FAIXA', condicao='IAN')
+                           .reindex(['Sev. Defasado', 'Mod. Defasado', 'Adequado']).rename_axis('IAN_Descricao').reset_index(), # Q6
+    } # Encerra o dicionário
+
+def _agregados_desenvolvimento(cubo, sel, linhas, ic): # Ato II (Q2, Q3 e Q4)
+    return { # Tabelas do ato
+        'ida_por_ano': _por_ano(cubo.contagens(sel, 'IDA', incluir_na=False), 'IDA_Categoria'), # Q2
+        'ieg_por_pv': cubo.medias(sel, ['IEG'], por='PONTO_VIRADA').reindex(['Não', 'Sim']).rename_axis('PONTO_VIRADA').reset_index(), # Q3
+        'iaa': cubo.densidade(sel, 'IAA'), # Q4 (densidade subjetiva, por FFT sobre as contagens do cubo)
+        'ida': cubo.densidade(sel, 'IDA'), # Q4 (densidade objetiva)
+    } # Encerra o dicionário
+
+def _agregados_virada(cubo, sel, linhas, ic): # Ato III (Q5 e Q7)
+    return { # Tabelas do ato
+        'ips_por_ano': _por_ano(cubo.contagens(sel, 'IPS', populacao='psicossocial', incluir_na=False), 'IPS_Nivel'), # Q5
+        'correl_pv': cubo.correlacoes(sel, INDICADORES_CORRELACAO).sort_values(ascending=False), # Q7
+    } # Encerra o dicionário
+
+def _agregados_consolidacao(cubo, sel, linhas, ic): # Ato IV (Q8 e Q10)
+    medias_pedra = cubo.medias(sel, INDICADORES_PEDRA, por='PEDRA').reindex(ORDEM_PEDRAS) # Médias por pedra
+    return { # Tabelas do ato
+        'perfil_elite': _perfil_elite(linhas()), # Q8 (corte no quantil 80% do INDE)
+        'medias_pedra': medias_pedra.rename_axis('PEDRA').reset_index().melt(id_vars='PEDRA', var_name='Indicador', value_name='Média'), # Q10
+    } # Encerra o dicionário
+
+def _agregados_sintese(cubo, sel, linhas, ic): # Ato V (síntese final)
+    if ic == 'bootstrap': # Pedido explícito: reamostra as linhas (memoizado com o restante do ato)
+        ips_pedra = _bootstrap_medias(linhas().dropna(subset=INDICADORES_SINTESE), 'IPS', 'PEDRA') # Intervalo percentil
+    else: # Padrão: erro-padrão a partir das somas do cubo (sem ler linhas)
+        ips_pedra = cubo.medias_ic(sel, 'IPS', por='PEDRA', populacao='sintese') # Intervalo normal
+    return { # Tabelas do ato
+        'correl_inde': cubo.correlacoes(sel, INDICADORES_SINTESE, populacao='sintese').sort_values(ascending=False), # Âncoras do INDE
+        'ips_pedra': ips_pedra.reindex(ORDEM_PEDRAS).rename_axis('PEDRA').reset_index(), # Média e intervalo do IPS por pedra
+    } # Encerra o dicionário
+
+AGREGADOS_POR_ATO = { # Identificador do ato -> tabelas que ele desenha
+    'chegada': _agregados_chegada,
+    'desenvolvimento': _agregados_desenvolvimento,
+    'virada': _agregados_virada,
+    'consolidacao': _agregados_consolidacao,
+    'sintese': _agregados_sintese,
+} # Encerra o registro
+
+def calcular_agregados(cubo, df, filtro, ato, ic='analitico'): # Tabelas-resumo de um único ato
+    """Monta as tabelas do `ato` a partir do cubo (roll-up sobre células).
+
+    Apenas o perfil da elite (corte no quantil 80% do INDE) e o intervalo por bootstrap
+    (`ic='bootstrap'`) leem as linhas filtradas de `df`, e só quando o ato as desenha.
+    """
+    sel = cubo.selecionar(filtro) # Células da combinação de filtros
+    return AGREGADOS_POR_ATO[ato](cubo, sel, lambda: filtrar_base(df, filtro), ic) # Linhas filtradas sob demanda
@@ -0,0 +1,218 @@
+# ==========================================================================
+# Backend compilado (árvores achatadas) para o GradientBoosting
+# ==========================================================================
+
+# Processamento e Manipulação de Dados
+import numpy as np   # Biblioteca para cálculos matemáticos e operações com arrays
+import pandas as pd  # Índices de categorias para a tabela de one-hot
+from scipy.sparse import csr_matrix # Folhas alcançadas como matriz esparsa (explicações)
+from scipy.special import expit # Função logística usada pelo sklearn para log_loss
+
+# Aprendizado de Máquina
+from sklearn.ensemble import GradientBoostingClassifier # Tipo de classificador suportado
+from sklearn.preprocessing import OneHotEncoder, StandardScaler # Transformadores suportados
+
+TAMANHO_BLOCO = 2048 # Linhas avaliadas por vez (limita a memória das matrizes linhas x árvores)
+MAX_BITS_TABELA = 10 # Árvores com até 10 nós de decisão usam tabela de folhas (até 1024 entradas por árvore)
+
+# ==========================================================================
+# Ensemble compilado
+# ==========================================================================
+
+class EnsembleCompilado: # Réplica vetorizada de Pipeline(preprocessor, GradientBoostingClassifier)
+    """Exporta as árvores do pipeline para arrays NumPy e avalia todas as árvores de uma vez.
+
+    O pré-processamento vira uma transformação afim fixa (StandardScaler) mais uma tabela de
+    consulta para o one-hot. As comparações seguem o sklearn (entrada em float32, limiares em
+    float64), de modo que `predict_proba` coincide com o do pipeline (diferença < 1e-9).
+    Árvores rasas (como as de profundidade 3 do modelo final) são avaliadas por tabela de folhas;
+    árvores maiores descem nível a nível sobre os arrays (feature, limiar, esquerda, direita, valor).
+    `contribuicoes` explica cada linha por atributo original sobre as mesmas estruturas.
+    """
+
+    def __init__(self, pipeline): # Compila o pipeline carregado por carregar_modelo()
+        self._compilar_preprocessamento(pipeline.named_steps['preprocessor']) # Afim + tabela de one-hot
+        self._compilar_arvores(pipeline.named_steps['classifier']) # Arrays planos das árvores
+
+    # ----------------------------------------------------------------------
+    # Compilação
+    # ----------------------------------------------------------------------
+
+    def _compilar_preprocessamento(self, preprocessor): # Extrai parâmetros do ColumnTransformer
+        self.colunas_num, self.colunas_cat = [], [] # Colunas de entrada de cada bloco
+        self.categorias = [] # Índice pandas de categorias por coluna categórica
+        for nome, transformador, colunas in preprocessor.transformers_: # Percorre os blocos ajustados
+            if transformador == 'drop' or nome == 'remainder': continue # Colunas descartadas pelo pipeline
+            if isinstance(transformador, StandardScaler): # Bloco numérico
+                self.colunas_num = list(colunas) # Ordem das colunas escalonadas
+                n = len(colunas) # Quantidade de atributos numéricos
+                self.media = transformador.mean_ if transformador.with_mean else np.zeros(n) # Deslocamento
+                self.escala = transformador.scale_ if transformador.with_std else np.ones(n) # Divisor
+            elif isinstance(transformador, OneHotEncoder) and transformador.drop_idx_ is None: # Bloco categórico
+                self.colunas_cat = list(colunas) # Ordem das colunas codificadas
+                self.categorias = [pd.Index(c) for c in transformador.categories_] # Tabela categoria -> posição
+            else: # Qualquer outro transformador não é suportado pelo backend
+                raise TypeError(f"Transformador não suportado pelo backend compilado: {transformador!r}")
+
+        # Deslocamento de cada coluna categórica dentro da matriz transformada (após os numéricos)
+        tamanhos = [len(c) for c in self.categorias] # Quantidade de colunas one-hot por atributo
+        self.inicio_cat = len(self.colunas_num) + np.concatenate([[0], np.cumsum(tamanhos)[:-1]]).astype(int) # Início de cada bloco
+        self.n_atributos = len(self.colunas_num) + sum(tamanhos) # Largura da matriz transformada
+        self.campos = self.colunas_num + self.colunas_cat # Atributos originais (uma contribuição por campo)
+        self.campo_atributo = np.concatenate([np.arange(len(self.colunas_num)), # Coluna transformada -> campo original
+                                              np.repeat(np.arange(len(self.colunas_cat)) + len(self.colunas_num), tamanhos)]).astype(np.intp)
+
+    def _compilar_arvores(self, gb): # Achata as árvores em arrays (árvore, nó)
+        if not isinstance(gb, GradientBoostingClassifier) or gb.n_classes_ != 2: # Somente o caso binário do projeto
+            raise TypeError("O backend compilado suporta apenas GradientBoostingClassifier binário.")
+
+        arvores = [e.tree_ for e in gb.estimators_[:, 0]] # Uma árvore de regressão por estágio
+        n_nos = max(a.node_count for a in arvores) # Tamanho do preenchimento
+        n_arv = len(arvores) # Quantidade de árvores
+        self.feature = np.zeros((n_arv, n_nos), dtype=np.intp) # Atributo testado em cada nó
+        self.limiar = np.full((n_arv, n_nos), np.inf) # Limiar (x <= limiar vai para a esquerda)
+        self.esquerda = np.tile(np.arange(n_nos), (n_arv, 1)) # Folhas apontam para si mesmas
+        self.direita = self.esquerda.copy() # Idem para o filho direito
+        self.valor = np.zeros((n_arv, n_nos)) # Valor de saída (já multiplicado pela taxa de aprendizado)
+        self.esperado = np.zeros((n_arv, n_nos)) # Média ponderada das folhas abaixo de cada nó (explicações)
+        self.caminho = np.zeros((n_arv, n_nos, len(self.campos))) # Contribuição acumulada por campo da raiz até cada nó
+
+        for t, a in enumerate(arvores): # Copia cada árvore para as matrizes
+            n = a.node_count # Nós reais da árvore
+            internos = a.children_left[:n] != -1 # Máscara de nós de decisão
+            self.feature[t, :n] = np.where(internos, a.feature[:n], 0) # Atributo (0 nas folhas)
+            self.limiar[t, :n] = np.where(internos, a.threshold[:n], np.inf) # Limiar (inf nas folhas)
+            self.esquerda[t, :n] = np.where(internos, a.children_left[:n], np.arange(n)) # Filho esquerdo
+            self.direita[t, :n] = np.where(internos, a.children_right[:n], np.arange(n)) # Filho direito
+            self.valor[t, :n] = gb.learning_rate * a.value[:n, 0, 0] # Contribuição já escalonada
+            self.esperado[t, :n] = self._esperado(a, self.valor[t, :n]) # Valor esperado de cada nó
+            for no in range(n): # Pais antes dos filhos: o caminho do filho estende o do pai
+                if internos[no]: # Decisão atribuída ao campo testado
+                    for filho in (a.children_left[no], a.children_right[no]):
+                        self.caminho[t, filho] = self.caminho[t, no]
+                        self.caminho[t, filho, self.campo_atributo[a.feature[no]]] += self.esperado[t, filho] - self.esperado[t, no]
+
+        self.profundidade = max(a.max_depth for a in arvores) # Iterações necessárias para chegar às folhas
+        self.idx_arvores = np.arange(n_arv) # Índice auxiliar para indexação vetorizada
+        self.base = float(gb._raw_predict_init(np.zeros((1, self.n_atributos), dtype=np.float32))[0, 0]) # Log-odds inicial
+
+        n_bits = max(int((a.children_left != -1).sum()) for a in arvores) # Nós de decisão da maior árvore
+        self.tabela = self._compilar_tabela(arvores, n_bits) if n_bits <= MAX_BITS_TABELA else None # Árvores rasas
+
+    @staticmethod
+    def _esperado(arvore, valor): # Valor esperado da saída em cada nó
+        """Recalcula os nós internos como média das folhas ponderada pelas amostras de treino.
+
+        O sklearn substitui só as folhas pelo passo de Newton; os nós internos guardam a média do
+        gradiente e não somam com as folhas. Os filhos têm índice maior que o pai, então uma
+        passada em ordem reversa resolve a árvore de baixo para cima.
+        """
+        esperado = valor.copy() # Folhas mantêm o valor real
+        pesos = arvore.weighted_n_node_samples # Amostras (ponderadas) em cada nó
+        for no in range(arvore.node_count - 1, -1, -1): # Das folhas para a raiz
+            esq, dir_ = arvore.children_left[no], arvore.children_right[no] # Filhos do nó
+            if esq != -1: esperado[no] = (pesos[esq] * esperado[esq] + pesos[dir_] * esperado[dir_]) / (pesos[esq] + pesos[dir_])
+        return esperado # Valor esperado por nó
+
+    def _compilar_tabela(self, arvores, n_bits): # Tabela de folhas indexada pelos bits de decisão
+        """Cada nó de decisão vira um bit; a folha de cada árvore passa a ser uma consulta em tabela.
+
+        As comparações distintas (atributo, limiar) são avaliadas uma vez para todas as árvores e o
+        código de bits de cada árvore é obtido por um único produto matricial (R @ pesos).
+        """
+        pares = {} # (atributo, limiar) -> coluna da matriz de comparações
+        tamanho = 2 ** n_bits # Entradas por árvore
+        pesos = [] # Triplas (par, árvore, 2^bit)
+        tabela = np.zeros((len(arvores), tamanho)) # Valor da folha para cada código de bits
+        folhas = np.zeros((len(arvores), tamanho), dtype=np.intp) # Nó folha para cada código de bits (explicações)
+
+        for t, a in enumerate(arvores): # Percorre as árvores
+            internos = np.flatnonzero(a.children_left != -1) # Nós de decisão
+            bit = {no: k for k, no in enumerate(internos)} # Posição do bit de cada nó
+            for no, k in bit.items(): # Registra a comparação de cada nó
+                par = pares.setdefault((a.feature[no], a.threshold[no]), len(pares)) # Reaproveita comparações repetidas
+                pesos.append((par, t, 2 ** k)) # Bit ligado quando o nó manda para a direita
+            for codigo in range(tamanho): # Resolve a folha de cada combinação de bits
+                no = 0 # Começa na raiz
+                while a.children_left[no] != -1: # Desce até uma folha
+                    no = a.children_right[no] if (codigo >> bit[no]) & 1 else a.children_left[no]
+                tabela[t, codigo] = self.valor[t, no] # Valor já escalonado pela taxa de aprendizado
+                folhas[t, codigo] = no # Folha alcançada
+
+        self.tabela_no = (folhas + np.arange(len(arvores))[:, None] * self.feature.shape[1]).ravel() # Índice plano (árvore x nó)
+        self.pares_feature = np.array([p[0] for p in pares], dtype=np.intp) # Atributo de cada comparação
+        self.pares_limiar = np.array([p[1] for p in pares]) # Limiar de cada comparação
+        self.pesos = np.zeros((len(pares), len(arvores)), dtype=np.float32) # Inteiros exatos em float32 (< 2^24)
+        for par, t, peso in pesos: self.pesos[par, t] += peso # Monta a matriz de pesos
+        self.deslocamento = (np.arange(len(arvores)) * tamanho).astype(np.float32) # Início de cada árvore na tabela plana
+        return tabela.ravel() # Tabela plana (árvore x código)
+
+    # ----------------------------------------------------------------------
+    # Avaliação
+    # ----------------------------------------------------------------------
+
+    def transformar(self, df): # Equivalente ao preprocessor.transform (matriz densa float32)
+        """Aplica a transformação afim e a tabela de one-hot; retorna matriz float32 (linhas x atributos)."""
+        n = len(df) # Quantidade de linhas
+        x = np.zeros((n, self.n_atributos), dtype=np.float32) # Matriz transformada (mesmo dtype das árvores)
+        num = df[self.colunas_num].to_numpy(dtype=float) # Atributos numéricos em float64
+        x[:, :len(self.colunas_num)] = (num - self.media) / self.escala # Mesmas operações do StandardScaler
+        linhas = np.arange(n) # Índice de linhas para o one-hot
+        for col, cats, inicio in zip(self.colunas_cat, self.categorias, self.inicio_cat): # Cada atributo categórico
+            codigos = cats.get_indexer(df[col].to_numpy(dtype=object)) # -1 para nulos ou categorias desconhecidas
+            validos = codigos >= 0 # handle_unknown='ignore': linha inteira zerada
+            x[linhas[validos], inicio + codigos[validos]] = 1.0 # Liga a coluna one-hot correspondente
+        return x # Matriz pronta para as árvores
+
+    def decisao(self, x): # Log-odds para a matriz já transformada
+        """Avalia todas as árvores para todas as linhas de forma vetorizada e soma as folhas."""
+        saida = np.empty(len(x)) # Log-odds por linha
+        avaliar = self._folhas_tabela if self.tabela is not None else self._folhas_percurso # Estratégia compilada
+        for ini in range(0, len(x), TAMANHO_BLOCO): # Processa em blocos para limitar memória
+            saida[ini:ini + TAMANHO_BLOCO] = self.base + avaliar(x[ini:ini + TAMANHO_BLOCO]).sum(axis=1) # Soma das folhas
+        return saida # Log-odds finais
+
+    def _codigos(self, bloco): # Posição de cada (linha, árvore) na tabela plana
+        direita = (bloco[:, self.pares_feature] > self.pares_limiar).astype(np.float32) # Comparações distintas
+        return (direita @ self.pesos + self.deslocamento).astype(np.int32) # Código de bits + início da árvore
+
+    def _folhas_tabela(self, bloco): # Valor da folha de cada árvore via tabela de bits
+        return np.take(self.tabela, self._codigos(bloco)) # Consulta na tabela plana
+
+    def _nos_percurso(self, bloco): # Folha alcançada em cada árvore descendo nível a nível
+        linhas = np.arange(len(bloco))[:, None] # Índice de linhas (coluna)
+        no = np.zeros((len(bloco), len(self.idx_arvores)), dtype=np.intp) # Todos começam na raiz
+        for _ in range(self.profundidade): # Um nível por iteração (folhas ficam paradas)
+            valores = bloco[linhas, self.feature[self.idx_arvores, no]] # Valor do atributo testado
+            esquerda = valores <= self.limiar[self.idx_arvores, no] # Regra de divisão do sklearn
+            no = np.where(esquerda, self.esquerda[self.idx_arvores, no], self.direita[self.idx_arvores, no]) # Desce um nível
+        return no # Nó folha por (linha, árvore)
+
+    def _folhas_percurso(self, bloco): # Valor da folha de cada árvore descendo nível a nível
+        return self.valor[self.idx_arvores, self._nos_percurso(bloco)] # Valor da folha alcançada
+
+    def contribuicoes(self, df): # Explicação aditiva por caminho de decisão (método de Saabas)
+        """Retorna (viés, matriz linhas x `campos`) em log-odds, com viés + soma da linha = decisão do modelo.
+
+        Cada nó atravessado atribui ao campo testado a variação do valor esperado entre o nó e o filho
+        escolhido; as colunas one-hot somam no campo original (PEDRA, INSTITUICAO_ENSINO...). Como o
+        caminho só depende da folha, a soma por folha (`caminho`) é pré-calculada e a explicação de um
+        lote vira a localização das folhas (a mesma da predição) e um produto esparso.
+        """
+        x = self.transformar(df) # Mesma matriz da predição
+        caminho = self.caminho.reshape(-1, len(self.campos)) # (árvore x nó) -> contribuições por campo
+        n_arv = len(self.idx_arvores) # Uma folha por árvore em cada linha
+        saida = np.empty((len(x), len(self.campos))) # Contribuições por linha
+        for ini in range(0, len(x), TAMANHO_BLOCO): # Processa em blocos para limitar memória
+            bloco = x[ini:ini + TAMANHO_BLOCO] # Linhas do bloco
+            if self.tabela is not None: folhas = np.take(self.tabela_no, self._codigos(bloco)) # Árvores rasas
+            else: folhas = self._nos_percurso(bloco) + self.idx_arvores * self.feature.shape[1] # Índice plano
+            alcancadas = csr_matrix((np.ones(folhas.size), folhas.ravel(), np.arange(0, folhas.size + 1, n_arv)),
+                                    shape=(len(bloco), len(caminho))) # Linha x folha alcançada
+            saida[ini:ini + TAMANHO_BLOCO] = alcancadas @ caminho # Soma dos caminhos de todas as árvores
+        return self.base + self.esperado[:, 0].sum(), saida # Viés comum a todas as linhas
+
+    def predict_proba(self, df): # Mesmo contrato do Pipeline.predict_proba
+        """Retorna matriz (linhas x 2) com as probabilidades das classes 0 e 1."""
+        p = expit(self.decisao(self.transformar(df))) # Função logística sobre os log-odds
+        return np.column_stack([1 - p, p]) # Colunas na ordem de classes_ (0, 1)
@@ -0,0 +1,75 @@
+# ==========================================================================
+# Cache LRU em memória compartilhado pelo app
+# ==========================================================================
+
+# Bibliotecas do Sistema e Utilitários
+import threading     # Sessões do Streamlit rodam em threads distintas
+from collections import OrderedDict # Ordem de uso para a política LRU
+
+# ==========================================================================
+# Cache LRU
+# ==========================================================================
+
+class CacheLRU: # Dicionário limitado que descarta o item usado há mais tempo
+    """Cache thread-safe com no máximo `max_itens` entradas (política LRU).
+
+    Com `max_bytes`, o total medido por `tamanho(valor)` também é limitado; um valor maior que o
+    limite inteiro é devolvido sem ser armazenado.
+    """
+
+    def __init__(self, max_itens=32, max_bytes=None, tamanho=len): # Capacidade em entradas (e opcionalmente em bytes)
+        self.max_itens = max_itens # Limite de entradas
+        self.max_bytes = max_bytes # Limite de bytes (None = sem limite)
+        self._tamanho = tamanho # Mede o valor armazenado (ex.: len de bytes)
+        self._itens = OrderedDict() # chave -> valor, do menos para o mais recente
+        self._bytes = {} # chave -> tamanho do valor (apenas com max_bytes)
+        self.bytes = 0 # Total de bytes ocupados
+        self._trava = threading.Lock() # Protege a ordem LRU entre threads
+        self.acertos = 0 # Consultas atendidas pelo cache
+        self.falhas = 0 # Consultas que precisaram calcular
+
+    def obter(self, chave, calcular): # Consulta com cálculo sob demanda
+        """Retorna o valor em cache para `chave`; na ausência, executa `calcular()` e armazena."""
+        with self._trava: # Consulta e atualização da ordem
+            if chave in self._itens: # Acerto
+                self._itens.move_to_end(chave) # Marca como usado recentemente
+                self.acertos += 1 # Contabiliza o acerto
+                return self._itens[chave] # Valor já calculado
+            self.falhas += 1 # Contabiliza a falha
+        valor = calcular() # Cálculo fora da trava (não bloqueia outras sessões)
+        self.armazenar(chave, valor) # Guarda o resultado
+        return valor # Valor recém-calculado
+
+    def consultar(self, chave, padrao=None): # Consulta sem cálculo (lotes resolvem as falhas de uma vez)
+        """Retorna o valor em cache para `chave` ou `padrao`, contabilizando acerto ou falha."""
+        with self._trava: # Consulta e atualização da ordem
+            if chave in self._itens: # Acerto
+                self._itens.move_to_end(chave) # Marca como usado recentemente
+                self.acertos += 1 # Contabiliza o acerto
+                return self._itens[chave] # Valor já calculado
+            self.falhas += 1 # Contabiliza a falha
+            return padrao # Quem chamou calcula e armazena
+
+    def armazenar(self, chave, valor): # Inclusão direta
+        tamanho = self._tamanho(valor) if self.max_bytes is not None else 0 # Mede fora da trava
+        if self.max_bytes is not None and tamanho > self.max_bytes: return # Nunca caberia no cache
+        with self._trava: # Atualização protegida
+            self.bytes += tamanho - self._bytes.pop(chave, 0) # Substituição desconta o valor anterior
+            self._itens[chave] = valor # Inclui ou substitui
+            self._itens.move_to_end(chave) # Item mais recente
+            if self.max_bytes is not None: self._bytes[chave] = tamanho # Registra o tamanho
+            while len(self._itens) > self.max_itens or (self.max_bytes is not None and self.bytes > self.max_bytes): # Excedeu a capacidade
+                antiga, _ = self._itens.popitem(last=False) # Descarta o usado há mais tempo
+                self.bytes -= self._bytes.pop(antiga, 0) # Libera seus bytes
+
+    def limpar(self): # Esvazia o cache
+        with self._trava:
+            self._itens.clear() # Remove todas as entradas
+            self._bytes.clear() # Zera os tamanhos
+            self.bytes = 0 # Nenhum byte ocupado
+
+    def __len__(self): # Quantidade de entradas
+        return len(self._itens)
+
+    def __contains__(self, chave): # Consulta sem alterar a ordem LRU
+        return chave in self._itens
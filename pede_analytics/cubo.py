@@ -0,0 +1,178 @@
+# ==========================================================================
+# Cubo OLAP de estatísticas suficientes (ANO x PEDRA x GENERO)
+# ==========================================================================
+
+# Bibliotecas do Sistema e Utilitários
+from statistics import NormalDist # Quantil da normal para o intervalo de confiança
+
+# Processamento e Manipulação de Dados
+import numpy as np   # Somas, produtos cruzados e histogramas por célula
+import pandas as pd  # Tabela de células e resultados dos roll-ups
+
+# Módulos do projeto
+from pede_analytics.densidade import kde_binada # KDE por FFT sobre os histogramas
+from pede_analytics.indicadores import REGRAS_INDICADORES, categorias_indicador, classificar_serie # Faixas dos indicadores
+
+# ==========================================================================
+# Constantes
+# ==========================================================================
+
+DIMENSOES_FILTRO = ['ANO', 'PEDRA', 'GENERO'] # Filtros da barra lateral
+DIMENSOES_ANALISE = ['PONTO_VIRADA', 'IAN_FAIXA'] # Agrupamentos usados pelos gráficos (IEG x virada, IPP x IAN)
+DIMENSOES = DIMENSOES_FILTRO + DIMENSOES_ANALISE # Chave de cada célula do cubo
+VARIAVEIS = ['IDA', 'IEG', 'IAA', 'IPS', 'IPP', 'IPV', 'INDE', 'IAN'] # Indicadores com estatísticas suficientes
+
+# Populações: linhas completas nas colunas listadas (replicam os dropna dos gráficos)
+POPULACOES = { # nome -> colunas obrigatórias
+    'todos': [], # Base filtrada inteira (estatísticas pareadas, como o pandas)
+    'psicossocial': ['IPS', 'IDA', 'IEG'], # Distribuição do IPS por ano
+    'sintese': ['IDA', 'IEG', 'IAA', 'IPS', 'IPP', 'IPV'], # Correlação e gap da síntese final
+} # Encerra as populações
+
+LIMITES_HISTOGRAMA = (0.0, 10.0) # Escala das notas do PEDE
+N_BINS = 200 # Intervalos de 0,05 ponto: N_BINS + 1 nós (valores fora da escala vão para as pontas)
+
+# ==========================================================================
+# Cubo
+# ==========================================================================
+
+class CuboPEDE: # Estatísticas suficientes por célula; filtros viram somas sobre células
+    """Materializa, por célula (ANO, PEDRA, GENERO, PONTO_VIRADA, faixa de IAN), contagens,
+    somas, somas de quadrados e produtos cruzados pareados dos indicadores, contagens por faixa
+    histogramas (binagem linear) em grade fixa de 0 a 10 e extremos de cada indicador.
+
+    Qualquer seleção de filtros é um roll-up sobre as poucas dezenas de células: o custo por
+    interação não depende da quantidade de alunos nem de anos carregados.
+    """
+
+    def __init__(self, df): # Constrói o cubo a partir da base tipada do dashboard
+        df = df.assign(IAN_FAIXA=classificar_serie(df['IAN'], 'IAN')) # Faixa de IAN como dimensão de análise
+        grupos = df.groupby(DIMENSOES, observed=True, sort=True) # Apenas células com alunos
+        self.celulas = grupos.size().rename('LINHAS').reset_index() # Tabela de células (uma linha por célula)
+        celula = grupos.ngroup().to_numpy() # Célula de cada aluno
+        n_cel, n_var = len(self.celulas), len(VARIAVEIS) # Dimensões dos arrays
+
+        x = df[VARIAVEIS].to_numpy(dtype=float) # Indicadores em float64 (somas sem perda)
+        presente = ~np.isnan(x) # Máscara de valores válidos
+        x = np.where(presente, x, 0.0) # Zeros não alteram as somas
+        ordem = np.argsort(celula, kind='stable') # Alunos agrupados por célula
+        inicios = np.searchsorted(celula[ordem], np.arange(n_cel)) # Primeira linha de cada célula (todas não vazias)
+        por_celula = lambda a, b: np.add.reduceat((a[:, :, None] * b[:, None, :])[ordem], inicios, axis=0) # Soma de a_i * b_j por célula
+
+        self.estatisticas = {} # populacao -> (N, S, Q, P), cada um (células, variável, variável)
+        self.faixas = {} # (populacao, indicador) -> contagens (células, faixas + N/A)
+        for nome, obrigatorias in POPULACOES.items(): # Uma família de estatísticas por população
+            linha_ok = df[obrigatorias].notna().all(axis=1).to_numpy() if obrigatorias else np.ones(len(df), bool) # Linhas da população
+            m = presente & linha_ok[:, None] # Valores válidos dentro da população
+            xm = x * m # Valores fora da população zerados
+            self.estatisticas[nome] = ( # Estatísticas pareadas (i, j): calculadas onde i e j estão presentes
+                por_celula(m.astype(float), m.astype(float)), # N_ij: contagem pareada
+                por_celula(xm, m.astype(float)), # S_ij: soma de x_i
+                por_celula(xm ** 2, m.astype(float)), # Q_ij: soma de x_i^2
+                por_celula(xm, xm), # P_ij: soma de x_i * x_j
+            ) # Encerra a tupla
+            for ind in REGRAS_INDICADORES: # Contagens por faixa (inclui N/A) dentro da população
+                if ind not in df.columns: continue # Indicador ausente na base
+                codigos = classificar_serie(df[ind], ind).cat.codes.to_numpy()[linha_ok] # Faixa de cada aluno
+                contagem = np.zeros((n_cel, len(categorias_indicador(ind)))) # Células x faixas
+                np.add.at(contagem, (celula[linha_ok], codigos), 1) # Acumula por célula e faixa
+                self.faixas[(nome, ind)] = contagem
+
+        r, v = np.nonzero(presente) # Apenas valores presentes
+        posicao = np.clip((x[r, v] - LIMITES_HISTOGRAMA[0]) / (LIMITES_HISTOGRAMA[1] - LIMITES_HISTOGRAMA[0]) * N_BINS, 0, N_BINS) # Posição na grade de nós
+        no = np.minimum(posicao.astype(int), N_BINS - 1) # Nó à esquerda
+        peso = posicao - no # Fração atribuída ao nó à direita (binagem linear)
+        self.histogramas = np.zeros((n_cel, n_var, N_BINS + 1)) # Células x variável x nó (população completa)
+        np.add.at(self.histogramas, (celula[r], v, no), 1 - peso) # Parte do nó à esquerda
+        np.add.at(self.histogramas, (celula[r], v, no + 1), peso) # Parte do nó à direita
+        self.minimos = np.full((n_cel, n_var), np.inf) # Extremos por célula (suporte da densidade)
+        self.maximos = np.full((n_cel, n_var), -np.inf)
+        np.minimum.at(self.minimos, (celula[r], v), x[r, v]) # Mínimo combinável entre células
+        np.maximum.at(self.maximos, (celula[r], v), x[r, v]) # Máximo combinável entre células
+
+    # ----------------------------------------------------------------------
+    # Seleção e roll-up
+    # ----------------------------------------------------------------------
+
+    def selecionar(self, filtro): # Máscara de células para a chave de filtros do dashboard
+        """Converte (anos, pedras ou None, gêneros) na máscara booleana das células selecionadas."""
+        anos, pedras, generos = filtro # Mesma chave de agregados.normalizar_filtro
+        sel = self.celulas['ANO'].isin(anos) & self.celulas['GENERO'].isin(generos) # Anos e gêneros
+        if pedras is not None: sel &= self.celulas['PEDRA'].isin(pedras) # Pedras (None = todas)
+        return sel.to_numpy() # Máscara sobre as células
+
+    def _grupos(self, mascara, por): # Células selecionadas agrupadas por uma dimensão
+        selecionadas = np.flatnonzero(mascara) # Índices globais das células
+        if por is None: return {None: selecionadas} # Um único grupo
+        return {k: selecionadas[v] for k, v in self.celulas.iloc[selecionadas].groupby(por, observed=True).indices.items()} # Por valor da dimensão
+
+    def somar(self, mascara, populacao='todos'): # Roll-up das estatísticas suficientes
+        """Retorna (N, S, Q, P) somados sobre as células da máscara (matrizes variável x variável)."""
+        return tuple(a[mascara].sum(axis=0) for a in self.estatisticas[populacao]) # Soma sobre as células
+
+    def linhas(self, mascara): # Quantidade de alunos selecionados
+        return int(self.celulas.loc[mascara, 'LINHAS'].sum())
+
+    # ----------------------------------------------------------------------
+    # Estatísticas derivadas
+    # ----------------------------------------------------------------------
+
+    def medias(self, mascara, variaveis, por=None, populacao='todos', condicao=None): # Médias (ignora nulos, como o pandas)
+        """Médias das `variaveis` por grupo da dimensão `por`; `condicao` restringe às linhas em que ela está presente."""
+        idx = [VARIAVEIS.index(v) for v in variaveis] # Posições das variáveis
+        linhas = {} # grupo -> médias
+        for grupo, cel in self._grupos(mascara, por).items(): # Cada grupo de células
+            n, s, _, _ = (a[cel].sum(axis=0) for a in self.estatisticas[populacao]) # Roll-up do grupo
+            j = VARIAVEIS.index(condicao) if condicao else None # Variável que precisa estar presente
+            num = np.array([s[i, j if j is not None else i] for i in idx]) # Soma de x_i
+            den = np.array([n[i, j if j is not None else i] for i in idx]) # Contagem de x_i
+            with np.errstate(invalid='ignore', divide='ignore'): linhas[grupo] = num / den # NaN para grupos vazios
+        if por is None: return pd.Series(linhas[None], index=variaveis) # Resultado simples
+        return pd.DataFrame.from_dict(linhas, orient='index', columns=variaveis).rename_axis(por) # Uma linha por grupo
+
+    def medias_ic(self, mascara, variavel, por, populacao='todos', nivel=0.95): # Médias com intervalo analítico
+        """Contagem, média, erro-padrão (desvio amostral / raiz de n) e intervalo normal de nível `nivel` por grupo."""
+        i = VARIAVEIS.index(variavel) # Posição da variável
+        z = NormalDist().inv_cdf(0.5 + nivel / 2) # 1,96 para 95%
+        linhas = {} # grupo -> (N, média, EP, IC_INF, IC_SUP)
+        for grupo, cel in self._grupos(mascara, por).items(): # Cada grupo de células
+            n, s, q = (a[cel, i, i].sum() for a in self.estatisticas[populacao][:3]) # Roll-up de N, soma e soma de quadrados
+            media = s / n if n else np.nan # Média do grupo
+            ep = np.sqrt(max(q - s * media, 0.0) / (n - 1) / n) if n > 1 else np.nan # Erro-padrão da média
+            linhas[grupo] = (n, media, ep, media - z * ep, media + z * ep) # Intervalo simétrico
+        return pd.DataFrame.from_dict(linhas, orient='index', columns=['N', variavel, 'EP', 'IC_INF', 'IC_SUP']).rename_axis(por)
+
+    def correlacoes(self, mascara, variaveis, alvo='INDE', populacao='todos'): # Pearson pareado com o alvo
+        """Correlação de cada variável com `alvo` sobre os pares presentes (equivale a `corrwith`)."""
+        n, s, q, p = self.somar(mascara, populacao) # Roll-up
+        t = VARIAVEIS.index(alvo) # Posição do alvo
+        valores = [] # Correlações
+        for v in variaveis: # Fórmula de Pearson a partir das somas
+            i = VARIAVEIS.index(v) # Posição da variável
+            nn, si, st_, qi, qt, pit = n[i, t], s[i, t], s[t, i], q[i, t], q[t, i], p[i, t] # Somas pareadas
+            cov = nn * pit - si * st_ # n² * covariância
+            var = (nn * qi - si ** 2) * (nn * qt - st_ ** 2) # n⁴ * variância_i * variância_alvo
+            valores.append(cov / np.sqrt(var) if nn > 1 and var > 0 else np.nan) # NaN quando indefinida
+        return pd.Series(valores, index=variaveis) # Mesmo formato do corrwith
+
+    def contagens(self, mascara, indicador, por='ANO', populacao='todos', incluir_na=True): # Distribuição por faixa
+        """Formato longo (por, faixa, Quantidade) das faixas do indicador, pronto para histplot(weights=...)."""
+        categorias = categorias_indicador(indicador) # Faixas do pior ao melhor, N/A ao final
+        tabela = pd.DataFrame( # Células selecionadas x faixas
+            self.faixas[(populacao, indicador)][mascara], columns=categorias,
+        ).groupby(self.celulas.loc[mascara, por].to_numpy()).sum() # Roll-up pela dimensão
+        if not incluir_na: tabela = tabela.drop(columns='N/A') # Remove os ausentes
+        longo = tabela.rename_axis(por).reset_index().melt(id_vars=por, var_name='FAIXA', value_name='Quantidade') # Formato longo
+        longo['FAIXA'] = pd.Categorical(longo['FAIXA'], categories=categorias, ordered=True) # Mantém a ordem das faixas
+        return longo[longo['Quantidade'] > 0].sort_values([por, 'FAIXA']).reset_index(drop=True) # Só combinações observadas
+
+    def histograma(self, mascara, variavel): # Contagens na grade fixa de 0 a 10
+        """Contagens por binagem linear nos N_BINS + 1 nós da grade, somadas sobre as células selecionadas."""
+        return self.histogramas[mascara, VARIAVEIS.index(variavel)].sum(axis=0) # Roll-up dos bins
+
+    def densidade(self, mascara, variavel, **opcoes): # KDE sem ler as linhas
+        """Curva (grade, densidade) da KDE gaussiana da variável sobre as células selecionadas (ver `kde_binada`)."""
+        i = VARIAVEIS.index(variavel) # Posição da variável
+        n, s, q = (a[mascara, i, i].sum() for a in self.estatisticas['todos'][:3]) # Mesmos valores do histograma
+        minimo, maximo = self.minimos[mascara, i].min(initial=np.inf), self.maximos[mascara, i].max(initial=-np.inf) # Extremos combinados
+        return kde_binada(self.histograma(mascara, variavel), n, s, q, minimo, maximo, limites=LIMITES_HISTOGRAMA, **opcoes) # Convolução por FFT
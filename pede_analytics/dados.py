@@ -0,0 +1,94 @@
+# ==========================================================================
+# Camada de dados do dashboard (cópia Parquet local com tipos compactos)
+# ==========================================================================
+
+# Bibliotecas do Sistema e Utilitários
+import logging       # Registro da origem e do tempo de carga da base
+import time          # Mede o tempo de carregamento
+from pathlib import Path # Manipulação de caminhos independente do diretório de execução
+
+# Processamento e Manipulação de Dados
+import pandas as pd  # Ferramenta principal para criação e manipulação de DataFrames
+import pyarrow as pa # Conversão para tabelas Arrow com metadados
+import pyarrow.parquet as pq # Leitura e escrita do arquivo colunar
+
+# Módulos do projeto
+from pede_analytics.esquema import ORDEM_PEDRAS # Ordem da jornada para a categoria PEDRA
+from pede_analytics.registro import sha256_arquivo # Impressão digital do CSV de origem
+
+logger = logging.getLogger(__name__) # Logger do módulo
+
+# ==========================================================================
+# Constantes
+# ==========================================================================
+
+DIRETORIO_DADOS = Path(__file__).resolve().parents[1] / 'data_processed' # Pasta da base tratada
+CAMINHO_CSV = DIRETORIO_DADOS / 'df_unificado.csv' # Fonte versionada no repositório
+CAMINHO_PARQUET = DIRETORIO_DADOS / 'df_unificado.parquet' # Cópia local gerada (fora do git)
+URL_CSV = "https://raw.githubusercontent.com/geoferreira1/fiap_tech_challenge_fase_5/main/data_processed/df_unificado.csv" # Último recurso
+CHAVE_ORIGEM = b'pede_origem_sha256' # Metadado do Parquet com o SHA-256 do CSV que o gerou
+
+CATEGORIAS_PEDRA = ORDEM_PEDRAS + ['NÃO CLASSIFICADO'] # Jornada evolutiva (sem pedra ao final)
+COLUNAS_CATEGORICAS = ['RA', 'GENERO', 'PONTO_VIRADA', 'INSTITUICAO_ENSINO'] # Texto repetitivo vira dicionário
+COLUNAS_INTEIRAS = {'ANO': 'int16', 'ANO_INGRESSO': 'int16', 'FASE': 'int8', 'FASE_IDEAL': 'int8', 'DEFASAGEM': 'int8', 'IDADE': 'int8'} # Faixas pequenas
+COLUNAS_INDICADORES = ['INDE', 'IAA', 'IEG', 'IPS', 'IDA', 'IPV', 'IAN', 'IPP'] # Notas de 0 a 10 (float32 basta)
+
+# ==========================================================================
+# Preparação
+# ==========================================================================
+
+def preparar_base(df): # Saneamento e tipagem usados pelo dashboard
+    """Aplica o saneamento do dashboard e converte para categorias, int8/int16 (float32 se houver nulos) e float32."""
+    df = df.copy() # Evita alterar o DataFrame do chamador
+    df['IDADE'] = pd.to_numeric(df['IDADE'], errors='coerce').fillna(0) # Idade ausente vira 0 (como no dashboard)
+    df['GENERO'] = df['GENERO'].astype(str).str.capitalize() # Padroniza gênero com a primeira letra em maiúscula
+    df['PEDRA'] = pd.Categorical(df['PEDRA'].fillna('NÃO CLASSIFICADO'), categories=CATEGORIAS_PEDRA, ordered=True) # Ordem da jornada
+    df['PONTO_VIRADA'] = df['PONTO_VIRADA'].fillna('Não Inf.') # Nulos do ponto de virada como informação inexistente
+
+    for col in COLUNAS_CATEGORICAS: # Colunas de texto com poucos valores distintos
+        df[col] = df[col].astype('category') # Códigos inteiros + dicionário
+    for col, tipo in COLUNAS_INTEIRAS.items(): # Inteiros de faixa pequena
+        valores = pd.to_numeric(df[col], errors='coerce') # Texto não reconhecido vira NaN (como em padronizar_colunas)
+        inteiros = valores.notna().all() and (valores % 1 == 0).all() # int8/int16 só quando os valores permitem
+        df[col] = valores.astype(tipo if inteiros else 'float32') # Reduz de 8 para 1-2 bytes (ou 4 com nulos)
+    df[COLUNAS_INDICADORES] = df[COLUNAS_INDICADORES].astype('float32') # Notas com 1e-7 de precisão (não altera as faixas)
+    return df # Base pronta para o dashboard
+
+# ==========================================================================
+# Carga
+# ==========================================================================
+
+def _origem_parquet(caminho): # Lê o SHA-256 gravado no Parquet sem carregar os dados
+    try: # Arquivo ausente ou corrompido equivale a cópia desatualizada
+        return (pq.read_schema(caminho).metadata or {}).get(CHAVE_ORIGEM, b'').decode() # Apenas o rodapé do arquivo
+    except (OSError, pa.ArrowException):
+        return None # Força a regeneração
+
+def gerar_parquet(csv=CAMINHO_CSV, parquet=CAMINHO_PARQUET): # Regera a cópia colunar a partir do CSV
+    """Lê o CSV, aplica `preparar_base` e grava o Parquet com o SHA-256 da origem nos metadados."""
+    df = preparar_base(pd.read_csv(csv)) # Base tipada
+    tabela = pa.Table.from_pandas(df, preserve_index=False) # Mantém categorias e tipos no esquema pandas
+    metadados = {**(tabela.schema.metadata or {}), CHAVE_ORIGEM: sha256_arquivo(csv).encode()} # Vincula à origem
+    temporario = Path(parquet).with_suffix('.tmp') # Escreve ao lado e renomeia
+    pq.write_table(tabela.replace_schema_metadata(metadados), temporario) # Grava a cópia
+    temporario.replace(parquet) # Troca atômica (outro processo nunca lê arquivo pela metade)
+    return df # Evita reler o arquivo recém-gravado
+
+def carregar_base(csv=CAMINHO_CSV, parquet=CAMINHO_PARQUET, url=URL_CSV): # Ponto de entrada do dashboard
+    """Retorna a base tipada; lê o Parquet local e só o regera quando o CSV de origem muda."""
+    inicio = time.perf_counter() # Marca o início da carga
+    csv, parquet = Path(csv), Path(parquet) # Normaliza os caminhos
+
+    if csv.exists(): # Caminho normal: CSV versionado no repositório
+        if _origem_parquet(parquet) == sha256_arquivo(csv): # Cópia em dia com a origem
+            df, origem = pd.read_parquet(parquet), f"Parquet local {parquet.name}" # Leitura colunar
+        else: # Primeira execução ou CSV alterado
+            df, origem = gerar_parquet(csv, parquet), f"CSV {csv.name} (Parquet regerado)"
+    elif parquet.exists(): # Sem CSV, mas com cópia local
+        df, origem = pd.read_parquet(parquet), f"Parquet local {parquet.name} (CSV ausente)"
+    else: # Sem nenhuma cópia local: último recurso remoto
+        df, origem = preparar_base(pd.read_csv(url)), "GitHub"
+
+    logger.info("Base carregada de %s em %.0f ms (%d linhas, %.2f MB)", origem, (time.perf_counter() - inicio) * 1000,
+                len(df), df.memory_usage(deep=True).sum() / 1e6)
+    return df # DataFrame compacto para os filtros e gráficos
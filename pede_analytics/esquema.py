@@ -0,0 +1,43 @@
+# ==========================================================================
+# Esquema de atributos do modelo de risco de defasagem
+# ==========================================================================
+
+# Bibliotecas do Sistema e Utilitários
+import unicodedata   # Utilizado para normalizar textos e remover acentos de strings
+
+# ==========================================================================
+# Colunas esperadas pelo pipeline treinado no notebook
+# ==========================================================================
+
+FEATURES_NUM = ['IDADE', 'FASE', 'FASE_IDEAL', 'IAA', 'IEG', 'IPS', 'IDA', 'IPV', 'IPP'] # Atributos escalonados pelo StandardScaler
+FEATURES_CAT = ['GENERO', 'PEDRA', 'PONTO_VIRADA', 'INSTITUICAO_ENSINO'] # Atributos codificados pelo OneHotEncoder
+
+FEATURES_MODELO = [ # Ordem das colunas montadas pelo formulário get_clinic_input()
+    'IDADE', 'GENERO', 'IDA', 'IEG', 'IAA', 'IPS', 'PONTO_VIRADA', 'PEDRA', 'DEFASAGEM', 'FASE',
+    'FASE_IDEAL', 'IPP', 'IPV', 'INSTITUICAO_ENSINO'
+] # Encerra a lista de atributos do modelo
+
+ORDEM_PEDRAS = ['QUARTZO', 'AGATA', 'AMETISTA', 'TOPAZIO'] # Jornada evolutiva (do ingresso à pedra mais alta)
+
+# Variações de nomes encontradas nas planilhas PEDE e nas bases exportadas
+ALIASES_COLUNAS = { # Nome normalizado -> nome técnico do modelo
+    'GENERO': 'GENERO', 'SEXO': 'GENERO',
+    'IDADE': 'IDADE', 'IDADE_22': 'IDADE',
+    'FASE': 'FASE', 'FASE_ATUAL': 'FASE',
+    'FASE_IDEAL': 'FASE_IDEAL', 'NIVEL_IDEAL': 'FASE_IDEAL',
+    'DEFASAGEM': 'DEFASAGEM', 'DEFAS': 'DEFASAGEM',
+    'PEDRA': 'PEDRA',
+    'PONTO_VIRADA': 'PONTO_VIRADA', 'ATINGIU_PV': 'PONTO_VIRADA',
+    'INSTITUICAO_ENSINO': 'INSTITUICAO_ENSINO', 'INSTITUICAO_DE_ENSINO': 'INSTITUICAO_ENSINO',
+    'IDA': 'IDA', 'IEG': 'IEG', 'IAA': 'IAA', 'IPS': 'IPS', 'IPP': 'IPP', 'IPV': 'IPV'
+} # Encerra o dicionário de sinônimos
+
+# ==========================================================================
+# Funções de Suporte
+# ==========================================================================
+
+def normalizar_nome_coluna(nome): # Padroniza o nome de uma coluna para consulta no dicionário de sinônimos
+    """Remove acentos, espaços e pontuação do nome da coluna (ex.: 'Instituição de ensino' -> 'INSTITUICAO_DE_ENSINO')."""
+    texto = unicodedata.normalize('NFKD', str(nome)).encode('ASCII', 'ignore').decode('ascii') # Remove acentos
+    texto = ''.join(c if c.isalnum() else '_' for c in texto.strip().upper()) # Troca separadores por underline
+    return '_'.join(p for p in texto.split('_') if p) # Remove underlines duplicados
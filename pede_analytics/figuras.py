@@ -0,0 +1,85 @@
+# ==========================================================================
+# Cache de figuras renderizadas (bytes PNG por gráfico, filtros e tema)
+# ==========================================================================
+
+# Bibliotecas do Sistema e Utilitários
+import io            # Buffer em memória para o PNG
+
+# Processamento e Manipulação de Dados
+import numpy as np   # Limite infinito das bordas fixas do eixo
+
+# Visualização de Dados
+import matplotlib.pyplot as plt # Fechamento explícito das figuras
+from matplotlib.colors import to_rgba # Cores com transparência do preenchimento
+import seaborn as sns           # Barras a partir de tabelas-resumo
+
+# Módulos do projeto
+from pede_analytics.cache import CacheLRU # LRU limitado por bytes
+
+# ==========================================================================
+# Constantes
+# ==========================================================================
+
+DPI = 200 # Mesma resolução usada pelo st.pyplot
+MAX_BYTES_FIGURAS = 64 * 1024 * 1024 # Teto de memória das imagens em cache (~600 gráficos)
+MAX_FIGURAS = 1024 # Teto de entradas (protege contra muitas imagens minúsculas)
+
+# ==========================================================================
+# Renderização
+# ==========================================================================
+
+def renderizar_png(fig, dpi=DPI): # Rasteriza uma vez e libera a figura
+    """Codifica `fig` em PNG (mesmas opções do st.pyplot) e fecha a figura, mesmo em caso de erro."""
+    buffer = io.BytesIO() # Destino da imagem
+    try: # A figura nunca fica registrada no pyplot
+        fig.savefig(buffer, format='png', dpi=dpi, bbox_inches='tight') # Rasterização
+    finally:
+        plt.close(fig) # Libera a figura (evita acúmulo em servidores longos)
+    return buffer.getvalue() # Bytes imutáveis, prontos para st.image
+
+def barras_com_ic(ax, resumo, x, y, ordem, paleta='Set2', inferior='IC_INF', superior='IC_SUP'): # Barras de médias pré-calculadas
+    """Desenha as médias de `resumo` (uma linha por categoria) com as barras de erro do intervalo, no visual do seaborn."""
+    sns.barplot(data=resumo, x=x, y=y, hue=x, order=ordem, hue_order=ordem, palette=paleta, legend=False, errorbar=None, ax=ax) # Sem reamostragem
+    posicoes = {categoria: i for i, categoria in enumerate(ordem)} # Posição de cada barra no eixo
+    for _, linha in resumo.dropna(subset=[inferior, superior]).iterrows(): # Uma linha vertical por barra
+        if linha[x] not in posicoes: continue # Categoria fora da ordem exibida
+        i = posicoes[linha[x]] # Centro da barra
+        ax.plot([i, i], [linha[inferior], linha[superior]], color='.26', linewidth=1.5 * plt.rcParams['lines.linewidth']) # Mesmo traço do seaborn
+    return ax # Eixo com as barras
+
+def curva_densidade(ax, curva, cor, rotulo): # Densidade pré-calculada com o visual do sns.kdeplot(fill=True)
+    """Desenha a curva (grade, densidade) preenchida; `None` (dados insuficientes) não desenha nada, como o seaborn."""
+    if curva is None: return ax # Nada a desenhar
+    grade, densidade = curva # Suporte e densidade
+    area = ax.fill_between(grade, 0, densidade, facecolor=to_rgba(cor, 0.25), edgecolor=to_rgba(cor, 1), label=rotulo) # Mesmo estilo do kdeplot
+    area.sticky_edges.y[:] = (0, np.inf) # Eixo Y começa em zero, sem margem
+    if not ax.get_ylabel(): ax.set_ylabel('Density') # Rótulo padrão do seaborn
+    return ax # Eixo com a curva
+
+class CacheFiguras: # Gráficos renderizados por (id do gráfico, chave de filtros, tema)
+    """LRU de imagens PNG limitado por bytes: cada gráfico é desenhado uma vez por combinação."""
+
+    def __init__(self, max_bytes=MAX_BYTES_FIGURAS, max_itens=MAX_FIGURAS): # Limites de memória
+        self._cache = CacheLRU(max_itens=max_itens, max_bytes=max_bytes) # bytes -> len
+
+    def obter(self, id_grafico, chave, tema, desenhar): # Consulta com desenho sob demanda
+        """Retorna o PNG do gráfico; na ausência, chama `desenhar()` (que devolve a figura) e renderiza."""
+        return self._cache.obter((id_grafico, chave, tema), lambda: renderizar_png(desenhar())) # Figura fechada após o savefig
+
+    def limpar(self): # Descarta todas as imagens
+        self._cache.limpar()
+
+    @property
+    def bytes(self): # Memória ocupada pelas imagens
+        return self._cache.bytes
+
+    @property
+    def acertos(self): # Gráficos servidos sem redesenhar
+        return self._cache.acertos
+
+    @property
+    def falhas(self): # Gráficos desenhados
+        return self._cache.falhas
+
+    def __len__(self): # Quantidade de imagens
+        return len(self._cache)
@@ -0,0 +1,72 @@
+# ==========================================================================
+# Classificação vetorizada dos indicadores do PEDE
+# ==========================================================================
+
+# Processamento e Manipulação de Dados
+import numpy as np   # Busca binária dos limites (np.searchsorted)
+import pandas as pd  # Saídas categóricas ordenadas
+
+# ==========================================================================
+# Regras de negócio
+# ==========================================================================
+
+ROTULO_NA = "N/A" # Valor nulo ou abaixo da menor faixa
+ROTULO_INVALIDO = "Indicador Inválido" # Indicador sem regra cadastrada
+
+# Limite inferior -> rótulo, do maior para o menor (mesma leitura das regras da Passos Mágicos)
+REGRAS_INDICADORES = { # Catálogo que agrupa os critérios de todos os indicadores
+    'IAN': {10.0: 'Adequado', 5.0: 'Mod. Defasado', 0.0: 'Sev. Defasado'}, # Regras de adequação escolar
+    'IEG': {8.5: 'Alto', 6.0: 'Médio', 0.0: 'Baixo'}, # Regras de engajamento do aluno
+    'IDA': {7.5: 'Alto (>=7.5)', 5.0: 'Médio (5-7.5)', 0.0: 'Baixo (<5)'}, # Regras de desempenho acadêmico
+    'IPS': {7.5: 'Adequado', 5.0: 'Em Alerta', 0.0: 'Crítico'}, # Regras de índice psicossocial
+    'IPP': {8.0: 'Excelente', 7.0: 'Adequado', 0.0: 'Insuficiente'}, # Regras de potencial psicopedagógico
+    'IAA': {8.5: 'Alta', 6.0: 'Média', 0.0: 'Baixa'}, # Regras de autoavaliação do aluno
+    'IPV': {7.0: 'Sim', 0.0: 'Não'} # Regras para o indicador de Ponto de Virada
+} # Finaliza o dicionário de regras
+
+# Tabelas compiladas uma única vez: limites crescentes e rótulos na mesma ordem
+_TABELAS = { # nome -> (limites, rótulos)
+    nome: (np.array(sorted(regras)), [regras[k] for k in sorted(regras)])
+    for nome, regras in REGRAS_INDICADORES.items()
+} # Encerra a compilação
+
+# ==========================================================================
+# Classificação
+# ==========================================================================
+
+def categorias_indicador(nome_indicador): # Ordem das categorias do indicador
+    """Rótulos do pior para o melhor nível, seguidos de "N/A"."""
+    return _TABELAS[nome_indicador.upper()][1] + [ROTULO_NA] # Ordem usada nos gráficos
+
+def classificar_serie(valores, nome_indicador, manual=None): # Classifica uma coluna inteira de uma vez
+    """Mapeia os valores para um Categorical ordenado com busca binária nos limites do indicador.
+
+    Valores nulos (ou abaixo da menor faixa) viram "N/A"; onde `manual` não for nulo, a marcação
+    manual substitui a classificação, como em `classificar_indicador`.
+    """
+    limites, rotulos = _TABELAS[nome_indicador.upper()] # KeyError para indicador sem regra
+    serie = valores if isinstance(valores, pd.Series) else pd.Series(valores) # Preserva o índice original
+    v = pd.to_numeric(serie, errors='coerce').to_numpy(dtype=float) # Valores numéricos (NaN para ausentes)
+    codigos = np.searchsorted(limites, v, side='right') - 1 # Última faixa com limite <= valor
+    codigos[np.isnan(v) | (codigos < 0)] = len(rotulos) # Nulos e valores abaixo da menor faixa -> "N/A"
+    categorias = rotulos + [ROTULO_NA] # Ordem do pior para o melhor, "N/A" ao final
+
+    if manual is not None: # Marcação manual tem prioridade sobre a regra
+        manual = pd.Series(manual, index=serie.index) if not isinstance(manual, pd.Series) else manual # Alinha ao índice
+        marcados = manual.notna().to_numpy() # Linhas com marcação manual
+        extras = [m for m in pd.unique(manual[marcados]) if m not in categorias] # Rótulos fora do catálogo
+        categorias = categorias + extras # Acrescenta ao final da ordem
+        codigos[marcados] = pd.Index(categorias).get_indexer(manual[marcados]) # Código de cada marcação
+
+    return pd.Series(pd.Categorical.from_codes(codigos, categories=categorias, ordered=True), index=serie.index, name=serie.name)
+
+def classificar_colunas(df, colunas=None, sufixo='_Categoria'): # Várias colunas de uma vez
+    """Retorna um DataFrame com uma coluna categórica `<COLUNA><sufixo>` por indicador."""
+    colunas = colunas or [c for c in REGRAS_INDICADORES if c in df.columns] # Padrão: todos os indicadores presentes
+    return pd.DataFrame({f"{c}{sufixo}": classificar_serie(df[c], c) for c in colunas}, index=df.index)
+
+def classificar_indicador(valor, nome_indicador, manual=None): # Versão escalar (compatível com a função original)
+    """Mapeia um único valor numérico para a categoria qualitativa do indicador."""
+    if pd.notna(manual): return manual # Retorna a marcação manual imediatamente caso ela exista
+    if nome_indicador.upper() not in _TABELAS: return ROTULO_INVALIDO # Indicador sem regra cadastrada
+    return classificar_serie([valor], nome_indicador).iloc[0] # Mesma regra da versão vetorizada
@@ -0,0 +1,87 @@
+# ==========================================================================
+# Inferência em passada única sobre o pipeline treinado
+# ==========================================================================
+
+# Processamento e Manipulação de Dados
+import numpy as np   # Biblioteca para cálculos matemáticos e operações com arrays
+import pandas as pd  # Ferramenta principal para criação e manipulação de DataFrames
+
+# Módulos do projeto
+from pede_analytics.arvores import EnsembleCompilado # Backend opcional de árvores achatadas
+from pede_analytics.esquema import FEATURES_CAT, FEATURES_NUM # Colunas usadas pelo pré-processamento
+from pede_analytics.regras import classificar_nivel_risco_lote # Faixas de risco vetorizadas
+
+LIMIAR_PADRAO = 0.5 # Probabilidade mínima para rotular o aluno como "em risco"
+BACKENDS = ('sklearn', 'compilado') # Motores de inferência disponíveis
+
+# ==========================================================================
+# Wrapper de inferência
+# ==========================================================================
+
+class InferenciaRisco: # Envolve o Pipeline(preprocessor, classifier) salvo pelo notebook
+    """Transforma a entrada uma única vez e avalia o ensemble uma única vez por chamada.
+
+    Substitui o par `model.predict` + `model.predict_proba`, que repetia o ColumnTransformer
+    e a travessia das árvores. O rótulo é derivado da probabilidade com `limiar` configurável.
+    """
+
+    def __init__(self, pipeline, limiar=LIMIAR_PADRAO, backend='sklearn'): # Recebe o pipeline carregado por carregar_modelo()
+        self.pipeline = pipeline # Pipeline original (mantido para inspeção)
+        self.preprocessor = pipeline.named_steps['preprocessor'] # ColumnTransformer do candidato (one-hot ou categorias nativas)
+        self.classificador = pipeline.named_steps['classifier'] # GradientBoosting, HistGradientBoosting, XGBoost...
+        self.limiar = limiar # Limiar de decisão do rótulo
+        self._idx_risco = int(np.flatnonzero(self.classificador.classes_ == 1)[0]) # Coluna da classe "em risco"
+
+        if backend not in BACKENDS: # Valida o nome do backend
+            raise ValueError(f"Backend desconhecido: {backend!r}. Opções: {', '.join(BACKENDS)}")
+        self.backend = backend # 'sklearn' (padrão) ou 'compilado' (árvores achatadas em NumPy)
+        self.compilado = EnsembleCompilado(pipeline) if backend == 'compilado' else None # Compila uma única vez
+        self._explicador = self.compilado # Árvores achatadas usadas pelas explicações (compiladas sob demanda)
+
+    def probabilidades(self, df): # Probabilidade da classe de risco para entradas completas
+        """Executa transform + predict_proba uma única vez e retorna a probabilidade de risco."""
+        if self.compilado is not None: # Backend compilado dispensa a validação genérica do sklearn
+            return self.compilado.predict_proba(df)[:, self._idx_risco] # Mesma ordem de classes do pipeline
+        entrada = df.copy() # Evita alterar o DataFrame do chamador
+        entrada[FEATURES_CAT] = entrada[FEATURES_CAT].astype(object) # Colunas 100% nulas não podem ser float no OneHotEncoder
+        xt = self.preprocessor.transform(entrada) # Pré-processamento executado uma única vez
+        return self.classificador.predict_proba(xt)[:, self._idx_risco] # Ensemble avaliado uma única vez
+
+    def prever(self, df): # Rótulo, probabilidade e faixa de risco em uma única passada
+        """Retorna um DataFrame (mesmo índice de `df`) com ROTULO_RISCO, PROB_RISCO e NIVEL_RISCO.
+
+        Linhas com indicadores numéricos ausentes não são avaliadas (o GradientBoosting não aceita NaN)
+        e ficam com probabilidade nula.
+        """
+        completos = df[FEATURES_NUM].notna().all(axis=1).to_numpy() # Linhas que o modelo consegue avaliar
+        probs = np.full(len(df), np.nan) # Probabilidades (nulas para linhas incompletas)
+        if completos.any(): # Evita chamar o modelo com bloco vazio
+            probs[completos] = self.probabilidades(df.loc[completos]) # Passada única sobre as linhas completas
+        return self.rotular(probs, df.index) # Rótulo e faixa derivados da probabilidade
+
+    def explicar(self, df): # Contribuição de cada atributo original para o risco
+        """Retorna um DataFrame (mesmo índice de `df`) com CONTRIB_BASE e CONTRIB_<atributo>, em log-odds.
+
+        A soma das colunas é o log-odds do modelo para a linha (método de Saabas: variação do valor
+        esperado ao longo do caminho em cada árvore). Disponível para o GradientBoosting com one-hot;
+        outros classificadores levantam TypeError. Linhas incompletas ficam nulas, como em `prever`.
+        """
+        if self._explicador is None: self._explicador = EnsembleCompilado(self.pipeline) # Compila na primeira explicação
+        colunas = ['CONTRIB_BASE'] + [f'CONTRIB_{c}' for c in self._explicador.campos] # Viés + um campo por atributo
+        saida = pd.DataFrame(np.nan, index=df.index, columns=colunas) # Nulas para linhas não avaliadas
+        completos = df[FEATURES_NUM].notna().all(axis=1).to_numpy() # Mesmas linhas avaliadas por `prever`
+        if completos.any(): # Evita compilar a consulta com bloco vazio
+            vies, contribuicoes = self._explicador.contribuicoes(df.loc[completos]) # Passada única sobre as árvores
+            saida.loc[completos, colunas] = np.column_stack([np.full(len(contribuicoes), vies), contribuicoes])
+        return saida # Contribuições por linha
+
+    def rotular(self, probs, index=None): # Resultado a partir de probabilidades já calculadas (ex.: cache)
+        """Monta ROTULO_RISCO, PROB_RISCO e NIVEL_RISCO a partir de `probs` (NaN = linha não avaliada)."""
+        probs = np.asarray(probs, dtype=float) # Probabilidades da classe de risco
+        completos = ~np.isnan(probs) # Linhas avaliadas pelo modelo
+        rotulos = pd.array(np.where(completos, probs >= self.limiar, False), dtype='Int8') # Rótulo derivado do limiar
+        rotulos[~completos] = pd.NA # Sem rótulo para linhas incompletas
+        niveis = np.full(len(probs), None, dtype=object) # Faixas de risco
+        niveis[completos] = classificar_nivel_risco_lote(probs[completos]) # Mesmas faixas de classificar_nivel_risco
+
+        return pd.DataFrame({'ROTULO_RISCO': rotulos, 'PROB_RISCO': probs, 'NIVEL_RISCO': niveis}, index=index) # Resultado unificado
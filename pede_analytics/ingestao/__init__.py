@@ -0,0 +1,10 @@
+"""Ingestão incremental das planilhas PEDE (Parquet particionado por ANO e visão unificada)."""
+
+from pede_analytics.ingestao.incremental import ( # API pública da ingestão
+    DIRETORIO_PEDE, LEITORES, abrir_planilha, atualizar, base_unificada, carregar_unificada, exportar_csv,
+    impressoes_digitais, processar_aba, processar_abas,
+) # Encerra a importação
+from pede_analytics.ingestao.leitura import COLUNAS_LEITURA, ler_aba_em_blocos # Leitura em fluxo
+from pede_analytics.ingestao.padronizacao import ( # Regras do notebook
+    COLUNAS_BASE, aplicar_knn_ipp, criar_base_unificada, padronizar_colunas, selecionar_colunas,
+) # Encerra a importação
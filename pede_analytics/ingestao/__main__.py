@@ -0,0 +1,52 @@
+# ==========================================================================
+# Linha de comando da ingestão incremental
+# ==========================================================================
+# Uso: python -m pede_analytics.ingestao atualizar [planilhas.xlsx ...] [--leitor fluxo|pandas] [--trabalhadores N] [--csv data_processed/df_unificado.csv]
+#      python -m pede_analytics.ingestao status
+
+# Bibliotecas do Sistema e Utilitários
+import argparse      # Interpreta os argumentos da linha de comando
+import logging       # Exibe o tempo de cada aba processada
+import time          # Mede o tempo total da sincronização
+
+# Módulos do projeto
+from pede_analytics.ingestao.incremental import ( # Pipeline incremental
+    CAMINHO_XLSX, DIRETORIO_PEDE, LEITORES, atualizar, carregar_unificada, exportar_csv, ler_manifesto,
+) # Encerra a importação
+
+ICONES = {'nova': '🆕', 'alterada': '🔄', 'inalterada': '✅', 'removida': '🗑️'} # Situação de cada aba
+
+def main(argv=None): # Ponto de entrada da CLI
+    parser = argparse.ArgumentParser(description="Ingestão incremental das abas PEDE em Parquet particionado por ANO.")
+    sub = parser.add_subparsers(dest='comando', required=True) # Subcomandos
+    p_atu = sub.add_parser('atualizar', help="Processa apenas as abas novas ou alteradas")
+    p_atu.add_argument('arquivos', nargs='*', default=[str(CAMINHO_XLSX)], help="Planilhas .xlsx (padrão: data_raw/base_passos_magicos.xlsx)")
+    p_atu.add_argument('--destino', default=str(DIRETORIO_PEDE), help="Pasta do conjunto particionado")
+    p_atu.add_argument('--forcar', action='store_true', help="Reprocessa todas as abas")
+    p_atu.add_argument('--leitor', choices=LEITORES, default='fluxo', help="Leitura em blocos (padrão) ou pd.read_excel")
+    p_atu.add_argument('--trabalhadores', type=int, help="Processos em paralelo (padrão: todos os núcleos; 1 = sequencial)")
+    p_atu.add_argument('--csv', help="Também exporta a visão unificada (com KNN) para este CSV")
+    p_sta = sub.add_parser('status', help="Lista as partições registradas no manifesto")
+    p_sta.add_argument('--destino', default=str(DIRETORIO_PEDE), help="Pasta do conjunto particionado")
+    args = parser.parse_args(argv) # Lê os argumentos
+    logging.basicConfig(format="%(levelname)s %(name)s: %(message)s") # Logs no console
+    logging.getLogger('pede_analytics').setLevel(logging.INFO) # Tempo de cada etapa
+
+    if args.comando == 'status': # Apenas consulta o manifesto
+        for chave, parte in sorted(ler_manifesto(args.destino)['partes'].items(), key=lambda i: (i[1]['ano'], i[0])):
+            print(f"{parte['ano']}  {chave:<40} {parte['linhas']:>7,} linhas  {parte['atualizado_em']}  {parte['impressao'][:12]}")
+        return 0 # Sucesso
+
+    inicio = time.perf_counter() # Marca o início da sincronização
+    relatorio = atualizar(args.arquivos, args.destino, forcar=args.forcar, leitor=args.leitor, trabalhadores=args.trabalhadores) # Sincroniza as partições
+    for chave, situacao, linhas in relatorio: # Resumo por aba
+        print(f"{ICONES[situacao]} {chave:<40} {situacao:<10} {linhas:>7,} linhas")
+    if args.csv: # Regera o CSV consumido pelo app
+        df = carregar_unificada(args.destino) # Visão unificada com KNN
+        exportar_csv(df, args.csv) # Gravação atômica
+        print(f"📄 {len(df):,} alunos exportados para {args.csv}")
+    print(f"⏱️ Concluído em {time.perf_counter() - inicio:.2f}s") # Tempo total
+    return 0 # Sucesso
+
+if __name__ == "__main__": # Execução via python -m pede_analytics.ingestao
+    raise SystemExit(main()) # Executa a CLI
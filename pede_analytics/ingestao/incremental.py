@@ -0,0 +1,290 @@
+# ==========================================================================
+# Ingestão incremental das abas PEDE em Parquet particionado por ANO
+# ==========================================================================
+
+# Bibliotecas do Sistema e Utilitários
+import hashlib       # Impressão digital de cada aba
+import json          # Manifesto das partições
+import logging       # Registro das abas processadas
+import os            # Quantidade de núcleos disponíveis
+import re            # Ano da aba e referências a textos compartilhados
+import time          # Mede o tempo de cada etapa
+import zipfile       # O .xlsx é um pacote zip de XMLs
+from concurrent.futures import ProcessPoolExecutor # Uma aba (ou arquivo) por processo
+import xml.etree.ElementTree as ET # Leitura do índice de abas e dos textos compartilhados
+from datetime import datetime, timezone # Data de atualização das partições
+from pathlib import Path # Manipulação de caminhos independente do diretório de execução
+
+# Processamento e Manipulação de Dados
+import pandas as pd  # Leitura das abas e visão unificada
+import pyarrow as pa # Tabelas com esquema fixo
+import pyarrow.dataset as ds # Visão lazy do conjunto particionado
+import pyarrow.parquet as pq # Escrita das partições
+
+# Módulos do projeto
+from pede_analytics.ingestao.padronizacao import ( # Regras do notebook
+    COLUNAS_BASE, aplicar_knn_ipp, criar_base_unificada, padronizar_colunas, selecionar_colunas,
+) # Encerra a importação
+from pede_analytics.ingestao.leitura import TAMANHO_BLOCO, abrir_livro, ler_aba_em_blocos # Leitura em fluxo
+
+logger = logging.getLogger(__name__) # Logger do módulo
+
+# ==========================================================================
+# Constantes
+# ==========================================================================
+
+RAIZ_PROJETO = Path(__file__).resolve().parents[2] # Raiz do repositório
+CAMINHO_XLSX = RAIZ_PROJETO / 'data_raw' / 'base_passos_magicos.xlsx' # Planilha PEDE versionada
+DIRETORIO_PEDE = RAIZ_PROJETO / 'data_processed' / 'pede' # Conjunto Parquet particionado (fora do git)
+NOME_MANIFESTO = '_ingestao.json' # Prefixo "_" é ignorado pelo pyarrow.dataset
+VERSAO_PADRONIZACAO = 1 # Incrementar quando as regras de padronização mudarem (reprocessa tudo)
+PADRAO_ABA = re.compile(r'PEDE\s*(\d{4})', re.IGNORECASE) # Abas anuais (PEDE2022, PEDE2023, ...)
+LEITORES = ('fluxo', 'pandas') # Leitura em blocos (padrão) ou pd.read_excel da aba inteira (notebook)
+
+NS_PLANILHA = '{http://schemas.openxmlformats.org/spreadsheetml/2006/main}' # Namespace do SpreadsheetML
+NS_RELACAO = '{http://schemas.openxmlformats.org/officeDocument/2006/relationships}' # Atributo r:id das abas
+NS_PACOTE = '{http://schemas.openxmlformats.org/package/2006/relationships}' # Relações do workbook
+REF_TEXTO = re.compile(rb'<(?:\w+:)?c\b[^>]*\bt="s"[^>]*>\s*<(?:\w+:)?v>(\d+)</') # Células que apontam para sharedStrings
+ATRIBUTO_ESTILO = re.compile(rb'\ss="\d+"') # Índice de estilo da célula (renumerado ao salvar o arquivo)
+
+COLUNAS_INTEIRAS = ['FASE', 'DEFASAGEM', 'IDADE', 'ANO_INGRESSO', 'FASE_IDEAL'] # Inteiros com nulos
+COLUNAS_TEXTO = ['RA', 'PEDRA', 'GENERO', 'PONTO_VIRADA', 'INSTITUICAO_ENSINO'] # Texto
+ESQUEMA_PARTE = pa.schema([ # Esquema fixo de cada partição (ANO fica no caminho ANO=aaaa)
+    (c, pa.int64() if c in COLUNAS_INTEIRAS else pa.string() if c in COLUNAS_TEXTO else pa.float64())
+    for c in COLUNAS_BASE if c != 'ANO'
+]) # Encerra o esquema
+PARTICIONAMENTO = ds.partitioning(pa.schema([('ANO', pa.int16())]), flavor='hive') # Pastas ANO=2022, ANO=2023...
+
+# ==========================================================================
+# Impressão digital das abas (sem interpretar células)
+# ==========================================================================
+
+def abas_planilha(caminho): # Nome da aba -> XML da aba dentro do pacote
+    """Lê o índice de abas do .xlsx (workbook.xml e suas relações) sem abrir as planilhas."""
+    with zipfile.ZipFile(caminho) as pacote: # Leitura direta do zip
+        relacoes = {r.get('Id'): r.get('Target') for r in ET.fromstring(pacote.read('xl/_rels/workbook.xml.rels')).iter(f'{NS_PACOTE}Relationship')}
+        abas = {} # nome -> parte
+        for aba in ET.fromstring(pacote.read('xl/workbook.xml')).iter(f'{NS_PLANILHA}sheet'): # Abas na ordem do arquivo
+            alvo = relacoes[aba.get(f'{NS_RELACAO}id')] # Caminho relativo (worksheets/sheet1.xml) ou absoluto
+            abas[aba.get('name')] = alvo.lstrip('/') if alvo.startswith('/') else f'xl/{alvo}' # Caminho dentro do zip
+    return abas # Ordem original das abas
+
+def _textos_compartilhados(pacote): # Tabela sharedStrings (índice -> texto)
+    if 'xl/sharedStrings.xml' not in pacote.namelist(): return [] # Planilha sem textos compartilhados
+    with pacote.open('xl/sharedStrings.xml') as arquivo: # Leitura em fluxo
+        return [''.join(t.text or '' for t in si.iter(f'{NS_PLANILHA}t')) for si in ET.parse(arquivo).getroot().iter(f'{NS_PLANILHA}si')]
+
+def impressoes_digitais(caminho, abas=None): # SHA-256 do conteúdo de cada aba
+    """Hash do XML da aba e dos textos compartilhados que ela referencia (mais a versão da padronização).
+
+    Acrescentar uma aba ao arquivo (que reescreve sharedStrings e renumera os estilos) não altera a
+    impressão das demais; mudanças apenas de formatação das células também são ignoradas.
+    """
+    partes = abas_planilha(caminho) # nome -> parte
+    abas = [a for a in (abas or partes) if a in partes] # Abas solicitadas existentes
+    impressoes = {} # aba -> sha256
+    with zipfile.ZipFile(caminho) as pacote: # Uma única abertura do pacote
+        textos = _textos_compartilhados(pacote) # Decodificados uma vez para todas as abas
+        for aba in abas: # Cada aba
+            xml = pacote.read(partes[aba]) # Conteúdo bruto da aba
+            h = hashlib.sha256(f'padronizacao-v{VERSAO_PADRONIZACAO}\x1e'.encode()) # Regras fazem parte da impressão
+            h.update(ATRIBUTO_ESTILO.sub(b'', xml)) # Células, fórmulas e índices de texto (sem estilos)
+            h.update('\x1f'.join(textos[int(i)] for i in REF_TEXTO.findall(xml)).encode()) # Textos efetivamente referenciados
+            impressoes[aba] = h.hexdigest()
+    return impressoes # aba -> impressão digital
+
+# ==========================================================================
+# Manifesto e partições
+# ==========================================================================
+
+def ler_manifesto(destino=DIRETORIO_PEDE): # Estado das partições já gravadas
+    caminho = Path(destino) / NOME_MANIFESTO # Arquivo do manifesto
+    if not caminho.exists(): return {'versao_padronizacao': VERSAO_PADRONIZACAO, 'partes': {}} # Conjunto vazio
+    return json.loads(caminho.read_text(encoding='utf-8')) # Manifesto existente
+
+def gravar_manifesto(manifesto, destino=DIRETORIO_PEDE): # Escrita atômica do manifesto
+    caminho = Path(destino) / NOME_MANIFESTO # Arquivo do manifesto
+    temporario = caminho.with_suffix('.tmp') # Escreve ao lado e renomeia
+    temporario.write_text(json.dumps(manifesto, indent=2, ensure_ascii=False), encoding='utf-8')
+    temporario.replace(caminho) # Troca atômica
+
+def para_arrow(df): # Aba padronizada -> tabela com o esquema fixo das partições
+    """Converte as colunas principais de uma aba padronizada para `ESQUEMA_PARTE` (colunas ausentes viram nulos)."""
+    df = df.reindex(columns=ESQUEMA_PARTE.names) # Ordem fixa; IPP de 2022, por exemplo, vira nulo
+    for col in COLUNAS_INTEIRAS: # Inteiros que aceitam nulos
+        df[col] = pd.to_numeric(df[col], errors='coerce').astype('Int64')
+    for col in COLUNAS_TEXTO: # Texto (valores booleanos derivados viram 'True'/'False', como no CSV)
+        df[col] = df[col].astype(object).where(df[col].isna(), df[col].astype(str)) # Categorias (pedra calculada) viram texto
+    return pa.Table.from_pandas(df, schema=ESQUEMA_PARTE, preserve_index=False) # Tabela tipada
+
+def abrir_planilha(caminho, leitor='fluxo'): # Abre o arquivo uma vez para várias abas
+    """Livro em fluxo do openpyxl ou `pd.ExcelFile`, conforme o leitor (ambos com `.close()`)."""
+    if leitor not in LEITORES: raise ValueError(f"Leitor desconhecido: {leitor!r} (use {', '.join(LEITORES)})")
+    return pd.ExcelFile(caminho) if leitor == 'pandas' else abrir_livro(caminho) # Evita reabrir o zip a cada aba
+
+def ler_aba(origem, aba): # Leitura bruta de uma aba
+    """Lê uma aba do .xlsx (caminho ou `pd.ExcelFile`) como DataFrame (mesma leitura do notebook)."""
+    return pd.read_excel(origem, sheet_name=aba) # Todas as colunas e linhas de uma vez
+
+def processar_aba(origem, aba, ano, leitor='fluxo', tamanho_bloco=TAMANHO_BLOCO): # Leitura + padronização de uma aba
+    """Lê e padroniza uma aba, devolvendo a tabela Arrow da partição.
+
+    `origem` é o caminho do .xlsx ou o retorno de `abrir_planilha` com o mesmo `leitor`.
+    `leitor='fluxo'` padroniza bloco a bloco só as colunas usadas; `'pandas'` lê a aba inteira
+    como o notebook. As duas leituras geram a mesma tabela.
+    """
+    if leitor == 'pandas': # Caminho original (referência do benchmark)
+        return para_arrow(selecionar_colunas(padronizar_colunas(ler_aba(origem, aba), str(ano)))) # Regras do notebook
+    if leitor not in LEITORES: raise ValueError(f"Leitor desconhecido: {leitor!r} (use {', '.join(LEITORES)})")
+    tabelas = [ # Cada bloco já sai padronizado e tipado
+        para_arrow(selecionar_colunas(padronizar_colunas(bloco, str(ano))))
+        for bloco in ler_aba_em_blocos(origem, aba, ano, tamanho_bloco)
+    ] # Encerra os blocos
+    return pa.concat_tables(tabelas) if tabelas else ESQUEMA_PARTE.empty_table() # Aba sem linhas vira partição vazia
+
+def _gravar_parte(tabela, destino, relativo): # Escrita atômica de uma partição
+    caminho = Path(destino) / relativo # Arquivo da partição
+    caminho.parent.mkdir(parents=True, exist_ok=True) # Pasta ANO=aaaa
+    temporario = caminho.with_name(f'.{caminho.name}.tmp') # Prefixo "." é ignorado pela visão unificada
+    pq.write_table(tabela, temporario) # Grava a partição
+    temporario.replace(caminho) # Troca atômica
+
+# ==========================================================================
+# Processamento paralelo
+# ==========================================================================
+
+def _serializar(tabela): # Tabela -> buffer IPC do Arrow (atravessa o processo sem pickle de DataFrame)
+    saida = pa.BufferOutputStream() # Buffer contíguo em memória
+    with pa.ipc.new_stream(saida, tabela.schema) as escritor: # Formato de fluxo do Arrow
+        escritor.write_table(tabela)
+    return saida.getvalue() # pa.Buffer (serializado como bytes brutos)
+
+def _processar_tarefa(arquivo, abas, leitor, tamanho_bloco): # Executada em um processo do pool
+    """Lê e padroniza as `abas` [(aba, ano), ...] de um arquivo, abrindo-o uma única vez."""
+    resultados = [] # (aba, buffer IPC, segundos)
+    planilha = abrir_planilha(arquivo, leitor) # Livro compartilhado pelas abas da tarefa
+    try:
+        for aba, ano in abas: # Abas na ordem do arquivo
+            inicio = time.perf_counter() # Marca o início da aba
+            tabela = processar_aba(planilha, aba, ano, leitor, tamanho_bloco) # Leitura e padronização
+            resultados.append((aba, _serializar(tabela), time.perf_counter() - inicio))
+    finally:
+        planilha.close() # Libera o arquivo
+    return resultados # Devolvidos ao processo principal
+
+def processar_abas(pendentes, leitor='fluxo', trabalhadores=None, tamanho_bloco=TAMANHO_BLOCO): # Fan-out por aba ou arquivo
+    """Processa `pendentes` ({arquivo: [(aba, ano), ...]}) e gera (arquivo, aba, tabela, segundos).
+
+    Com mais arquivos que processos, cada tarefa é um arquivo inteiro (o livro é aberto uma vez);
+    senão, cada aba vira uma tarefa. Os resultados saem sempre na ordem de `pendentes`,
+    independentemente de qual processo termina primeiro. `trabalhadores=None` usa todos os núcleos;
+    com 1 trabalhador (ou uma única aba) tudo roda no próprio processo, sem pool.
+    """
+    trabalhadores = trabalhadores or os.cpu_count() or 1 # Processos solicitados
+    if len(pendentes) >= trabalhadores: # Arquivos suficientes para ocupar os processos
+        tarefas = [(arquivo, abas) for arquivo, abas in pendentes.items()]
+    else: # Poucos arquivos: paraleliza as abas
+        tarefas = [(arquivo, [aba]) for arquivo, abas in pendentes.items() for aba in abas]
+    trabalhadores = min(trabalhadores, len(tarefas)) # Nunca mais processos que tarefas
+
+    if trabalhadores <= 1: # Execução sequencial no próprio processo
+        for arquivo, abas in tarefas:
+            for aba, buffer, segundos in _processar_tarefa(arquivo, abas, leitor, tamanho_bloco):
+                yield arquivo, aba, pa.ipc.open_stream(buffer).read_all(), segundos
+        return
+
+    with ProcessPoolExecutor(max_workers=trabalhadores) as pool: # Um processo por tarefa em andamento
+        futuros = [(arquivo, pool.submit(_processar_tarefa, arquivo, abas, leitor, tamanho_bloco)) for arquivo, abas in tarefas]
+        for arquivo, futuro in futuros: # Ordem de submissão (resultado determinístico)
+            for aba, buffer, segundos in futuro.result():
+                yield arquivo, aba, pa.ipc.open_stream(buffer).read_all(), segundos # Tabela aponta para o buffer recebido (sem cópia)
+
+# ==========================================================================
+# Atualização incremental
+# ==========================================================================
+
+def atualizar(arquivos=(CAMINHO_XLSX,), destino=DIRETORIO_PEDE, forcar=False, leitor='fluxo', trabalhadores=None): # Reprocessa apenas o que mudou
+    """Sincroniza o conjunto particionado com as abas PEDEaaaa dos `arquivos`.
+
+    Cada (arquivo, aba) vira o arquivo `ANO=aaaa/<arquivo>__<aba>.parquet`. Abas com a mesma
+    impressão digital do manifesto são mantidas sem leitura; abas novas ou alteradas são lidas e
+    padronizadas uma única vez (com o `leitor` escolhido), em paralelo por `trabalhadores`
+    processos; abas que sumiram de um arquivo têm a partição removida.
+    Retorna a lista de (chave, situação, linhas), na ordem dos arquivos e das abas.
+    """
+    destino = Path(destino) # Normaliza o destino
+    destino.mkdir(parents=True, exist_ok=True) # Garante a pasta do conjunto
+    manifesto = ler_manifesto(destino) # Estado atual
+    partes = manifesto['partes'] # chave -> metadados da partição
+    relatorio = [] # (chave, situação, linhas)
+    pendentes, impressoes, posicoes = {}, {}, {} # Abas a processar, hash por (arquivo, aba) e lugar no relatório
+
+    # 1. Impressões digitais e abas removidas (rápido, no processo principal)
+    for arquivo in map(Path, arquivos): # Cada planilha de origem
+        inicio = time.perf_counter() # Marca o início do arquivo
+        anos = {aba: int(m.group(1)) for aba in abas_planilha(arquivo) if (m := PADRAO_ABA.fullmatch(aba.strip()))} # Abas anuais
+        for aba, impressao in impressoes_digitais(arquivo, list(anos)).items(): impressoes[arquivo, aba] = impressao # Hash de cada aba
+        logger.info("%s: %d abas PEDE, impressões em %.0f ms", arquivo.name, len(anos), (time.perf_counter() - inicio) * 1000)
+
+        for aba, ano in anos.items(): # Cada aba anual
+            chave = f'{arquivo.stem}/{aba}' # Identificador estável da aba
+            atual = partes.get(chave) # Partição já gravada
+            if not forcar and atual and atual['impressao'] == impressoes[arquivo, aba] and (destino / atual['parte']).exists(): # Nada mudou
+                relatorio.append((chave, 'inalterada', atual['linhas']))
+                continue # Dispensa a leitura
+            posicoes[chave] = len(relatorio) # Preenchido após o processamento
+            relatorio.append(None)
+            pendentes.setdefault(arquivo, []).append((aba, ano)) # Aba a (re)processar
+
+        for chave in [c for c, p in partes.items() if c.startswith(f'{arquivo.stem}/') and p['aba'] not in anos]: # Abas removidas
+            (destino / partes.pop(chave)['parte']).unlink(missing_ok=True) # Remove a partição órfã
+            relatorio.append((chave, 'removida', 0))
+
+    # 2. Leitura e padronização das abas pendentes (em paralelo), gravadas em ordem
+    anos_pendentes = {(arquivo, aba): ano for arquivo, abas in pendentes.items() for aba, ano in abas} # Ano de cada aba
+    for arquivo, aba, tabela, segundos in processar_abas(pendentes, leitor, trabalhadores): # Resultados na ordem de `pendentes`
+        chave, ano = f'{arquivo.stem}/{aba}', anos_pendentes[arquivo, aba] # Identificação da aba
+        atual = partes.get(chave) # Partição anterior (se houver)
+        relativo = f'ANO={ano}/{arquivo.stem}__{aba}.parquet' # Caminho da partição
+        _gravar_parte(tabela, destino, relativo) # Nova partição
+        if atual and atual['parte'] != relativo: (destino / atual['parte']).unlink(missing_ok=True) # Aba renomeada de ano
+        partes[chave] = { # Metadados da partição
+            'arquivo': str(arquivo), 'aba': aba, 'ano': ano, 'impressao': impressoes[arquivo, aba], 'parte': relativo,
+            'linhas': tabela.num_rows, 'atualizado_em': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+        } # Encerra os metadados
+        relatorio[posicoes[chave]] = (chave, 'alterada' if atual else 'nova', tabela.num_rows)
+        logger.info("%s processada em %.0f ms (%d linhas)", chave, segundos * 1000, tabela.num_rows)
+
+    manifesto['versao_padronizacao'] = VERSAO_PADRONIZACAO # Versão das regras aplicadas
+    gravar_manifesto(manifesto, destino) # Persiste o novo estado
+    return relatorio # Resumo da sincronização
+
+# ==========================================================================
+# Visão unificada
+# ==========================================================================
+
+def base_unificada(destino=DIRETORIO_PEDE): # Visão lazy de todas as partições
+    """Retorna o `pyarrow.dataset` do conjunto: filtros por ANO e projeções de colunas leem só o necessário."""
+    return ds.dataset(destino, format='parquet', partitioning=PARTICIONAMENTO) # Nada é lido aqui (ignora '_' e '.')
+
+def carregar_unificada(destino=DIRETORIO_PEDE, anos=None, imputar=True): # Equivalente ao df_unificado do notebook
+    """Materializa a visão unificada (abas em ordem de ano e de origem) e aplica a unificação do notebook.
+
+    `imputar=True` repete o KNN que completa IDA, IEG, IPS e IPP sobre todos os anos carregados.
+    """
+    visao = base_unificada(destino) # Conjunto particionado
+    fragmentos = sorted(visao.get_fragments(filter=ds.field('ANO').isin(anos) if anos else None), key=lambda f: f.path) # Ordem determinística
+    tabelas = [f.to_table(schema=visao.schema) for f in fragmentos] # Apenas as partições pedidas
+    tabela = pa.concat_tables(tabelas) if tabelas else visao.schema.empty_table() # Concatenação sem cópia
+    df = tabela.to_pandas(types_mapper={pa.int64(): pd.Int64Dtype()}.get) # Inteiros com nulos
+    df['ANO'] = df['ANO'].astype('int64') # Ano vindo do caminho da partição
+    df = criar_base_unificada([df[COLUNAS_BASE]]) # Mesma pós-unificação do notebook
+    return aplicar_knn_ipp(df) if imputar and not df.empty else df # Base pronta
+
+def exportar_csv(df, caminho): # Gera o df_unificado.csv consumido pelo app
+    """Grava a base unificada no formato do notebook (sem índice, UTF-8 com BOM)."""
+    caminho = Path(caminho) # Normaliza o caminho
+    caminho.parent.mkdir(parents=True, exist_ok=True) # Garante a pasta
+    temporario = caminho.with_suffix('.tmp') # Escreve ao lado e renomeia
+    df.to_csv(temporario, index=False, encoding='utf-8-sig') # Mesmo formato do notebook
+    temporario.replace(caminho) # Troca atômica (o dashboard nunca lê arquivo pela metade)
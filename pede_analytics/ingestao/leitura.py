@@ -0,0 +1,103 @@
+# ==========================================================================
+# Leitura em fluxo das abas PEDE (openpyxl read_only + values_only)
+# ==========================================================================
+
+# Bibliotecas do Sistema e Utilitários
+import itertools     # Fatia o iterador de linhas em blocos
+from pathlib import Path # Caminho ou planilha já aberta
+
+# Processamento e Manipulação de Dados
+import numpy as np   # Marcador de ausente
+import pandas as pd  # Blocos tipados
+from openpyxl import load_workbook # Leitor em fluxo (sem modelo de objetos das células)
+from openpyxl.cell.cell import ERROR_CODES # Erros de fórmula ('#DIV/0!', '#REF!', ...)
+
+# Módulos do projeto
+from pede_analytics.ingestao.padronizacao import COLUNAS_BASE, nome_padronizado # Regras de renomeação do notebook
+
+# ==========================================================================
+# Constantes
+# ==========================================================================
+
+TAMANHO_BLOCO = 5_000 # Linhas por bloco entregue à padronização
+COLUNAS_ORIGEM = ['ANO_NASCIMENTO', 'CG', 'CF', 'CT', 'NOTA_MAT', 'NOTA_PORT', 'NOTA_ING'] # Insumos das colunas derivadas
+COLUNAS_LEITURA = frozenset(COLUNAS_BASE) | frozenset(COLUNAS_ORIGEM) # Nomes padronizados que chegam ao Parquet
+TEXTOS_AUSENTES = frozenset({ # Textos que o pd.read_excel interpreta como ausentes (na_values padrão)
+    '', '#N/A', '#N/A N/A', '#NA', '-1.#IND', '-1.#QNAN', '-NaN', '-nan', '1.#IND', '1.#QNAN',
+    '<NA>', 'N/A', 'NA', 'NULL', 'NaN', 'None', 'n/a', 'nan', 'null',
+}) # Encerra os textos ausentes
+
+# ==========================================================================
+# Projeção do cabeçalho
+# ==========================================================================
+
+def _nomes_cabecalho(cabecalho): # Mesmos nomes que o pd.read_excel daria às colunas
+    nomes, vistos = [], {} # Nomes finais e contagem de repetições
+    for i, valor in enumerate(cabecalho): # Cada célula da primeira linha
+        nome = f'Unnamed: {i}' if valor is None else str(valor) # Colunas sem título
+        if nome in vistos: # Títulos repetidos ganham sufixo (.1, .2, ...)
+            vistos[nome] += 1
+            nome = f'{nome}.{vistos[nome]}'
+        vistos.setdefault(nome, 0)
+        nomes.append(nome)
+    return nomes # Um nome por coluna
+
+def projecao(cabecalho, ano_referencia, colunas=COLUNAS_LEITURA): # Colunas brutas realmente usadas
+    """Índices e nomes brutos das colunas cujo nome padronizado está em `colunas`.
+
+    Segue a deduplicação de `padronizar_colunas`: quando duas colunas viram o mesmo nome, só a
+    primeira é mantida. As demais (nomes, avaliadores, destaques...) nem chegam a ser convertidas.
+    """
+    escolhidas, usados = [], set() # (índice, nome bruto) e nomes padronizados já atribuídos
+    for i, nome in enumerate(_nomes_cabecalho(cabecalho)): # Colunas na ordem do arquivo
+        efetivo = nome_padronizado(nome, ano_referencia) or nome # Colunas sem regra mantêm o nome bruto
+        if efetivo in usados: continue # Duplicada descartada pela padronização
+        usados.add(efetivo)
+        if efetivo in colunas: escolhidas.append((i, nome)) # Coluna necessária
+    return escolhidas # Projeção na ordem original
+
+# ==========================================================================
+# Leitura em blocos
+# ==========================================================================
+
+def _valor(v): # Conversão de uma célula (mesmas regras do leitor openpyxl do pandas)
+    if v is None: return np.nan # Célula vazia
+    if isinstance(v, float) and v.is_integer(): return int(v) # 7.0 -> 7 (como o pd.read_excel)
+    if isinstance(v, str) and (v in ERROR_CODES or v.strip() in TEXTOS_AUSENTES): return np.nan # '#DIV/0!', 'NaN', '' ...
+    return v # Texto, inteiro, real, booleano ou data
+
+def abrir_livro(caminho): # Planilha em modo somente leitura
+    """Abre o .xlsx em fluxo. Ao abrir, o openpyxl percorre todas as abas para medir suas dimensões,
+    então o mesmo livro deve ser reaproveitado para ler várias abas do arquivo."""
+    return load_workbook(caminho, read_only=True, data_only=True) # Sem modelo de objetos das células
+
+def ler_aba_em_blocos(origem, aba, ano_referencia, tamanho_bloco=TAMANHO_BLOCO, colunas=COLUNAS_LEITURA): # Gerador de blocos
+    """Lê a aba em fluxo (`read_only`, `values_only`) e gera DataFrames com até `tamanho_bloco` linhas.
+
+    `origem` é o caminho do .xlsx ou um livro de `abrir_livro` (que continua aberto). Apenas as
+    colunas projetadas são convertidas; a memória fica limitada a um bloco, e não à aba inteira.
+    Linhas vazias no fim da aba são descartadas, como no `pd.read_excel`.
+    """
+    proprio = isinstance(origem, (str, Path)) # Livro aberto aqui deve ser fechado aqui
+    livro = abrir_livro(origem) if proprio else origem # Planilha em modo somente leitura
+    try: # O arquivo fica aberto até o fim da iteração
+        planilha = livro[aba] # Aba solicitada
+        planilha.reset_dimensions() # Dimensões gravadas por alguns editores podem truncar a leitura
+        linhas = planilha.iter_rows(values_only=True) # Tuplas de valores, uma linha por vez
+        cabecalho = next(linhas, None) # Primeira linha com os títulos
+        if cabecalho is None: return # Aba vazia
+        escolhidas = projecao(cabecalho, ano_referencia, colunas) # Colunas realmente usadas
+        indices, nomes = [i for i, _ in escolhidas], [n for _, n in escolhidas] # Posições e títulos
+        pendentes = 0 # Linhas vazias ainda não confirmadas (só entram se houver dados depois)
+        while bloco := list(itertools.islice(linhas, tamanho_bloco)): # Próximo bloco de linhas
+            registros = [] # Linhas projetadas e convertidas
+            for linha in bloco: # Cada linha bruta
+                if not any(v is not None for v in linha): # Linha vazia: pode ser o fim da aba
+                    pendentes += 1
+                    continue
+                registros.extend([(np.nan,) * len(indices)] * pendentes) # Linhas vazias no meio da aba
+                pendentes = 0
+                registros.append(tuple(_valor(linha[i]) if i < len(linha) else np.nan for i in indices)) # Projeção
+            if registros: yield pd.DataFrame.from_records(registros, columns=nomes) # Bloco tipado
+    finally:
+        if proprio: livro.close() # Libera o arquivo (obrigatório no modo read_only)
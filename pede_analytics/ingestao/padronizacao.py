@@ -0,0 +1,163 @@
+# ==========================================================================
+# Padronização das abas PEDE (funções do notebook, importáveis)
+# ==========================================================================
+
+# Bibliotecas do Sistema e Utilitários
+import logging       # Registro da unificação
+import unicodedata   # Remoção de acentos em nomes de colunas e pedras
+
+# Processamento e Manipulação de Dados
+import numpy as np   # Cálculo vetorizado do INDE
+import pandas as pd  # Ferramenta principal para criação e manipulação de DataFrames
+
+logger = logging.getLogger(__name__) # Logger do módulo
+
+# ==========================================================================
+# Constantes
+# ==========================================================================
+
+COLUNAS_BASE = [ # Colunas de df_unificado.csv, na ordem do arquivo publicado
+    'RA', 'ANO', 'FASE', 'PEDRA', 'INDE', 'IAA', 'IEG', 'IPS', 'IDA', 'IPV', 'IAN', 'DEFASAGEM', 'GENERO',
+    'IDADE', 'ANO_INGRESSO', 'PONTO_VIRADA', 'FASE_IDEAL', 'INSTITUICAO_ENSINO', 'IPP',
+] # Encerra a lista de colunas
+COLUNAS_NUMERICAS = ['INDE', 'IAA', 'IEG', 'IPS', 'IPP', 'IDA', 'IPV', 'IAN', 'DEFASAGEM', 'IDADE'] # Indicadores coagidos na unificação
+COLUNAS_KNN = ['IDA', 'IEG', 'IPS', 'IPP'] # Vizinhança do KNN que completa o IPP de 2022
+
+# Mapeamentos fixos por ano (prioridade máxima)
+MAPEAMENTO_ANO = { # Nomes das colunas de INDE e pedra em cada ciclo
+    '2022': {'INDE 22': 'INDE', 'Pedra 22': 'PEDRA'},
+    '2023': {'INDE 2023': 'INDE', 'Pedra 2023': 'PEDRA'},
+    '2024': {'INDE 2024': 'INDE', 'Pedra 2024': 'PEDRA'},
+} # Encerra os mapeamentos
+
+# Mapeamento de termos exatos
+MAPEAMENTO_EXATO = { # Nome normalizado -> nome padronizado
+    'iaa': 'IAA', 'ieg': 'IEG', 'ips': 'IPS', 'ipp': 'IPP', 'ida': 'IDA',
+    'ipv': 'IPV', 'ian': 'IAN', 'ra': 'RA', 'fase': 'FASE', 'cg': 'CG',
+    'cf': 'CF', 'ct': 'CT', 'genero': 'GENERO', 'gênero': 'GENERO',
+    'instituição de ensino': 'INSTITUICAO_ENSINO',
+} # Encerra o mapeamento
+
+LIMITES_PEDRA = [2.405, 5.506, 6.868, 8.230, 9.294] # Faixas do INDE de cada pedra (regras da Passos Mágicos)
+ROTULOS_PEDRA = ['QUARTZO', 'AGATA', 'AMETISTA', 'TOPAZIO'] # Pedras correspondentes às faixas
+
+# ==========================================================================
+# Padronização por aba
+# ==========================================================================
+
+def normalizar_texto(s): # Remove acentos, espaços das pontas e padroniza para minúsculo
+    return unicodedata.normalize('NFKD', str(s)).encode('ascii', 'ignore').decode('utf-8').lower().strip()
+
+def nome_padronizado(col, ano_referencia): # Nome técnico de uma coluna bruta (None = coluna descartável)
+    """Aplica as regras de renomeação do notebook a um único nome de coluna."""
+    ano = str(ano_referencia) # Ano como texto
+    mapeamento = MAPEAMENTO_ANO.get(ano) or {f'INDE {ano}': 'INDE', f'Pedra {ano}': 'PEDRA'} # Anos novos seguem o padrão de 2023/2024
+    if col in mapeamento: return mapeamento[col] # Prioridade máxima
+    c_norm = normalizar_texto(col) # Nome sem acentos e em minúsculo
+    if c_norm in MAPEAMENTO_EXATO: return MAPEAMENTO_EXATO[c_norm] # Termo exato
+    if 'idade' in c_norm: return 'IDADE' # Colunas de idade
+    if any(x in c_norm for x in ['iaa', 'ipv', 'ieg', 'ips', 'ipp', 'ian']): return c_norm[:3].upper() # Siglas dos indicadores
+    if 'defas' in c_norm: return 'DEFASAGEM' # Defasagem escolar
+    if 'fase ideal' in c_norm or 'nivel ideal' in c_norm: return 'FASE_IDEAL' # Fase ou nível ideal
+    if 'atingiu pv' in c_norm or 'ponto_virada' in c_norm: return 'PONTO_VIRADA' # Ponto de virada
+    if 'ano ingresso' in c_norm or 'ano_ingresso' in c_norm: return 'ANO_INGRESSO' # Ano de ingresso
+    if 'nasc' in c_norm: return 'ANO_NASCIMENTO' # Ano ou data de nascimento
+    if 'ensino' in c_norm: return 'INSTITUICAO_ENSINO' # Instituição de ensino
+    return None # Mantém o nome original
+
+def padronizar_colunas(df, ano_referencia): # Limpeza, padronização de colunas e cálculo dos indicadores de uma aba
+    """Realiza a limpeza, padronização de colunas e cálculos de indicadores (INDE, Pedra, etc.) de uma aba PEDE."""
+    df_result = df.copy() # Preserva os dados brutos
+    ano_str = str(ano_referencia) # Ano como texto (mapeamentos e coluna ANO)
+
+    # 1. Normalização de nomes de colunas ('I.N.D.E 2022' ou 'inde' viram 'INDE')
+    novos = {col: nome_padronizado(col, ano_str) for col in df_result.columns} # Nome técnico de cada coluna
+    df_result = df_result.rename(columns={c: n for c, n in novos.items() if n}).loc[:, lambda x: ~x.columns.duplicated()] # Renomeia e remove duplicadas
+    df_result['ANO'] = ano_str # Coluna de controle temporal
+
+    # 2. Limpeza de dados e tipagem
+    if 'GENERO' in df_result.columns: # Unifica Masculino/Feminino
+        df_result['GENERO'] = df_result['GENERO'].astype(str).str.strip().replace({
+            'Menino': 'Masculino', 'menino': 'Masculino',
+            'Menina': 'Feminino', 'menina': 'Feminino',
+        })
+    for col in ['INDE', 'IAA', 'IEG', 'IPS', 'IDA', 'IPV', 'IAN', 'IPP', 'IDADE', 'ANO_NASCIMENTO']: # Colunas estritamente numéricas
+        if col in df_result.columns:
+            df_result[col] = pd.to_numeric(df_result[col], errors='coerce') # Erros viram NaN
+
+    # 3. Tratamento de fases ("2ª Fase", "Nível 3" e "ALFA")
+    for col_fase in ['FASE', 'FASE_IDEAL']:
+        if col_fase in df_result.columns:
+            s = df_result[col_fase].astype(str).str.lower() # Texto em minúsculo
+            if col_fase == 'FASE': # 'alfa' vira 0, demais extraem o primeiro número
+                df_result[col_fase] = np.where(s.str.contains('alfa'), 0, s.str.extract(r'(\d+)')[0])
+            else: # Apenas o componente numérico
+                df_result[col_fase] = s.str.extract(r'(\d+)')[0]
+            df_result[col_fase] = pd.to_numeric(df_result[col_fase], errors='coerce') # Números extraídos
+
+    # 4. Colunas derivadas
+    if 'DEFASAGEM' not in df_result.columns and {'FASE', 'FASE_IDEAL'}.issubset(df_result.columns): # Fase atual - fase ideal
+        df_result['DEFASAGEM'] = df_result['FASE'] - df_result['FASE_IDEAL']
+    if 'IDADE' not in df_result.columns and 'ANO_NASCIMENTO' in df_result.columns: # Idade pelo ano de nascimento
+        df_result['IDADE'] = int(ano_referencia) - df_result['ANO_NASCIMENTO']
+    if 'IDA' not in df_result.columns and {'NOTA_MAT', 'NOTA_PORT', 'NOTA_ING'}.issubset(df_result.columns): # Média das notas
+        df_result['IDA'] = df_result[['NOTA_MAT', 'NOTA_PORT', 'NOTA_ING']].mean(axis=1)
+    if 'IAA' not in df_result.columns and {'CG', 'CF', 'CT'}.issubset(df_result.columns): # Média da autoavaliação
+        df_result['IAA'] = df_result[['CG', 'CF', 'CT']].mean(axis=1)
+    if 'IAN' not in df_result.columns and 'DEFASAGEM' in df_result.columns: # IAN derivado da defasagem
+        df_result['IAN'] = df_result['DEFASAGEM']
+
+    # 5. INDE (média ponderada vetorizada, pesos diferentes para fases > 7)
+    if 'INDE' not in df_result.columns and 'FASE' in df_result.columns:
+        indics = ['IAN', 'IDA', 'IEG', 'IAA', 'IPS', 'IPP', 'IPV'] # Componentes do INDE
+        pesos_fase_baixa = np.array([0.1, 0.2, 0.2, 0.1, 0.1, 0.1, 0.2]) # Até a fase 7
+        pesos_fase_alta = np.array([0.1, 0.2, 0.2, 0.1, 0.1, 0.0, 0.0]) # Acima da fase 7
+        dados = df_result[indics].fillna(0).values # Nulos como zero
+        presentes = df_result[indics].notna().values # Ignora nulos na média
+        pesos = np.where((df_result['FASE'] <= 7).values[:, None], pesos_fase_baixa, pesos_fase_alta) # Peso por linha
+        soma_pesos = (pesos * presentes).sum(axis=1) # Denominador
+        df_result['INDE'] = np.where(soma_pesos > 0, (dados * pesos * presentes).sum(axis=1) / soma_pesos, np.nan)
+
+    # 6. Classificação de pedra (faixas do INDE)
+    calc_pedra = pd.cut(df_result['INDE'], bins=LIMITES_PEDRA, labels=ROTULOS_PEDRA, right=False, include_lowest=True) # Pedra calculada
+    if 'PEDRA' in df_result.columns: # Limpa o texto existente e completa com o cálculo
+        df_result['PEDRA'] = df_result['PEDRA'].astype(str).apply(normalizar_texto).str.upper().replace({'INCLUIR': np.nan, 'NAN': np.nan})
+        df_result['PEDRA'] = df_result['PEDRA'].fillna(calc_pedra.astype(object))
+    else:
+        df_result['PEDRA'] = calc_pedra
+
+    # 7. Ponto de virada (INDE >= 7)
+    if 'PONTO_VIRADA' not in df_result.columns and 'INDE' in df_result.columns:
+        df_result['PONTO_VIRADA'] = df_result['INDE'] >= 7
+
+    # 8. Idade inteira (aceitando nulos)
+    if 'IDADE' in df_result.columns:
+        df_result['IDADE'] = df_result['IDADE'].astype('Int64')
+
+    return df_result # Aba padronizada
+
+def selecionar_colunas(df, colunas=COLUNAS_BASE): # Mantém apenas as colunas principais presentes
+    """Seleciona as colunas principais existentes na aba, na ordem de `colunas`."""
+    return df[[c for c in colunas if c in df.columns]] # Interseção preservando a ordem
+
+# ==========================================================================
+# Unificação
+# ==========================================================================
+
+def criar_base_unificada(lista_dfs): # Consolida as abas padronizadas
+    """Unifica uma lista de DataFrames, padroniza a coluna PEDRA e converte indicadores para o formato numérico."""
+    df_unificado = pd.concat(lista_dfs, ignore_index=True) # Concatena as abas
+    if 'PEDRA' in df_unificado.columns: # Grafia consistente
+        df_unificado['PEDRA'] = df_unificado['PEDRA'].replace('Agata', 'Ágata')
+    cols_presentes = df_unificado.columns.intersection(COLUNAS_NUMERICAS) # Indicadores presentes
+    if not cols_presentes.empty: # Força o tipo numérico
+        df_unificado[cols_presentes] = df_unificado[cols_presentes].apply(pd.to_numeric, errors='coerce')
+    logger.info("Base unificada criada (%d linhas)", len(df_unificado))
+    return df_unificado # Base unificada e tipada
+
+def aplicar_knn_ipp(df, n_vizinhos=5): # Completa o IPP de 2022 a partir do perfil dos anos seguintes
+    """Preenche valores ausentes de IDA, IEG, IPS e IPP com KNN (mesma etapa do notebook)."""
+    from sklearn.impute import KNNImputer # Importação tardia: só necessária na visão unificada
+    df_temp = df.copy() # Não altera o DataFrame do chamador
+    df_temp[COLUNAS_KNN] = KNNImputer(n_neighbors=n_vizinhos).fit_transform(df_temp[COLUNAS_KNN]) # Imputação
+    return df_temp # Base completa
@@ -0,0 +1,57 @@
+# ==========================================================================
+# Carregamento do modelo de risco
+# ==========================================================================
+
+# Bibliotecas do Sistema e Utilitários
+import hashlib       # Confere o checksum do artefato baixado
+import logging       # Registro da origem e do tempo de carga do modelo
+import time          # Mede o tempo de download
+from pathlib import Path # Manipulação de caminhos independente do diretório de execução
+
+# Processamento e Manipulação de Dados
+import requests      # Permite realizar requisições HTTP para buscar o modelo no GitHub
+
+# Módulos do projeto
+from pede_analytics import registro # Registro local de artefatos com manifesto SHA-256
+from pede_analytics.registro import MODELO_PADRAO # Nome lógico do modelo de risco
+from pede_analytics.regras import FAIXAS_RISCO, classificar_nivel_risco, classificar_nivel_risco_lote # Faixas de risco (definidas em regras)
+
+logger = logging.getLogger(__name__) # Logger do módulo
+
+# ==========================================================================
+# Constantes
+# ==========================================================================
+
+RAIZ_PROJETO = Path(__file__).resolve().parents[1] # Raiz do repositório (pasta acima do pacote)
+URL_MODELO = "https://raw.githubusercontent.com/geoferreira1/fiap_tech_challenge_fase_5/main/models/modelo_final_gradient_boosting.joblib" # URL do repositório remoto
+
+# ==========================================================================
+# Funções de Suporte
+# ==========================================================================
+
+def carregar_modelo(nome=MODELO_PADRAO, versao=None, url=URL_MODELO): # Carrega o pipeline treinado
+    """Carrega o modelo do registro local (SHA-256 + memory-map); baixa do GitHub só se o artefato faltar."""
+    # 1. Registro local: artefato verificado contra o manifesto
+    try: # Inicia bloco de captura de erros
+        return registro.carregar(nome, versao) # Caminho normal (logado com origem e tempo)
+    except FileNotFoundError as e: # Artefato ausente (ex.: clone sem os binários)
+        logger.warning("Artefato local ausente (%s); tentando o repositório remoto.", e)
+    except Exception: # Manifesto ausente, checksum divergente ou arquivo corrompido
+        logger.exception("Falha ao carregar o modelo %s do registro local.", nome)
+        return None # Não mascara artefato adulterado com um download silencioso
+
+    # 2. Download do GitHub, conferido com o mesmo checksum e salvo no registro local
+    try: # Inicia bloco de tentativa remota
+        versao, caminho, meta = registro.resolver(nome, versao) # Checksum esperado
+        inicio = time.perf_counter() # Marca o início do download
+        response = requests.get(url, timeout=15) # Realiza o download do modelo via HTTP
+        response.raise_for_status() # Lança erro se a requisição não for bem-sucedida
+        if hashlib.sha256(response.content).hexdigest() != meta['sha256']: # Confere antes de gravar
+            raise registro.ErroIntegridadeModelo(f"Checksum divergente no download de {url}")
+        caminho.write_bytes(response.content) # Próximas cargas serão locais
+        logger.info("Modelo %s v%s baixado de %s em %.0f ms", nome, versao, url, (time.perf_counter() - inicio) * 1000)
+        return registro.carregar(nome, versao) # Carga com memory-map a partir do disco
+    except Exception: # Captura qualquer falha no processo remoto
+        logger.exception("Erro crítico: não foi possível carregar o modelo remotamente.")
+
+    return None # Retorna nulo caso todas as tentativas falhem
@@ -0,0 +1,149 @@
+# ==========================================================================
+# Pontuação em lote do modelo de risco de defasagem
+# ==========================================================================
+# Uso: python -m pede_analytics.pontuacao data_processed/df_unificado.csv saida.csv
+
+# Bibliotecas do Sistema e Utilitários
+import argparse      # Interpreta os argumentos da linha de comando
+import logging       # Exibe a origem e o tempo de carga do modelo
+import time          # Mede o tempo de execução para cálculo de vazão (linhas/s)
+from pathlib import Path # Manipulação de caminhos de entrada e saída
+
+# Processamento e Manipulação de Dados
+import pandas as pd  # Ferramenta principal para criação e manipulação de DataFrames
+
+# Módulos do projeto
+from pede_analytics.esquema import ALIASES_COLUNAS, FEATURES_MODELO, normalizar_nome_coluna # Esquema do modelo
+from pede_analytics.inferencia import BACKENDS, LIMIAR_PADRAO, InferenciaRisco # Inferência em passada única
+from pede_analytics.modelo import carregar_modelo # Carga do pipeline
+from pede_analytics.previsoes import CAMINHO_PREVISOES, CachePrevisoes, assinatura_modelo # Reaproveitamento entre execuções
+from pede_analytics.registro import resolver # Versão atual do modelo (chave do cache)
+from pede_analytics.regras import risco_defasagem # Rótulo das regras de negócio (alvo do treino)
+
+TAMANHO_LOTE = 50_000 # Quantidade padrão de linhas avaliadas por passada do modelo
+
+logger = logging.getLogger('pede_analytics.pontuacao') # Nome fixo: sob `-m` o __name__ é '__main__'
+
+# ==========================================================================
+# Preparação da coorte
+# ==========================================================================
+
+def mapear_colunas(df): # Converte os nomes de coluna da coorte para o esquema do modelo
+    """Renomeia as colunas da coorte para o esquema do modelo e completa os atributos derivados."""
+    renomear = {} # Dicionário de renomeação
+    for col in df.columns: # Percorre as colunas do arquivo
+        destino = ALIASES_COLUNAS.get(normalizar_nome_coluna(col)) # Procura o nome técnico correspondente
+        if destino and destino not in renomear.values() and (destino == col or destino not in df.columns): # Evita colisões
+            renomear[col] = destino # Registra a renomeação
+    df = df.rename(columns=renomear) # Aplica os novos nomes
+
+    if 'DEFASAGEM' not in df.columns and {'FASE', 'FASE_IDEAL'}.issubset(df.columns): # Defasagem ausente
+        df['DEFASAGEM'] = df['FASE'] - df['FASE_IDEAL'] # Mesma regra do formulário (fase - fase ideal)
+
+    faltantes = [c for c in FEATURES_MODELO if c not in df.columns] # Atributos que não puderam ser mapeados
+    if faltantes: # Interrompe com mensagem clara em vez de pontuar com colunas vazias
+        raise ValueError(f"Colunas obrigatórias ausentes na coorte: {', '.join(faltantes)}")
+
+    df['GENERO'] = df['GENERO'].astype(str).str.capitalize() # Padroniza gênero como no dashboard
+    return df # Retorna a coorte no formato esperado pelo pipeline
+
+def ler_coorte(caminho, tamanho_lote=TAMANHO_LOTE): # Lê a coorte em blocos para limitar o uso de memória
+    """Gera DataFrames de até `tamanho_lote` linhas a partir de um arquivo CSV ou Parquet."""
+    caminho = Path(caminho) # Normaliza o caminho recebido
+    if caminho.suffix.lower() in ('.parquet', '.pq'): # Arquivos colunares
+        import pyarrow.parquet as pq # Importação tardia: só necessária para Parquet
+        for lote in pq.ParquetFile(caminho).iter_batches(batch_size=tamanho_lote): # Lê grupos de linhas
+            yield lote.to_pandas() # Converte cada bloco Arrow para pandas
+    else: # Demais extensões tratadas como CSV
+        yield from pd.read_csv(caminho, chunksize=tamanho_lote) # Leitura incremental do CSV
+
+# ==========================================================================
+# Pontuação
+# ==========================================================================
+
+def pontuar_lote(inferencia, df, explicar=False): # Executa uma única passada do modelo sobre o bloco
+    """Adiciona ROTULO_RISCO, PROB_RISCO, NIVEL_RISCO e RISCO_REGRA ao DataFrame recebido.
+
+    Com `explicar=True`, acrescenta também as contribuições CONTRIB_* de `InferenciaRisco.explicar`.
+    """
+    entrada = mapear_colunas(df.copy()) # Ajusta as colunas sem alterar o bloco original
+    resultado = inferencia.prever(entrada[FEATURES_MODELO]) # Rótulo, probabilidade e faixa de uma só vez
+    regra = pd.array(risco_defasagem(entrada).to_numpy(), dtype='Int8') # Rótulo pelas regras (compara com o modelo)
+    regra[resultado['ROTULO_RISCO'].isna().to_numpy()] = pd.NA # Apenas as linhas avaliadas pelo modelo
+    resultado['RISCO_REGRA'] = regra # Mesmo rótulo usado no treino
+    if explicar: resultado = resultado.join(inferencia.explicar(entrada[FEATURES_MODELO])) # Contribuições por atributo
+    saida = df.copy() # Preserva as colunas originais (RA, ANO etc.) na saída
+    saida[resultado.columns] = resultado # Acrescenta as colunas de resultado
+    return saida # Retorna o bloco pontuado
+
+def pontuar_arquivo(entrada, saida, model=None, tamanho_lote=TAMANHO_LOTE, limiar=LIMIAR_PADRAO, backend='sklearn',
+                    cache_previsoes=None, explicar=False): # Pontua uma coorte inteira
+    """Pontua o arquivo de entrada bloco a bloco e grava o resultado; retorna (linhas, segundos).
+
+    Com `cache_previsoes` (caminho SQLite), alunos cujos 14 atributos não mudaram desde a última
+    execução com o mesmo artefato reaproveitam a probabilidade gravada, sem passar pelo modelo.
+    Com `explicar=True`, a saída inclui as contribuições CONTRIB_* de cada atributo (log-odds).
+    """
+    if cache_previsoes is not None and model is not None: # A chave precisa identificar o artefato
+        raise ValueError("O cache de previsões exige o modelo do registro (não informe `model`).")
+    versao = resolver()[0] if cache_previsoes is not None else None # Mesma versão no modelo e na chave
+    model = model if model is not None else carregar_modelo(versao=versao) # Reaproveita o mesmo carregador do app
+    if model is None: # Falha de carregamento já registrada no console
+        raise RuntimeError("O modelo de predição não foi carregado corretamente.")
+    inferencia = InferenciaRisco(model, limiar=limiar, backend=backend) # Wrapper de passada única
+    if cache_previsoes is not None: # Só avalia perfis novos ou alterados
+        inferencia = CachePrevisoes(inferencia, assinatura_modelo(versao=versao), caminho=cache_previsoes)
+
+    saida = Path(saida) # Normaliza o caminho de saída
+    saida.parent.mkdir(parents=True, exist_ok=True) # Garante a pasta de destino
+    parquet = saida.suffix.lower() in ('.parquet', '.pq') # Define o formato pela extensão
+    escritor = None # Escritor Parquet criado no primeiro bloco
+    total = 0 # Contador de linhas pontuadas
+    inicio = time.perf_counter() # Marca o início da pontuação
+
+    try: # Garante o fechamento do arquivo Parquet
+        for i, bloco in enumerate(ler_coorte(entrada, tamanho_lote)): # Percorre os blocos da coorte
+            resultado = pontuar_lote(inferencia, bloco, explicar) # Pontua o bloco em uma única passada
+            if parquet: # Saída colunar
+                import pyarrow as pa # Importação tardia: só necessária para Parquet
+                import pyarrow.parquet as pq
+                tabela = pa.Table.from_pandas(resultado, preserve_index=False) # Converte o bloco para Arrow
+                escritor = escritor or pq.ParquetWriter(saida, tabela.schema) # Abre o arquivo no primeiro bloco
+                escritor.write_table(tabela.cast(escritor.schema)) # Acrescenta o bloco ao arquivo
+            else: # Saída CSV acrescentando blocos
+                resultado.to_csv(saida, mode='w' if i == 0 else 'a', header=(i == 0), index=False, encoding='utf-8-sig' if i == 0 else 'utf-8')
+            total += len(resultado) # Atualiza o total de linhas
+    finally: # Encerra o escritor mesmo em caso de erro
+        if escritor is not None: escritor.close()
+        if cache_previsoes is not None: # Resumo do reaproveitamento
+            logger.info("Cache de previsões: %d de %d linhas sem passar pelo modelo (%d perfis do disco, %d avaliados)",
+                        inferencia.reaproveitadas, inferencia.linhas, inferencia.acertos_disco, inferencia.avaliadas)
+            inferencia.fechar() # Libera o banco
+
+    return total, time.perf_counter() - inicio # Linhas pontuadas e tempo total
+
+# ==========================================================================
+# Linha de comando
+# ==========================================================================
+
+def main(argv=None): # Ponto de entrada da CLI
+    parser = argparse.ArgumentParser(description="Pontua uma coorte (CSV/Parquet) com o modelo de risco de defasagem.")
+    parser.add_argument('entrada', help="Arquivo CSV ou Parquet com os alunos")
+    parser.add_argument('saida', help="Arquivo de saída (.csv ou .parquet)")
+    parser.add_argument('--tamanho-lote', type=int, default=TAMANHO_LOTE, help="Linhas por chamada ao modelo")
+    parser.add_argument('--limiar', type=float, default=LIMIAR_PADRAO, help="Probabilidade mínima para ROTULO_RISCO = 1")
+    parser.add_argument('--backend', choices=BACKENDS, default='sklearn', help="Motor de inferência (compilado = árvores em NumPy)")
+    parser.add_argument('--cache-previsoes', nargs='?', const=CAMINHO_PREVISOES, metavar='SQLITE',
+                        help="Reaproveita previsões de alunos sem alteração (padrão: .cache/previsoes.sqlite)")
+    parser.add_argument('--explicar', action='store_true', help="Acrescenta a contribuição de cada atributo (CONTRIB_*, em log-odds)")
+    args = parser.parse_args(argv) # Lê os argumentos
+    logging.basicConfig(format="%(levelname)s %(name)s: %(message)s") # Logs no console
+    logging.getLogger('pede_analytics').setLevel(logging.INFO) # Origem e tempo de carga do modelo
+
+    linhas, segundos = pontuar_arquivo(args.entrada, args.saida, tamanho_lote=args.tamanho_lote, limiar=args.limiar,
+                                       backend=args.backend, cache_previsoes=args.cache_previsoes, explicar=args.explicar) # Executa a pontuação
+    vazao = linhas / segundos if segundos > 0 else float('inf') # Calcula a vazão
+    print(f"✅ {linhas:,} alunos pontuados em {segundos:.2f}s ({vazao:,.0f} linhas/s) -> {args.saida}") # Resumo final
+
+if __name__ == "__main__": # Execução via python -m pede_analytics.pontuacao
+    main() # Executa a CLI
@@ -0,0 +1,148 @@
+# ==========================================================================
+# Cache de previsões por perfil de aluno (memória LRU + SQLite opcional)
+# ==========================================================================
+
+# Bibliotecas do Sistema e Utilitários
+import sqlite3       # Camada em disco, sem servidor
+import threading     # Sessões do Streamlit compartilham a mesma conexão
+from pathlib import Path # Caminho do banco
+
+# Processamento e Manipulação de Dados
+import numpy as np   # Probabilidades e chaves por linha
+import pandas as pd  # Hash vetorizado das linhas
+
+# Módulos do projeto
+from pede_analytics.cache import CacheLRU # Camada em memória
+from pede_analytics.esquema import FEATURES_CAT, FEATURES_MODELO # Colunas que definem o perfil
+from pede_analytics.modelo import RAIZ_PROJETO # Pasta .cache na raiz
+from pede_analytics.registro import DIRETORIO_MODELOS, MODELO_PADRAO, resolver # Versão e checksum do artefato
+
+# ==========================================================================
+# Constantes
+# ==========================================================================
+
+CAMINHO_PREVISOES = RAIZ_PROJETO / '.cache' / 'previsoes.sqlite' # Camada em disco padrão
+MAX_ITENS = 100_000 # Perfis mantidos em memória (~100 bytes cada)
+DECIMAIS = 9 # Arredondamento dos indicadores: elimina ruído de ponto flutuante (ex.: 0.30000000000000004)
+LOTE_SQL = 500 # Chaves por consulta IN (abaixo do limite de parâmetros do SQLite)
+FEATURES_NUMERICAS = [c for c in FEATURES_MODELO if c not in FEATURES_CAT] # Inclui DEFASAGEM
+
+ESQUEMA = """
+CREATE TABLE IF NOT EXISTS previsoes (
+    modelo TEXT NOT NULL,     -- Assinatura do artefato (nome@versão:sha256)
+    chave  INTEGER NOT NULL,  -- Hash de 64 bits do perfil canônico
+    prob   REAL,              -- Probabilidade de risco (NULL = linha não avaliada)
+    PRIMARY KEY (modelo, chave)
+) WITHOUT ROWID;
+"""
+
+# ==========================================================================
+# Chaves
+# ==========================================================================
+
+def assinatura_modelo(nome=MODELO_PADRAO, versao=None, diretorio=DIRETORIO_MODELOS): # Parte da chave ligada ao artefato
+    """'nome@versão:sha256' do artefato registrado: republicar ou trocar o arquivo gera outra assinatura."""
+    versao, _, meta = resolver(nome, versao, diretorio) # Versão pedida ou atual
+    return f"{nome}@{versao}:{meta['sha256'][:16]}" # Checksum invalida previsões de artefatos alterados
+
+def chaves_perfis(df): # Uma chave por linha
+    """Hash de 64 bits (uint64) das 14 colunas do modelo em forma canônica.
+
+    Indicadores viram float64 arredondado a `DECIMAIS` casas (idade 15 e 15.0 coincidem) e categorias
+    viram texto, com ausentes unificados; a ordem das colunas é sempre a de `FEATURES_MODELO`.
+    """
+    numericos = df[FEATURES_NUMERICAS].apply(pd.to_numeric, errors='coerce').astype('float64').round(DECIMAIS) + 0.0 # -0.0 -> 0.0
+    canonico = pd.concat([numericos.where(numericos.notna(), np.nan), # Um único padrão de NaN
+                          df[FEATURES_CAT].astype('string')], axis=1) # Ausentes viram pd.NA
+    return pd.util.hash_pandas_object(canonico, index=False).to_numpy() # Vetorizado (sem laço por linha)
+
+# ==========================================================================
+# Cache
+# ==========================================================================
+
+class CachePrevisoes: # Mesma interface de InferenciaRisco.prever, com reaproveitamento
+    """Envolve uma `InferenciaRisco` e só avalia o modelo para perfis ainda não vistos.
+
+    A chave é (`modelo`, hash do perfil), com `modelo` vindo de `assinatura_modelo`. A probabilidade
+    fica em um `CacheLRU` e, com `caminho`, também em SQLite, de modo que execuções seguintes do
+    lote não repetem a inferência de alunos cujos atributos não mudaram. Rótulo e faixa são
+    recalculados a partir da probabilidade, então o cache vale para qualquer limiar.
+    """
+
+    def __init__(self, inferencia, modelo, max_itens=MAX_ITENS, caminho=None): # Camadas do cache
+        self.inferencia = inferencia # Avalia os perfis ausentes
+        self.modelo = modelo # Assinatura do artefato
+        self._memoria = CacheLRU(max_itens=max_itens) # (modelo, chave) -> probabilidade
+        self._trava = threading.Lock() # Uma conexão SQLite compartilhada entre threads
+        self._conexao = None # Camada em disco (opcional)
+        if caminho is not None: # Banco persistente
+            Path(caminho).parent.mkdir(parents=True, exist_ok=True) # Pasta .cache
+            self._conexao = sqlite3.connect(caminho, check_same_thread=False) # Acesso serializado pela trava
+            self._conexao.execute('PRAGMA journal_mode=WAL') # Leitores não bloqueiam o lote
+            self._conexao.executescript(ESQUEMA) # Tabela idempotente
+        self.linhas = 0 # Linhas recebidas
+        self.reaproveitadas = 0 # Linhas atendidas sem o modelo (memória ou disco)
+        self.acertos_disco = 0 # Perfis recuperados do SQLite
+        self.avaliadas = 0 # Perfis que passaram pelo modelo
+
+    def prever(self, df): # Mesma saída de InferenciaRisco.prever
+        """Retorna ROTULO_RISCO, PROB_RISCO e NIVEL_RISCO, avaliando o modelo só nos perfis ausentes do cache."""
+        chaves = chaves_perfis(df).view(np.int64).tolist() # INTEGER do SQLite é com sinal
+        probs = np.empty(len(df)) # Probabilidade de cada linha
+        faltam = {} # Chave ausente -> linhas com esse perfil
+        for i, chave in enumerate(chaves): # Camada em memória
+            valor = self._memoria.consultar((self.modelo, chave)) # None = ausente
+            if valor is None: faltam.setdefault(chave, []).append(i) # Perfis repetidos no bloco contam uma vez
+            else: probs[i] = valor
+
+        if faltam and self._conexao is not None: # Camada em disco
+            for chave, prob in self._ler(list(faltam)): # Perfis já avaliados em execuções anteriores
+                prob = np.nan if prob is None else prob # NULL -> linha não avaliada
+                probs[faltam.pop(chave)] = prob # Todas as linhas do perfil
+                self._memoria.armazenar((self.modelo, chave), prob) # Promove para a memória
+                self.acertos_disco += 1 # Contabiliza o acerto em disco
+
+        self.linhas += len(df) # Contabiliza o bloco
+        self.reaproveitadas += len(df) - sum(map(len, faltam.values())) # Linhas que dispensaram o modelo
+        if faltam: # Única passada do modelo sobre os perfis novos
+            primeiras = [linhas[0] for linhas in faltam.values()] # Uma linha por perfil
+            novas = self.inferencia.prever(df.iloc[primeiras])['PROB_RISCO'].to_numpy() # Probabilidades
+            for (chave, linhas), prob in zip(faltam.items(), novas): # Preenche e armazena
+                probs[linhas] = prob
+                self._memoria.armazenar((self.modelo, chave), prob)
+            if self._conexao is not None: self._gravar(zip(faltam, novas.tolist())) # Persiste o lote
+            self.avaliadas += len(primeiras) # Contabiliza a inferência
+
+        return self.inferencia.rotular(probs, df.index) # Rótulo pelo limiar atual
+
+    def em_memoria(self, df): # Consulta sem alterar a ordem LRU nem os contadores
+        """Máscara booleana das linhas de `df` cujo perfil já está na camada em memória."""
+        return np.array([(self.modelo, chave) in self._memoria for chave in chaves_perfis(df).view(np.int64).tolist()], dtype=bool)
+
+    def explicar(self, df): # Explicações não passam pelo cache
+        return self.inferencia.explicar(df) # Mesmo contrato de InferenciaRisco.explicar
+
+    def _ler(self, chaves): # Consulta em blocos de LOTE_SQL chaves
+        encontrados = [] # (chave, probabilidade) presentes no banco
+        with self._trava: # Conexão compartilhada
+            for inicio in range(0, len(chaves), LOTE_SQL): # Respeita o limite de parâmetros
+                bloco = chaves[inicio:inicio + LOTE_SQL]
+                encontrados += self._conexao.execute(
+                    f"SELECT chave, prob FROM previsoes WHERE modelo = ? AND chave IN ({', '.join('?' * len(bloco))})",
+                    (self.modelo, *bloco),
+                ).fetchall()
+        return encontrados # Pares encontrados
+
+    def _gravar(self, pares): # (chave, probabilidade) em uma transação
+        with self._trava, self._conexao: # Commit ao final do bloco
+            self._conexao.executemany("INSERT OR REPLACE INTO previsoes VALUES (?, ?, ?)",
+                                      ((self.modelo, chave, None if np.isnan(prob) else prob) for chave, prob in pares))
+
+    def descartar_outros_modelos(self): # Limpa previsões de artefatos antigos
+        """Remove do SQLite as previsões de outras assinaturas; retorna quantas linhas saíram."""
+        if self._conexao is None: return 0 # Sem camada em disco
+        with self._trava, self._conexao: # Transação única
+            return self._conexao.execute("DELETE FROM previsoes WHERE modelo != ?", (self.modelo,)).rowcount
+
+    def fechar(self): # Libera o banco
+        if self._conexao is not None: self._conexao.close()
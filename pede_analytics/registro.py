@@ -0,0 +1,144 @@
+# ==========================================================================
+# Registro local de modelos (manifesto SHA-256 + carga com memory-map)
+# ==========================================================================
+# Uso: python -m pede_analytics.registro registrar models/modelo_final_gradient_boosting.joblib --versao 1
+#      python -m pede_analytics.registro verificar
+
+# Bibliotecas do Sistema e Utilitários
+import argparse      # Interpreta os argumentos da linha de comando
+import hashlib       # Cálculo do SHA-256 dos artefatos
+import json          # Leitura e escrita do manifesto
+import logging       # Registro da origem e do tempo de carga do modelo
+import time          # Mede o tempo de carregamento
+from datetime import datetime, timezone # Data de registro das versões
+from pathlib import Path # Manipulação de caminhos independente do diretório de execução
+
+# Processamento e Manipulação de Dados
+import joblib        # Carrega objetos serializados, como o pipeline de IA (.joblib)
+
+logger = logging.getLogger(__name__) # Logger do módulo
+
+# ==========================================================================
+# Constantes
+# ==========================================================================
+
+DIRETORIO_MODELOS = Path(__file__).resolve().parents[1] / 'models' # Pasta de artefatos do repositório
+NOME_MANIFESTO = 'manifest.json' # Manifesto com versões e checksums
+MODELO_PADRAO = 'risco_defasagem' # Nome lógico do modelo usado pelo app
+TAMANHO_BLOCO_HASH = 1 << 20 # Leitura em blocos de 1 MiB para o SHA-256
+
+class ErroIntegridadeModelo(RuntimeError): # Artefato diferente do registrado no manifesto
+    """O SHA-256 do artefato não confere com o manifesto."""
+
+# ==========================================================================
+# Manifesto
+# ==========================================================================
+
+def sha256_arquivo(caminho): # Checksum do artefato sem carregá-lo inteiro na memória
+    """Retorna o SHA-256 (hex) do arquivo lido em blocos."""
+    h = hashlib.sha256() # Acumulador do hash
+    with open(caminho, 'rb') as f: # Leitura binária
+        for bloco in iter(lambda: f.read(TAMANHO_BLOCO_HASH), b''): h.update(bloco) # Atualiza bloco a bloco
+    return h.hexdigest() # Hash em hexadecimal
+
+def ler_manifesto(diretorio=DIRETORIO_MODELOS): # Lê o manifesto do registro
+    """Retorna o manifesto ({'modelos': {nome: {'atual', 'versoes'}}}) ou um manifesto vazio."""
+    caminho = Path(diretorio) / NOME_MANIFESTO # Local do manifesto
+    if not caminho.exists(): return {'modelos': {}} # Registro ainda vazio
+    return json.loads(caminho.read_text(encoding='utf-8')) # Manifesto existente
+
+def gravar_manifesto(manifesto, diretorio=DIRETORIO_MODELOS): # Grava o manifesto de forma atômica
+    caminho = Path(diretorio) / NOME_MANIFESTO # Local do manifesto
+    temporario = caminho.with_suffix('.tmp') # Escreve ao lado e renomeia
+    temporario.write_text(json.dumps(manifesto, indent=2, ensure_ascii=False) + '\n', encoding='utf-8')
+    temporario.replace(caminho) # Troca atômica evita manifesto truncado
+
+def registrar(arquivo, nome=MODELO_PADRAO, versao=None, diretorio=DIRETORIO_MODELOS, atual=True): # Registra um artefato
+    """Calcula o SHA-256 de `arquivo` (dentro de `diretorio`) e adiciona a versão ao manifesto."""
+    diretorio = Path(diretorio) # Normaliza o diretório do registro
+    arquivo = Path(arquivo) # Normaliza o artefato
+    if arquivo.resolve().parent != diretorio.resolve(): # O manifesto guarda apenas nomes relativos
+        raise ValueError(f"O artefato precisa estar em {diretorio}: {arquivo}")
+
+    manifesto = ler_manifesto(diretorio) # Estado atual do registro
+    modelo = manifesto['modelos'].setdefault(nome, {'atual': None, 'versoes': {}}) # Entrada do modelo
+    versao = str(versao) if versao is not None else str(len(modelo['versoes']) + 1) # Próxima versão sequencial
+    modelo['versoes'][versao] = { # Metadados da versão
+        'arquivo': arquivo.name,
+        'sha256': sha256_arquivo(arquivo),
+        'bytes': arquivo.stat().st_size,
+        'registrado_em': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+    } # Encerra os metadados
+    if atual or modelo['atual'] is None: modelo['atual'] = versao # Versão servida por padrão
+    gravar_manifesto(manifesto, diretorio) # Persiste o manifesto
+    return versao # Versão registrada
+
+def resolver(nome=MODELO_PADRAO, versao=None, diretorio=DIRETORIO_MODELOS): # Nome/versão -> artefato
+    """Retorna (versão, caminho, metadados) do artefato registrado; `versao=None` usa a versão atual."""
+    modelo = ler_manifesto(diretorio)['modelos'].get(nome) # Entrada do modelo no manifesto
+    if modelo is None: # Modelo nunca registrado
+        raise KeyError(f"Modelo não registrado: {nome!r}")
+    versao = str(versao) if versao is not None else modelo['atual'] # Versão pedida ou atual
+    if versao not in modelo['versoes']: # Versão inexistente
+        raise KeyError(f"Versão {versao!r} do modelo {nome!r} não registrada. Disponíveis: {', '.join(modelo['versoes'])}")
+    meta = modelo['versoes'][versao] # Metadados da versão
+    return versao, Path(diretorio) / meta['arquivo'], meta # Caminho absoluto do artefato
+
+def verificar(caminho, meta): # Confere tamanho e SHA-256
+    """Lança ErroIntegridadeModelo se o arquivo não corresponder ao manifesto."""
+    caminho = Path(caminho) # Normaliza o caminho
+    if caminho.stat().st_size != meta['bytes'] or sha256_arquivo(caminho) != meta['sha256']: # Tamanho primeiro (mais barato)
+        raise ErroIntegridadeModelo(f"Checksum divergente para {caminho.name}; registre novamente ou restaure o artefato.")
+
+# ==========================================================================
+# Carga
+# ==========================================================================
+
+def carregar(nome=MODELO_PADRAO, versao=None, diretorio=DIRETORIO_MODELOS, mmap_mode='r'): # Carrega um modelo registrado
+    """Resolve, verifica e carrega o artefato com `joblib.load(..., mmap_mode)`.
+
+    Com `mmap_mode='r'` os arrays NumPy do joblib (não comprimido) são mapeados do disco e as
+    páginas são compartilhadas entre processos que carregam o mesmo arquivo.
+    """
+    inicio = time.perf_counter() # Marca o início da carga
+    versao, caminho, meta = resolver(nome, versao, diretorio) # Localiza o artefato
+    verificar(caminho, meta) # Garante que é exatamente o artefato registrado
+    modelo = joblib.load(caminho, mmap_mode=mmap_mode) # Carga com memory-map dos arrays
+    logger.info("Modelo %s v%s carregado de %s (registro local, sha256 %s…) em %.0f ms",
+                nome, versao, caminho, meta['sha256'][:12], (time.perf_counter() - inicio) * 1000)
+    return modelo # Pipeline pronto para uso
+
+# ==========================================================================
+# Linha de comando
+# ==========================================================================
+
+def main(argv=None): # Ponto de entrada da CLI
+    parser = argparse.ArgumentParser(description="Registro local de modelos com manifesto SHA-256.")
+    sub = parser.add_subparsers(dest='comando', required=True) # Subcomandos
+    p_reg = sub.add_parser('registrar', help="Registra um artefato .joblib da pasta models/")
+    p_reg.add_argument('arquivo', help="Caminho do artefato")
+    p_reg.add_argument('--nome', default=MODELO_PADRAO, help="Nome lógico do modelo")
+    p_reg.add_argument('--versao', help="Versão (padrão: próxima sequencial)")
+    p_reg.add_argument('--sem-atual', action='store_true', help="Não torna esta versão a atual")
+    sub.add_parser('verificar', help="Confere os checksums de todas as versões registradas")
+    args = parser.parse_args(argv) # Lê os argumentos
+
+    if args.comando == 'registrar': # Registro de nova versão
+        versao = registrar(args.arquivo, args.nome, args.versao, atual=not args.sem_atual)
+        print(f"✅ {args.nome} v{versao} registrado em {DIRETORIO_MODELOS / NOME_MANIFESTO}")
+        return 0 # Sucesso
+
+    falhas = 0 # Quantidade de artefatos divergentes
+    for nome, modelo in ler_manifesto()['modelos'].items(): # Percorre os modelos
+        for versao in modelo['versoes']: # Percorre as versões
+            _, caminho, meta = resolver(nome, versao) # Artefato da versão
+            try: # Confere o checksum
+                verificar(caminho, meta)
+                print(f"✅ {nome} v{versao}: {caminho.name}")
+            except (ErroIntegridadeModelo, FileNotFoundError) as e: # Artefato alterado ou ausente
+                print(f"❌ {nome} v{versao}: {e}")
+                falhas += 1 # Contabiliza a falha
+    return 1 if falhas else 0 # Código de saída para CI
+
+if __name__ == "__main__": # Execução via python -m pede_analytics.registro
+    raise SystemExit(main()) # Executa a CLI
@@ -0,0 +1,95 @@
+# ==========================================================================
+# Regras do risco de defasagem (rótulo de treino e faixas de exibição)
+# ==========================================================================
+
+# Processamento e Manipulação de Dados
+import numpy as np   # Matriz booleana das condições e busca binária das faixas
+import pandas as pd  # Entradas e saídas indexadas
+
+# ==========================================================================
+# Regras de negócio
+# ==========================================================================
+
+OPERADORES = { # Operador declarado na regra -> comparação vetorizada do NumPy
+    '<': np.less, '<=': np.less_equal, '>': np.greater, '>=': np.greater_equal, '==': np.equal, '!=': np.not_equal,
+} # Encerra os operadores
+
+# Rótulo risco_defasagem (notebook): defasagem real OU pelo menos MINIMO_SINAIS sinais de alerta
+CONDICAO_ACADEMICA = ('DEFASAGEM', '<', 0) # Aluno em fase inferior à ideal para a idade
+SINAIS_ALERTA = [ # (coluna, operador, limite): cada condição verdadeira soma um sinal
+    ('IEG', '<', 7.0),            # Engajamento abaixo do patamar mínimo de segurança
+    ('IDA', '<', 6.5),            # Desempenho acadêmico insuficiente para a fase
+    ('IPS', '<', 6.0),            # Suporte psicossocial em nível crítico
+    ('PEDRA', '==', 'QUARTZO'),   # Período de ingresso (maior exposição e vulnerabilidade)
+    ('PONTO_VIRADA', '==', 'Não'), # Ausência do Ponto de Virada
+    ('IDADE', '>', 15),           # Idade associada estatisticamente à evasão
+] # Encerra os sinais de alerta
+MINIMO_SINAIS = 3 # Sinais simultâneos que caracterizam o risco comportamental
+COLUNAS_REGRA = list(dict.fromkeys(c for c, _, _ in [CONDICAO_ACADEMICA, *SINAIS_ALERTA])) # Colunas lidas pelo rótulo
+
+# Faixas de probabilidade do modelo (limite inferior, rótulo, emoji, classe css)
+FAIXAS_RISCO = [ # Ordenadas do menor para o maior limite
+    (0.00, 'Sem Risco', '✅', 'risk-low'),
+    (0.30, 'Atenção', '⚡', 'risk-attention'),
+    (0.60, 'Risco Moderado', '⚠️', 'risk-moderate'),
+    (0.85, 'Risco Alto', '🚨', 'risk-high')
+] # Encerra a tabela de faixas
+
+# Diagnóstico do formulário (limite inferior em %, título, emoji, alerta, caixa da recomendação, recomendação)
+FAIXAS_DIAGNOSTICO = [ # Ordenadas do menor para o maior limite
+    (0.0, 'BAIXO RISCO DE DEFASAGEM', '🥳', 'success', 'info',
+     'O aluno demonstra forte engajamento e resultados sólidos. Manter acompanhamento regular.'),
+    (50.0, 'MÉDIO RISCO', '⚠️', 'warning', 'info',
+     'Sugere-se monitoramento semanal e oferta de aulas de reforço em contraturno.'),
+    (51.0, 'ALTO RISCO DE DEFASAGEM', '🚨', 'error', 'warning',
+     'Aluno necessita de plano de recuperação imediato e reunião com responsáveis.'),
+] # Encerra a tabela de diagnóstico
+
+# ==========================================================================
+# Rótulo risco_defasagem
+# ==========================================================================
+
+def matriz_condicoes(df, condicoes): # Todas as condições avaliadas de uma vez
+    """Matriz booleana (linhas x condições); valores ausentes nunca satisfazem uma condição."""
+    matriz = np.zeros((len(df), len(condicoes)), dtype=bool) # Uma coluna por condição
+    for j, (coluna, operador, limite) in enumerate(condicoes): # Condições declaradas como dados
+        if isinstance(limite, str): # Comparação de texto (pedra, ponto de virada)
+            valores = df[coluna].to_numpy(dtype=object) # Nulos continuam diferentes do texto
+        else: # Comparação numérica (NaN resulta em False)
+            valores = pd.to_numeric(df[coluna], errors='coerce').to_numpy(dtype=float, na_value=np.nan)
+        matriz[:, j] = OPERADORES[operador](valores, limite) # Avaliação vetorizada
+    return matriz # Condições por aluno
+
+def risco_defasagem(df, sinais=SINAIS_ALERTA, minimo=MINIMO_SINAIS, academica=CONDICAO_ACADEMICA): # Alvo do modelo
+    """Rótulo 0/1 do notebook: defasagem real ou `minimo` sinais de alerta simultâneos.
+
+    As regras são tabelas: mudar um limite e reavaliar toda a base histórica é uma única
+    passada vetorizada.
+    """
+    matriz = matriz_condicoes(df, [academica, *sinais]) # Coluna 0 = condição acadêmica
+    rotulo = matriz[:, 0] | (matriz[:, 1:].sum(axis=1) >= minimo) # Acadêmico ou comportamental
+    return pd.Series(rotulo.astype(int), index=df.index, name='risco_defasagem') # Mesmo formato do notebook
+
+# ==========================================================================
+# Faixas de probabilidade
+# ==========================================================================
+
+def _indices_faixa(valores, faixas): # Faixa de cada valor (busca binária nos limites inferiores)
+    limites = np.array([f[0] for f in faixas[1:]]) # Limites que separam as faixas
+    v = np.asarray(valores, dtype=float) # Valores como reais
+    indices = np.searchsorted(limites, v, side='right') # Abaixo do 1º limite separador -> faixa 0
+    indices[np.isnan(v)] = 0 # Ausentes não atingem nenhum limite (faixa mais baixa)
+    return indices # Posição em `faixas`
+
+def classificar_nivel_risco(prob): # Função auxiliar para rotular o risco (lógica de apoio)
+    """Classifica o nível de risco baseado na probabilidade"""
+    return FAIXAS_RISCO[int(_indices_faixa([prob], FAIXAS_RISCO)[0])][1:] # (rótulo, emoji, css)
+
+def classificar_nivel_risco_lote(probs): # Versão vetorizada para pontuação em lote
+    """Retorna o rótulo de nível de risco para um array de probabilidades."""
+    rotulos = np.array([f[1] for f in FAIXAS_RISCO], dtype=object) # Rótulos na mesma ordem das faixas
+    return rotulos[_indices_faixa(probs, FAIXAS_RISCO)] # Busca binária por faixa
+
+def diagnostico_risco(prob_pct): # Bloco de resultado do formulário
+    """Retorna (título, emoji, alerta, caixa, recomendação) da faixa de diagnóstico de `prob_pct` (em %)."""
+    return FAIXAS_DIAGNOSTICO[int(_indices_faixa([prob_pct], FAIXAS_DIAGNOSTICO)[0])][1:] # Faixa atingida
@@ -0,0 +1,64 @@
+# ==========================================================================
+# Análise de sensibilidade ("e se?") do risco de um aluno
+# ==========================================================================
+
+# Processamento e Manipulação de Dados
+import numpy as np   # Grade de valores e produto cartesiano
+import pandas as pd  # Cenários e resultados
+
+# ==========================================================================
+# Constantes
+# ==========================================================================
+
+INDICADORES = ['IDA', 'IEG', 'IPS', 'IAA', 'IPP', 'IPV'] # Indicadores PEDE que a coordenação pode trabalhar
+PASSO = 0.1 # Mesmo passo dos sliders do formulário
+GRADE = np.round(np.arange(0, 10 + PASSO / 2, PASSO), 1) # 0.0, 0.1, ..., 10.0 (101 valores)
+
+# ==========================================================================
+# Cenários
+# ==========================================================================
+
+def cenarios(perfil, indicadores, grade=GRADE): # Produto cartesiano da grade nos indicadores escolhidos
+    """Repete a primeira linha de `perfil` trocando `indicadores` por todas as combinações de `grade`.
+
+    Um indicador gera len(grade) cenários; dois geram len(grade)² (10.201 com a grade padrão).
+    """
+    malhas = np.meshgrid(*[grade] * len(indicadores), indexing='ij') # Uma malha por indicador
+    n = malhas[0].size # Quantidade de cenários
+    colunas = {c: np.repeat(perfil[c].iloc[0], n) for c in perfil.columns} # Perfil repetido (mantém os tipos)
+    colunas.update({c: m.ravel() for c, m in zip(indicadores, malhas)}) # Indicadores variando
+    return pd.DataFrame(colunas, columns=perfil.columns) # Mesma ordem de colunas do formulário
+
+def curvas(inferencia, perfil, indicadores=INDICADORES, grade=GRADE): # Um indicador por vez, todos em uma passada
+    """Probabilidade de risco variando cada indicador isoladamente (demais atributos fixos).
+
+    Todos os cenários vão em um único `predict_proba`. Retorna colunas INDICADOR, VALOR e PROB_RISCO.
+    """
+    lote = pd.concat([cenarios(perfil, [c], grade) for c in indicadores], ignore_index=True) # len(grade) linhas por indicador
+    return pd.DataFrame({
+        'INDICADOR': np.repeat(indicadores, len(grade)), 'VALOR': np.tile(grade, len(indicadores)),
+        'PROB_RISCO': inferencia.probabilidades(lote), # Passada única
+    }) # Encerra as curvas
+
+def mapa(inferencia, perfil, eixo_x, eixo_y, grade=GRADE): # Dois indicadores ao mesmo tempo
+    """Matriz de probabilidades (linhas = `eixo_y`, colunas = `eixo_x`) com um único `predict_proba`."""
+    probs = inferencia.probabilidades(cenarios(perfil, [eixo_y, eixo_x], grade)) # Ordem 'ij': y nas linhas
+    return pd.DataFrame(probs.reshape(len(grade), len(grade)), index=pd.Index(grade, name=eixo_y),
+                        columns=pd.Index(grade, name=eixo_x)) # Encerra o mapa
+
+def melhorias(tabela, perfil): # Qual indicador mais reduz o risco
+    """Por indicador, o menor risco atingível subindo o valor atual e a redução em relação ao valor atual.
+
+    `tabela` é o resultado de `curvas`; o risco atual de cada indicador é o do ponto da grade mais próximo
+    do valor do aluno. Ordenado da maior para a menor redução.
+    """
+    linhas = [] # Uma linha por indicador
+    for indicador, curva in tabela.groupby('INDICADOR', sort=False): # Curvas na ordem de INDICADORES
+        atual = float(perfil[indicador].iloc[0]) # Valor do aluno
+        prob_atual = curva['PROB_RISCO'].to_numpy()[np.abs(curva['VALOR'].to_numpy() - atual).argmin()] # Ponto mais próximo
+        acima = curva[curva['VALOR'] >= atual - PASSO / 2] # Apenas melhorias (valores maiores ou iguais)
+        melhor = acima.loc[acima['PROB_RISCO'].idxmin()] # Menor risco atingível
+        linhas.append({'Indicador': indicador, 'Atual': atual, 'Risco atual (%)': prob_atual * 100,
+                       'Melhor valor': melhor['VALOR'], 'Risco mínimo (%)': melhor['PROB_RISCO'] * 100,
+                       'Redução (p.p.)': (prob_atual - melhor['PROB_RISCO']) * 100})
+    return pd.DataFrame(linhas).sort_values('Redução (p.p.)', ascending=False, kind='stable').reset_index(drop=True)
@@ -0,0 +1,239 @@
+# ==========================================================================
+# Serviço HTTP de pontuação do risco de defasagem (micro-lotes)
+# ==========================================================================
+# Uso: python -m pede_analytics.servico [--porta 8000] [--espera-ms 5] [--max-lote 512]
+#
+#   POST /prever    corpo JSON: um aluno {"IDADE": 12, ...} ou uma lista de alunos
+#   GET  /metricas  latências (fila, modelo, total), profundidade da fila e tamanho dos lotes
+#   GET  /saude     modelo e versão carregados
+
+# Bibliotecas do Sistema e Utilitários
+import argparse      # Interpreta os argumentos da linha de comando
+import json          # Corpo das requisições e respostas
+import logging       # Origem do modelo e endereço do serviço
+import queue         # Fila de pedidos entre as threads HTTP e a thread do modelo
+import threading     # Thread única que avalia os micro-lotes
+import time          # Prazos de coleta e latências
+from collections import deque # Janela de tamanhos de lote
+from concurrent.futures import Future # Resultado entregue à thread da requisição
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer # Servidor HTTP da biblioteca padrão
+
+# Processamento e Manipulação de Dados
+import numpy as np   # Média dos tamanhos de lote
+import pandas as pd  # Concatenação dos pedidos em um único lote
+
+# Módulos do projeto
+from pede_analytics.esquema import FEATURES_CAT, FEATURES_MODELO # Colunas do modelo
+from pede_analytics.inferencia import LIMIAR_PADRAO, InferenciaRisco # Inferência em passada única
+from pede_analytics.modelo import carregar_modelo # Mesmo carregador do app e da pontuação em lote
+from pede_analytics.pontuacao import mapear_colunas # Aliases de colunas e DEFASAGEM derivada
+from pede_analytics.registro import MODELO_PADRAO, resolver # Versão servida
+from pede_analytics.telemetria import Cronometro, JanelaLatencia # Percentis de latência
+
+logger = logging.getLogger('pede_analytics.servico') # Nome fixo: executado via -m, __name__ seria '__main__'
+
+# ==========================================================================
+# Constantes
+# ==========================================================================
+
+ESPERA_MS = 5.0 # Tempo máximo que o primeiro pedido de um lote espera por companhia
+MAX_LINHAS_LOTE = 512 # Linhas a partir das quais o lote é avaliado sem esperar mais
+TEMPO_LIMITE_S = 10.0 # Espera máxima da requisição pelo resultado do lote
+JANELA_METRICAS = 2_000 # Medições mantidas para os percentis
+
+# ==========================================================================
+# Micro-lotes
+# ==========================================================================
+
+def preparar_entrada(corpo): # JSON já decodificado -> DataFrame no esquema do modelo
+    """Valida um aluno (objeto) ou vários (lista de objetos) e retorna as colunas de FEATURES_MODELO.
+
+    Usa os mesmos aliases da pontuação em lote. Lança ValueError com mensagem legível para
+    colunas ausentes ou valores numéricos inválidos, antes que o pedido chegue ao lote.
+    """
+    registros = corpo if isinstance(corpo, list) else [corpo] # Um aluno vira lista de um
+    if not registros or not all(isinstance(r, dict) for r in registros): # Formato inesperado
+        raise ValueError("O corpo deve ser um objeto JSON (um aluno) ou uma lista não vazia de objetos.")
+    df = mapear_colunas(pd.DataFrame.from_records(registros))[FEATURES_MODELO].copy() # Esquema do modelo
+    numericas = [c for c in FEATURES_MODELO if c not in FEATURES_CAT] # Indicadores, idade, fases e defasagem
+    df[numericas] = df[numericas].apply(pd.to_numeric) # ValueError para texto em coluna numérica
+    return df # Pronto para o lote
+
+class MicroLote: # Agrupa pedidos concorrentes em uma única chamada ao modelo
+    """Fila de pedidos consumida por uma thread que avalia vários pedidos por vez.
+
+    O primeiro pedido de um lote espera no máximo `espera_ms` pelos seguintes (ou até somar
+    `max_linhas`); o lote inteiro passa por `InferenciaRisco.prever` uma única vez e cada pedido
+    recebe a sua fatia do resultado por um `Future`.
+    """
+
+    def __init__(self, inferencia, espera_ms=ESPERA_MS, max_linhas=MAX_LINHAS_LOTE): # Inicia a thread do modelo
+        self.inferencia = inferencia # Pipeline carregado uma única vez
+        self.espera = espera_ms / 1000 # Segundos de coleta
+        self.max_linhas = max_linhas # Corte por tamanho
+        self.fila = queue.Queue() # (DataFrame, Future, instante de chegada)
+        self.latencias = JanelaLatencia(JANELA_METRICAS) # fila / modelo / total por pedido
+        self.tamanhos = deque(maxlen=JANELA_METRICAS) # Pedidos por lote
+        self.contadores = {'requisicoes': 0, 'linhas': 0, 'lotes': 0, 'erros': 0} # Totais desde o início
+        self._thread = threading.Thread(target=self._laco, name='micro-lote', daemon=True) # Consumidor único
+        self._thread.start() # Pronto para receber pedidos
+
+    def enviar(self, df): # Chamado pelas threads HTTP
+        """Enfileira `df` e retorna um Future com o DataFrame de resultado (mesmas linhas, índice 0..n-1)."""
+        futuro = Future() # Resultado entregue pela thread do modelo
+        self.fila.put((df.reset_index(drop=True), futuro, time.perf_counter())) # Instante de chegada para a métrica de fila
+        return futuro # Aguardado pela requisição
+
+    def prever(self, df, tempo_limite=TEMPO_LIMITE_S): # Versão síncrona de enviar()
+        return self.enviar(df).result(tempo_limite) # TimeoutError se o lote não terminar a tempo
+
+    def fechar(self): # Encerra a thread após os pedidos já enfileirados
+        self.fila.put(None) # Sentinela de parada
+        self._thread.join() # Aguarda o último lote
+
+    def _coletar(self): # Próximo lote (ou None para encerrar)
+        primeiro = self.fila.get() # Bloqueia até chegar um pedido
+        if primeiro is None: return None # Sentinela
+        pedidos, linhas = [primeiro], len(primeiro[0]) # Lote em formação
+        prazo = time.perf_counter() + self.espera # Janela de coleta do lote
+        while linhas < self.max_linhas: # Corte por tamanho
+            restante = prazo - time.perf_counter() # Tempo de coleta que sobra
+            try: # Depois do prazo ainda leva o que já está na fila, sem esperar
+                pedido = self.fila.get(timeout=restante) if restante > 0 else self.fila.get_nowait()
+            except queue.Empty: break # Janela esgotada
+            if pedido is None: # Parada pedida durante a coleta
+                self.fila.put(None) # Devolve a sentinela para o próximo ciclo
+                break
+            pedidos.append(pedido) # Mais um pedido no lote
+            linhas += len(pedido[0])
+        return pedidos # Pedidos do lote
+
+    def _laco(self): # Thread do modelo
+        while (pedidos := self._coletar()) is not None: # Um lote por volta
+            inicio = time.perf_counter() # Início da avaliação
+            try: # Um erro inesperado falha o lote, não a thread
+                resultado = self.inferencia.prever(pd.concat([df for df, _, _ in pedidos], ignore_index=True)) # Uma passada
+            except Exception as erro: # Entregue a cada requisição do lote
+                logger.exception("Falha ao avaliar um lote de %d pedidos", len(pedidos))
+                self.contadores['erros'] += len(pedidos)
+                for _, futuro, _ in pedidos: futuro.set_exception(erro)
+                continue
+            fim = time.perf_counter() # Fim da avaliação
+            posicao = 0 # Início da fatia de cada pedido
+            for df, futuro, chegada in pedidos: # Devolve as fatias na ordem do lote
+                futuro.set_result(resultado.iloc[posicao:posicao + len(df)].reset_index(drop=True))
+                posicao += len(df)
+                cronometro = Cronometro() # Etapas medidas fora de um bloco `with`
+                cronometro.tempos.update({'fila': (inicio - chegada) * 1000, 'modelo': (fim - inicio) * 1000})
+                self.latencias.registrar(cronometro) # total = fila + modelo
+            self.tamanhos.append(len(pedidos)) # Pedidos no lote
+            self.contadores['requisicoes'] += len(pedidos)
+            self.contadores['linhas'] += posicao
+            self.contadores['lotes'] += 1
+
+    def metricas(self): # Estado atual para /metricas
+        """Contadores, profundidade da fila, tamanho médio dos lotes e percentis de latência (ms)."""
+        tamanhos = np.fromiter(list(self.tamanhos), dtype=float) # Cópia da janela
+        return {
+            **self.contadores, 'fila': self.fila.qsize(),
+            'pedidos_por_lote': {'media': float(tamanhos.mean()) if len(tamanhos) else 0.0,
+                                 'maximo': int(tamanhos.max()) if len(tamanhos) else 0},
+            'latencia_ms': self.latencias.resumo().to_dict('records'),
+        } # Encerra as métricas
+
+# ==========================================================================
+# HTTP
+# ==========================================================================
+
+def serializar_resultado(resultado): # DataFrame -> lista JSON (NA vira null)
+    return resultado.astype(object).where(resultado.notna(), None).to_dict('records')
+
+class _Manipulador(BaseHTTPRequestHandler): # Uma instância por requisição (thread do servidor)
+    protocol_version = 'HTTP/1.1' # Conexões persistentes (keep-alive)
+    disable_nagle_algorithm = True # Cabeçalho e corpo saem em escritas separadas: sem TCP_NODELAY, +40 ms por resposta
+
+    def _responder(self, status, corpo): # Resposta JSON com Content-Length
+        dados = json.dumps(corpo, ensure_ascii=False).encode('utf-8') # Corpo serializado
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json; charset=utf-8')
+        self.send_header('Content-Length', str(len(dados)))
+        self.end_headers()
+        self.wfile.write(dados)
+
+    def do_GET(self): # Saúde e métricas
+        if self.path == '/saude': self._responder(200, {'status': 'ok', **self.server.modelo})
+        elif self.path == '/metricas': self._responder(200, {**self.server.modelo, **self.server.lote.metricas()})
+        else: self._responder(404, {'erro': f"Rota desconhecida: {self.path}"})
+
+    def do_POST(self): # Pontuação
+        if self.path != '/prever': # Única rota de escrita
+            self._responder(404, {'erro': f"Rota desconhecida: {self.path}"})
+            return
+        corpo = self.rfile.read(int(self.headers.get('Content-Length', 0))) # Lê o corpo inteiro
+        try: # Validação na thread da requisição (pedidos inválidos não entram no lote)
+            entrada = preparar_entrada(json.loads(corpo)) # Esquema do modelo
+        except (ValueError, TypeError) as erro: # JSON inválido, colunas ausentes ou valores não numéricos
+            self._responder(400, {'erro': str(erro)})
+            return
+        try: # Aguarda a fatia do lote
+            resultado = self.server.lote.prever(entrada)
+        except TimeoutError: # Lote não terminou dentro do limite
+            self._responder(503, {'erro': "Tempo limite excedido aguardando o modelo."})
+            return
+        except Exception as erro: # Falha do lote (já registrada pela thread do modelo)
+            self._responder(500, {'erro': f"Falha na avaliação do modelo: {erro}"})
+            return
+        self._responder(200, {**self.server.modelo, 'resultados': serializar_resultado(resultado)}) # Uma entrada por aluno
+
+    def log_message(self, formato, *args): # Sem uma linha de log por requisição
+        logger.debug(formato, *args)
+
+class ServidorPontuacao(ThreadingHTTPServer): # Servidor HTTP + micro-lote compartilhado
+    daemon_threads = True # Conexões abertas não impedem o encerramento
+    request_queue_size = 128 # Fila de conexões do listen() (o padrão 5 recusa rajadas de clientes)
+
+    def __init__(self, endereco, lote, modelo): # Recebe o micro-lote já iniciado
+        super().__init__(endereco, _Manipulador)
+        self.lote = lote # Consumidor único do modelo
+        self.modelo = modelo # {'modelo': nome, 'versao': versão} nas respostas
+
+def criar_servidor(host='127.0.0.1', porta=8000, nome=MODELO_PADRAO, versao=None, espera_ms=ESPERA_MS,
+                   max_linhas=MAX_LINHAS_LOTE, limiar=LIMIAR_PADRAO): # Monta o serviço completo
+    """Carrega o pipeline uma única vez (`carregar_modelo`) e retorna o servidor pronto para `serve_forever()`."""
+    pipeline = carregar_modelo(nome, versao) # Registro local com memory-map (ou download verificado)
+    if pipeline is None: # Falha já registrada no log
+        raise RuntimeError("O modelo de predição não foi carregado corretamente.")
+    lote = MicroLote(InferenciaRisco(pipeline, limiar=limiar), espera_ms, max_linhas) # Thread do modelo
+    return ServidorPontuacao((host, porta), lote, {'modelo': nome, 'versao': resolver(nome, versao)[0]})
+
+# ==========================================================================
+# Linha de comando
+# ==========================================================================
+
+def main(argv=None): # Ponto de entrada da CLI
+    parser = argparse.ArgumentParser(description="Serviço HTTP de pontuação do risco de defasagem (micro-lotes).")
+    parser.add_argument('--host', default='127.0.0.1', help="Interface de escuta")
+    parser.add_argument('--porta', type=int, default=8000, help="Porta HTTP")
+    parser.add_argument('--versao', help="Versão registrada do modelo (padrão: atual)")
+    parser.add_argument('--espera-ms', type=float, default=ESPERA_MS, help="Janela de coleta de cada micro-lote")
+    parser.add_argument('--max-lote', type=int, default=MAX_LINHAS_LOTE, help="Linhas que disparam o lote sem esperar")
+    parser.add_argument('--limiar', type=float, default=LIMIAR_PADRAO, help="Probabilidade mínima para ROTULO_RISCO = 1")
+    args = parser.parse_args(argv) # Lê os argumentos
+    logging.basicConfig(format="%(levelname)s %(name)s: %(message)s") # Logs no console
+    logging.getLogger('pede_analytics').setLevel(logging.INFO) # Origem e tempo de carga do modelo
+
+    servidor = criar_servidor(args.host, args.porta, versao=args.versao, espera_ms=args.espera_ms,
+                              max_linhas=args.max_lote, limiar=args.limiar) # Modelo carregado uma vez
+    logger.info("Servindo %s v%s em http://%s:%d (micro-lotes de até %.1f ms / %d linhas)", servidor.modelo['modelo'],
+                servidor.modelo['versao'], args.host, servidor.server_address[1], args.espera_ms, args.max_lote)
+    try: # Atende até Ctrl+C
+        servidor.serve_forever()
+    except KeyboardInterrupt: # Encerramento pelo terminal
+        pass
+    finally: # Libera a porta e conclui os lotes pendentes
+        servidor.server_close()
+        servidor.lote.fechar()
+    return 0 # Sucesso
+
+if __name__ == "__main__": # Execução via python -m pede_analytics.servico
+    raise SystemExit(main()) # Executa a CLI
@@ -0,0 +1,327 @@
+# ==========================================================================
+# Serviço assíncrono de pontuação: asyncio na frente, processos no modelo
+# ==========================================================================
+# Uso: python -m pede_analytics.servico_assincrono [--porta 8000] [--trabalhadores 8] [--prazo-ms 2000]
+#
+# Mesmas rotas do `pede_analytics.servico` (POST /prever, GET /metricas, GET /saude). O laço de
+# eventos só recebe conexões, decodifica o JSON e monta micro-lotes; validação, predict_proba e
+# serialização rodam em um ProcessPoolExecutor pré-aquecido, um lote por processo, fora do GIL
+# do processo principal.
+
+# Bibliotecas do Sistema e Utilitários
+import argparse      # Interpreta os argumentos da linha de comando
+import asyncio       # Laço de eventos, fila e servidor TCP
+import json          # Corpo das requisições e respostas
+import logging       # Ciclo de vida do serviço
+import math          # Validação do prazo informado pelo cliente
+import multiprocessing # Contexto 'spawn' dos processos do modelo
+import os            # Núcleos disponíveis e pid dos trabalhadores
+import signal        # SIGTERM/SIGINT iniciam a drenagem
+import time          # Prazos e latências
+from collections import deque # Janela de tamanhos de lote
+from concurrent.futures import ProcessPoolExecutor # Processos do modelo
+from http import HTTPStatus # Frase de cada status
+
+# Processamento e Manipulação de Dados
+import numpy as np   # Média dos tamanhos de lote
+import pandas as pd  # Concatenação dos pedidos no trabalhador
+
+# Módulos do projeto
+from pede_analytics.inferencia import LIMIAR_PADRAO, InferenciaRisco # Inferência em passada única
+from pede_analytics.modelo import carregar_modelo # Mesmo carregador do app (registro + memory-map)
+from pede_analytics.registro import MODELO_PADRAO, resolver # Versão servida
+from pede_analytics.servico import ESPERA_MS, JANELA_METRICAS, MAX_LINHAS_LOTE, preparar_entrada, serializar_resultado # Regras do serviço HTTP
+from pede_analytics.telemetria import Cronometro, JanelaLatencia # Percentis de latência
+
+logger = logging.getLogger('pede_analytics.servico_assincrono') # Nome fixo: executado via -m, __name__ seria '__main__'
+
+# ==========================================================================
+# Constantes
+# ==========================================================================
+
+PRAZO_MS = 2_000 # Prazo padrão de cada requisição (cabeçalho X-Prazo-Ms sobrescreve)
+PRAZO_MAXIMO_MS = 60_000 # Teto do X-Prazo-Ms (um cliente não prende um pedido por tempo indefinido)
+FILA_MAXIMA = 1_024 # Requisições aguardando lote; acima disso a resposta é 503 imediato
+DRENAGEM_S = 30.0 # Tempo máximo para concluir os pedidos aceitos ao encerrar
+TAMANHO_MAXIMO_CORPO = 8 << 20 # 8 MiB por requisição
+
+# ==========================================================================
+# Processo trabalhador
+# ==========================================================================
+
+_INFERENCIA = None # InferenciaRisco do processo trabalhador (carregada uma vez)
+
+def _iniciar_trabalhador(nome, versao, limiar): # initializer do ProcessPoolExecutor
+    """Carrega o pipeline uma vez por processo; com memory-map, as páginas dos arrays são compartilhadas."""
+    global _INFERENCIA
+    pipeline = carregar_modelo(nome, versao) # Registro local com mmap_mode='r'
+    if pipeline is None: # Falha já registrada no log do trabalhador
+        raise RuntimeError("O modelo de predição não foi carregado corretamente.")
+    _INFERENCIA = InferenciaRisco(pipeline, limiar=limiar) # Pronto para os lotes
+
+def _aquecer(espera_s): # Garante que o processo existe e já carregou o modelo
+    time.sleep(espera_s) # Mantém o processo ocupado para que o próximo aquecimento vá para outro
+    return os.getpid() # Identifica o trabalhador
+
+def _avaliar_lote(pedidos): # Executado no trabalhador: lista de corpos JSON já decodificados
+    """Valida cada pedido, avalia os válidos em um único `prever` e devolve (respostas, segundos do modelo).
+
+    Cada resposta é ('ok', resultados) ou ('erro', mensagem), na ordem de `pedidos`; um pedido
+    inválido não afeta os demais do lote.
+    """
+    respostas, validos = [None] * len(pedidos), [] # Respostas na ordem dos pedidos e (posição, DataFrame) válidos
+    for i, corpo in enumerate(pedidos): # Validação isolada por pedido
+        try:
+            validos.append((i, preparar_entrada(corpo)))
+        except (ValueError, TypeError) as erro: # Mesmo 400 do serviço com threads
+            respostas[i] = ('erro', str(erro))
+    inicio = time.perf_counter() # Tempo do modelo (sem a validação)
+    if validos: # Uma única passada para o lote inteiro
+        registros = serializar_resultado(_INFERENCIA.prever(pd.concat([df for _, df in validos], ignore_index=True)))
+        posicao = 0 # Início da fatia de cada pedido
+        for i, df in validos: # Distribui as fatias
+            respostas[i] = ('ok', registros[posicao:posicao + len(df)])
+            posicao += len(df)
+    return respostas, time.perf_counter() - inicio # Respostas e segundos do modelo
+
+# ==========================================================================
+# Serviço
+# ==========================================================================
+
+class _Pedido: # Uma requisição aguardando lote
+    __slots__ = ('corpo', 'futuro', 'chegada', 'prazo') # Sem __dict__ (muitos objetos sob carga)
+
+    def __init__(self, corpo, futuro, prazo_ms):
+        self.corpo, self.futuro = corpo, futuro # JSON decodificado e resultado
+        self.chegada = time.perf_counter() # Métrica de fila
+        self.prazo = self.chegada + prazo_ms / 1000 # Instante limite
+
+class ServicoAssincrono: # Frente asyncio + ProcessPoolExecutor
+    """Agrupa requisições em micro-lotes e despacha cada lote para um processo livre.
+
+    Um lote só é montado quando há processo livre, então sob carga os lotes crescem em vez de
+    enfileirar no executor. Backpressure: com `fila_maxima` pedidos aguardando, novas
+    requisições recebem 503 na hora. Pedidos com o prazo vencido não são enviados ao modelo
+    (504). `drenar()` para de aceitar conexões e conclui tudo o que já foi aceito.
+    """
+
+    def __init__(self, nome=MODELO_PADRAO, versao=None, trabalhadores=None, espera_ms=ESPERA_MS,
+                 max_linhas=MAX_LINHAS_LOTE, fila_maxima=FILA_MAXIMA, prazo_ms=PRAZO_MS, limiar=LIMIAR_PADRAO): # Configuração
+        self.modelo = {'modelo': nome, 'versao': resolver(nome, versao)[0]} # Falha cedo se a versão não existe
+        self.trabalhadores = trabalhadores or os.cpu_count() or 1 # Um processo por núcleo
+        self.espera, self.max_linhas, self.prazo_ms = espera_ms / 1000, max_linhas, prazo_ms # Regras dos lotes
+        self.fila = asyncio.Queue(maxsize=fila_maxima) # Pedidos aguardando lote
+        self.livres = asyncio.Semaphore(self.trabalhadores) # Processos sem lote
+        self.executor = ProcessPoolExecutor(self.trabalhadores, mp_context=multiprocessing.get_context('spawn'),
+                                            initializer=_iniciar_trabalhador, initargs=(nome, versao, limiar)) # Processos do modelo
+        self.latencias = JanelaLatencia(JANELA_METRICAS) # fila / modelo / transporte / total por pedido
+        self.tamanhos = deque(maxlen=JANELA_METRICAS) # Pedidos por lote
+        self.contadores = {'requisicoes': 0, 'lotes': 0, 'rejeitadas': 0, 'expiradas': 0, 'erros': 0} # Totais
+        self.pids = set() # Trabalhadores aquecidos
+        self.encerrando = False # Drenagem em andamento
+        self._lotes, self._conexoes = set(), set() # Tarefas em andamento
+        self._servidor = self._despachante = None # Criados em iniciar()
+
+    # ----------------------------------------------------------------------
+    # Ciclo de vida
+    # ----------------------------------------------------------------------
+
+    async def iniciar(self, host='127.0.0.1', porta=8000): # Aquece os processos e abre a porta
+        laco = asyncio.get_running_loop() # Laço atual
+        inicio = time.perf_counter() # Marca o início do aquecimento
+        for _ in range(5): # Rodadas até todos os processos responderem
+            self.pids |= set(await asyncio.gather(*(laco.run_in_executor(self.executor, _aquecer, 0.2)
+                                                    for _ in range(self.trabalhadores))))
+            if len(self.pids) >= self.trabalhadores: break
+        logger.info("%d processos com o modelo carregado em %.1f s", len(self.pids), time.perf_counter() - inicio)
+        self._despachante = asyncio.create_task(self._despachar()) # Montagem dos lotes
+        self._servidor = await asyncio.start_server(self._atender, host, porta, backlog=1024) # Só depois do aquecimento
+        return self._servidor.sockets[0].getsockname()[1] # Porta efetiva (0 = escolhida pelo sistema)
+
+    async def drenar(self, tempo_limite=DRENAGEM_S): # Encerramento gracioso
+        """Para de aceitar conexões, conclui os pedidos aceitos (até `tempo_limite`) e encerra os processos."""
+        self.encerrando = True # Novas requisições em conexões abertas recebem 503
+        self._servidor.close() # Sem novas conexões
+        try: # Pedidos na fila e lotes em andamento
+            await asyncio.wait_for(self.fila.join(), tempo_limite)
+        except asyncio.TimeoutError:
+            logger.warning("Drenagem excedeu %.0f s com %d pedidos na fila", tempo_limite, self.fila.qsize())
+        self._despachante.cancel() # Nada mais a despachar
+        for conexao in list(self._conexoes): conexao.cancel() # Conexões ociosas (keep-alive)
+        await asyncio.gather(self._despachante, *self._conexoes, return_exceptions=True)
+        await asyncio.get_running_loop().run_in_executor(None, self.executor.shutdown) # Aguarda os processos
+        logger.info("Serviço drenado: %d requisições atendidas", self.contadores['requisicoes'])
+
+    # ----------------------------------------------------------------------
+    # Micro-lotes
+    # ----------------------------------------------------------------------
+
+    async def _coletar(self): # Pedidos do próximo lote (dentro do prazo)
+        pedidos, linhas = [], 0 # Lote em formação
+        fim_coleta = None # Janela começa no primeiro pedido
+        while linhas < self.max_linhas: # Corte por tamanho
+            try: # O primeiro pedido espera sem limite; os seguintes, até o fim da janela
+                restante = None if fim_coleta is None else max(fim_coleta - time.perf_counter(), 0)
+                pedido = await asyncio.wait_for(self.fila.get(), restante) if restante != 0 else self.fila.get_nowait()
+            except (asyncio.TimeoutError, asyncio.QueueEmpty): break # Janela esgotada
+            if pedido.futuro.done() or time.perf_counter() >= pedido.prazo: # Cliente desistiu ou prazo vencido
+                if not pedido.futuro.done(): # Expirou na fila antes de o cliente perceber
+                    pedido.futuro.set_exception(TimeoutError()) # 504
+                    self.contadores['expiradas'] += 1
+                self.fila.task_done() # Não vai ao modelo
+                continue
+            pedidos.append(pedido) # Mais um pedido no lote
+            linhas += len(pedido.corpo) if isinstance(pedido.corpo, list) else 1
+            fim_coleta = fim_coleta or time.perf_counter() + self.espera # Abre a janela
+        return pedidos # Pedidos válidos do lote
+
+    async def _despachar(self): # Tarefa única: monta lotes quando há processo livre
+        while True:
+            await self.livres.acquire() # Sob carga, os pedidos se acumulam aqui e os lotes crescem
+            pedidos = await self._coletar() # Bloqueia até o primeiro pedido dentro do prazo
+            tarefa = asyncio.create_task(self._executar(pedidos)) # Lote em um processo
+            self._lotes.add(tarefa)
+            tarefa.add_done_callback(self._lotes.discard)
+
+    async def _executar(self, pedidos): # Um lote em um processo trabalhador
+        inicio = time.perf_counter() # Início do lote (fim da fila)
+        try: # Erros do processo falham o lote, não o serviço
+            respostas, segundos_modelo = await asyncio.get_running_loop().run_in_executor(
+                self.executor, _avaliar_lote, [p.corpo for p in pedidos])
+        except Exception as erro: # Processo morreu ou exceção inesperada
+            logger.exception("Falha ao avaliar um lote de %d pedidos", len(pedidos))
+            self.contadores['erros'] += len(pedidos)
+            respostas, segundos_modelo = [('falha', str(erro))] * len(pedidos), 0.0
+        finally:
+            self.livres.release() # Processo disponível para o próximo lote
+        fim = time.perf_counter() # Fim do lote
+        for pedido, resposta in zip(pedidos, respostas): # Entrega cada resposta
+            if not pedido.futuro.done(): pedido.futuro.set_result(resposta) # Cliente pode ter desistido
+            cronometro = Cronometro() # Etapas medidas fora de um bloco `with`
+            cronometro.tempos.update({'fila': (inicio - pedido.chegada) * 1000, 'modelo': segundos_modelo * 1000,
+                                      'transporte': (fim - inicio - segundos_modelo) * 1000}) # Transporte = IPC + validação
+            self.latencias.registrar(cronometro)
+            self.fila.task_done() # Pedido concluído (drenagem)
+        self.tamanhos.append(len(pedidos)) # Pedidos no lote
+        self.contadores['requisicoes'] += len(pedidos)
+        self.contadores['lotes'] += 1
+
+    def metricas(self): # Estado atual para /metricas
+        """Contadores, fila, lotes em andamento, tamanho médio dos lotes e percentis de latência (ms)."""
+        tamanhos = np.fromiter(list(self.tamanhos), dtype=float) # Cópia da janela
+        return {
+            **self.modelo, **self.contadores, 'fila': self.fila.qsize(), 'lotes_em_andamento': len(self._lotes),
+            'trabalhadores': len(self.pids), 'encerrando': self.encerrando,
+            'pedidos_por_lote': {'media': float(tamanhos.mean()) if len(tamanhos) else 0.0,
+                                 'maximo': int(tamanhos.max()) if len(tamanhos) else 0},
+            'latencia_ms': self.latencias.resumo().to_dict('records'),
+        } # Encerra as métricas
+
+    # ----------------------------------------------------------------------
+    # HTTP/1.1 mínimo sobre asyncio streams
+    # ----------------------------------------------------------------------
+
+    async def _prever(self, cabecalhos, corpo): # POST /prever -> (status, corpo, cabeçalhos extras)
+        if self.encerrando: # Drenagem: só conclui o que já foi aceito
+            return 503, {'erro': "Serviço em encerramento."}, {'Retry-After': '1'}
+        try: # Decodificação leve no laço; validação completa no trabalhador
+            dados = json.loads(corpo)
+            prazo_ms = float(cabecalhos.get('x-prazo-ms', self.prazo_ms))
+        except ValueError as erro:
+            return 400, {'erro': str(erro)}, {}
+        if not math.isfinite(prazo_ms) or prazo_ms <= 0: # nan, inf, zero ou negativo: erro do cliente, não timeout
+            return 400, {'erro': "X-Prazo-Ms deve ser um número positivo de milissegundos."}, {}
+        prazo_ms = min(prazo_ms, PRAZO_MAXIMO_MS) # Limite do servidor
+        pedido = _Pedido(dados, asyncio.get_running_loop().create_future(), prazo_ms) # Prazo conta a partir daqui
+        try: # Backpressure
+            self.fila.put_nowait(pedido)
+        except asyncio.QueueFull:
+            self.contadores['rejeitadas'] += 1
+            return 503, {'erro': "Fila cheia; tente novamente."}, {'Retry-After': '1'}
+        try: # Aguarda o lote até o prazo
+            situacao, conteudo = await asyncio.wait_for(asyncio.shield(pedido.futuro), max(pedido.prazo - time.perf_counter(), 0))
+        except (asyncio.TimeoutError, TimeoutError): # Prazo vencido na fila ou no processo
+            if pedido.futuro.cancel(): self.contadores['expiradas'] += 1 # False se o despachante já o expirou
+            return 504, {'erro': f"Prazo de {prazo_ms:.0f} ms excedido."}, {}
+        if situacao == 'erro': return 400, {'erro': conteudo}, {} # Entrada inválida
+        if situacao == 'falha': return 500, {'erro': f"Falha na avaliação do modelo: {conteudo}"}, {}
+        return 200, {**self.modelo, 'resultados': conteudo}, {} # Uma entrada por aluno
+
+    async def _rotear(self, metodo, rota, cabecalhos, corpo): # Rotas do serviço
+        if metodo == 'POST' and rota == '/prever': return await self._prever(cabecalhos, corpo)
+        if metodo == 'GET' and rota == '/saude': return 200, {'status': 'encerrando' if self.encerrando else 'ok', **self.modelo}, {}
+        if metodo == 'GET' and rota == '/metricas': return 200, self.metricas(), {}
+        return 404, {'erro': f"Rota desconhecida: {rota}"}, {}
+
+    async def _atender(self, leitor, escritor): # Uma conexão (várias requisições com keep-alive)
+        tarefa = asyncio.current_task() # Cancelada ao final da drenagem se ficar ociosa
+        self._conexoes.add(tarefa)
+        try:
+            while True: # Durante a drenagem, a resposta leva Connection: close
+                linha = await leitor.readline() # Linha de requisição
+                if not linha: break # Cliente fechou a conexão
+                metodo, rota, _ = linha.decode('latin-1').split(' ', 2) # "POST /prever HTTP/1.1"
+                cabecalhos = {} # Nomes em minúsculas
+                while (cabecalho := await leitor.readline()) not in (b'\r\n', b'\n', b''):
+                    nome, _, valor = cabecalho.decode('latin-1').partition(':')
+                    cabecalhos[nome.strip().lower()] = valor.strip()
+                tamanho = int(cabecalhos.get('content-length', 0)) # Corpo
+                if tamanho > TAMANHO_MAXIMO_CORPO: # Protege a memória do laço (corpo não é lido; conexão fecha)
+                    status, resposta, extras = 413, {'erro': "Corpo da requisição grande demais."}, {}
+                else: # Requisição normal
+                    corpo = await leitor.readexactly(tamanho) if tamanho else b''
+                    status, resposta, extras = await self._rotear(metodo, rota, cabecalhos, corpo)
+                fechar = self.encerrando or cabecalhos.get('connection', '').lower() == 'close' or status == 413 # Fim da conexão
+                dados = json.dumps(resposta, ensure_ascii=False).encode('utf-8') # Corpo serializado
+                cabecalho = (f"HTTP/1.1 {status} {HTTPStatus(status).phrase}\r\nContent-Type: application/json; charset=utf-8\r\n"
+                             f"Content-Length: {len(dados)}\r\n" + ''.join(f"{k}: {v}\r\n" for k, v in extras.items())
+                             + ("Connection: close\r\n" if fechar else "") + "\r\n") # Cabeçalhos da resposta
+                escritor.write(cabecalho.encode('latin-1') + dados) # Uma única escrita
+                await escritor.drain() # Respeita o buffer do cliente
+                if fechar: break
+        except (ConnectionError, asyncio.IncompleteReadError, ValueError, asyncio.CancelledError): # Cliente sumiu ou requisição malformada
+            pass
+        finally:
+            self._conexoes.discard(tarefa)
+            escritor.close()
+
+# ==========================================================================
+# Linha de comando
+# ==========================================================================
+
+async def servir(args): # Sobe, aguarda o sinal de parada e drena
+    servico = ServicoAssincrono(versao=args.versao, trabalhadores=args.trabalhadores, espera_ms=args.espera_ms,
+                                max_linhas=args.max_lote, fila_maxima=args.fila_maxima, prazo_ms=args.prazo_ms,
+                                limiar=args.limiar) # Processos ainda não criados
+    porta = await servico.iniciar(args.host, args.porta) # Aquecimento + porta aberta
+    logger.info("Servindo %s v%s em http://%s:%d com %d processos (prazo %d ms, fila máxima %d)", servico.modelo['modelo'],
+                servico.modelo['versao'], args.host, porta, servico.trabalhadores, args.prazo_ms, args.fila_maxima)
+    parar = asyncio.Event() # Sinal de encerramento
+    laco = asyncio.get_running_loop()
+    for sinal in (signal.SIGINT, signal.SIGTERM): laco.add_signal_handler(sinal, parar.set) # Ctrl+C ou kill
+    await parar.wait() # Atende até o sinal
+    logger.info("Sinal recebido: drenando até %.0f s", args.drenagem_s)
+    await servico.drenar(args.drenagem_s) # Conclui os pedidos aceitos
+
+def main(argv=None): # Ponto de entrada da CLI
+    parser = argparse.ArgumentParser(description="Serviço assíncrono de pontuação com um processo do modelo por núcleo.")
+    parser.add_argument('--host', default='127.0.0.1', help="Interface de escuta")
+    parser.add_argument('--porta', type=int, default=8000, help="Porta HTTP")
+    parser.add_argument('--versao', help="Versão registrada do modelo (padrão: atual)")
+    parser.add_argument('--trabalhadores', type=int, help="Processos do modelo (padrão: núcleos da máquina)")
+    parser.add_argument('--espera-ms', type=float, default=ESPERA_MS, help="Janela de coleta de cada micro-lote")
+    parser.add_argument('--max-lote', type=int, default=MAX_LINHAS_LOTE, help="Linhas que disparam o lote sem esperar")
+    parser.add_argument('--fila-maxima', type=int, default=FILA_MAXIMA, help="Pedidos aguardando lote antes de responder 503")
+    parser.add_argument('--prazo-ms', type=float, default=PRAZO_MS, help="Prazo padrão por requisição (504 ao exceder)")
+    parser.add_argument('--drenagem-s', type=float, default=DRENAGEM_S, help="Tempo máximo de drenagem ao encerrar")
+    parser.add_argument('--limiar', type=float, default=LIMIAR_PADRAO, help="Probabilidade mínima para ROTULO_RISCO = 1")
+    args = parser.parse_args(argv) # Lê os argumentos
+    if not math.isfinite(args.prazo_ms) or not 0 < args.prazo_ms <= PRAZO_MAXIMO_MS: # Mesma regra do X-Prazo-Ms
+        parser.error(f"--prazo-ms deve estar entre 0 e {PRAZO_MAXIMO_MS} ms.")
+    logging.basicConfig(format="%(levelname)s %(name)s: %(message)s") # Logs no console
+    logging.getLogger('pede_analytics').setLevel(logging.INFO) # Ciclo de vida do serviço
+    asyncio.run(servir(args)) # Laço de eventos até o fim da drenagem
+    return 0 # Sucesso
+
+if __name__ == "__main__": # Execução via python -m pede_analytics.servico_assincrono
+    raise SystemExit(main()) # Executa a CLI
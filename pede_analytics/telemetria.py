@@ -0,0 +1,62 @@
+# ==========================================================================
+# Instrumentação de tempos de inferência
+# ==========================================================================
+
+# Bibliotecas do Sistema e Utilitários
+import threading     # Trava da janela compartilhada entre threads (serviço HTTP)
+import time          # Relógio monotônico de alta resolução (perf_counter)
+from collections import deque # Janela deslizante de tamanho fixo
+from contextlib import contextmanager # Cria gerenciadores de contexto a partir de funções
+
+# Processamento e Manipulação de Dados
+import numpy as np   # Cálculo de percentis
+import pandas as pd  # Tabela de resumo das latências
+
+# ==========================================================================
+# Cronômetro por etapa
+# ==========================================================================
+
+class Cronometro: # Mede o tempo de parede de cada etapa de uma requisição
+    """Acumula o tempo (ms) de etapas nomeadas usando `with cronometro.etapa('nome'):`."""
+
+    def __init__(self): # Inicializa o registro de etapas
+        self.tempos = {} # Etapa -> milissegundos
+
+    @contextmanager
+    def etapa(self, nome): # Mede o bloco de código envolvido
+        inicio = time.perf_counter() # Marca o início da etapa
+        try: # Executa o bloco do usuário
+            yield
+        finally: # Registra o tempo mesmo se houver exceção
+            self.tempos[nome] = self.tempos.get(nome, 0.0) + (time.perf_counter() - inicio) * 1000 # Converte para ms
+
+    @property
+    def total(self): # Soma de todas as etapas medidas
+        return sum(self.tempos.values())
+
+# ==========================================================================
+# Janela deslizante de latências
+# ==========================================================================
+
+class JanelaLatencia: # Mantém as últimas N medições de cada etapa
+    """Guarda as medições mais recentes e calcula p50/p95/p99 por etapa (seguro entre threads)."""
+
+    def __init__(self, tamanho=200): # Define o tamanho da janela
+        self.tamanho = tamanho # Quantidade máxima de medições por etapa
+        self.amostras = {} # Etapa -> deque de milissegundos
+        self._trava = threading.Lock() # Registro e resumo podem ocorrer em threads diferentes
+
+    def registrar(self, cronometro): # Acrescenta as etapas de um cronômetro à janela
+        with self._trava: # Evita iterar um deque enquanto outra thread acrescenta
+            for nome, ms in list(cronometro.tempos.items()) + [('total', cronometro.total)]: # Inclui o total da requisição
+                self.amostras.setdefault(nome, deque(maxlen=self.tamanho)).append(ms) # Descarta a mais antiga ao encher
+
+    def resumo(self): # Tabela com última medição, p50, p95 e p99 de cada etapa
+        with self._trava: # Cópia consistente da janela
+            janelas = {nome: np.fromiter(valores, dtype=float) for nome, valores in self.amostras.items()} # Arrays por etapa
+        linhas = [] # Linhas do resumo
+        for nome, arr in janelas.items(): # Percorre as etapas registradas
+            p50, p95, p99 = np.percentile(arr, [50, 95, 99]) # Percentis da janela
+            linhas.append({'Etapa': nome, 'Última (ms)': arr[-1], 'p50 (ms)': p50, 'p95 (ms)': p95,
+                           'p99 (ms)': p99, 'Amostras': len(arr)}) # Estatísticas da etapa
+        return pd.DataFrame(linhas) # Retorna o resumo tabular
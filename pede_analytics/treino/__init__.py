@@ -0,0 +1,8 @@
+"""Benchmark, busca de hiperparâmetros e publicação dos modelos do risco de defasagem."""
+
+from pede_analytics.treino.avaliacao import DIRETORIO_CACHE, avaliar_candidatos, avaliar_dobra, resumir # Validação cruzada
+from pede_analytics.treino.base import carregar_base_treino, preparar_base_treino # Base de modelagem
+from pede_analytics.treino.candidatos import CANDIDATOS, PREPROCESSADORES, XGBoostParadaAntecipada, criar_estimador, criar_preprocessador # Catálogo
+from pede_analytics.treino.selecao import escolher_candidato, fronteira_pareto, publicar, treinar_pipeline # Seleção e publicação
+from pede_analytics.treino.busca import ESPACOS, buscar, cronograma # Divisões sucessivas
+from pede_analytics.treino.ensaios import CAMINHO_ENSAIOS # Banco de ensaios
@@ -0,0 +1,113 @@
+# ==========================================================================
+# Linha de comando do benchmark de modelos
+# ==========================================================================
+# Uso: python -m pede_analytics.treino avaliar [--candidatos logistica gradient_boosting] [--dobras 5] [--n-jobs -1]
+#                                              [--sem-cache] [--saida relatorio.csv]
+#      python -m pede_analytics.treino publicar [--candidato pareto|xgboost|...] [--atual]
+#      python -m pede_analytics.treino buscar [--candidatos xgboost] [--n-configuracoes 27] [--publicar --atual]
+#      python -m pede_analytics.treino limpar-cache
+
+# Bibliotecas do Sistema e Utilitários
+import argparse      # Interpreta os argumentos da linha de comando
+import logging       # Exibe o tamanho da base e o tempo total
+import shutil        # Remoção da pasta de cache
+import time          # Mede o tempo total
+
+# Processamento e Manipulação de Dados
+import json          # Hiperparâmetros vencedores
+import pandas as pd  # Formatação da tabela
+
+# Módulos do projeto
+from pede_analytics.treino.avaliacao import DIRETORIO_CACHE, DOBRAS, avaliar_candidatos, resumir # Validação cruzada
+from pede_analytics.treino.base import CAMINHO_BASE, carregar_base_treino # Base de modelagem
+from pede_analytics.treino.busca import AQUECIMENTO, ESPACOS, FATOR, N_CONFIGURACOES, RECURSO_MINIMO, buscar # Divisões sucessivas
+from pede_analytics.treino.candidatos import CANDIDATOS # Catálogo de candidatos
+from pede_analytics.treino.ensaios import CAMINHO_ENSAIOS # Banco de ensaios
+from pede_analytics.treino.selecao import escolher_candidato, publicar # Seleção e publicação
+
+def _exibir(resumo): # Tabela resumida no console
+    with pd.option_context('display.width', 250, 'display.max_columns', None, 'display.float_format', '{:.3f}'.format):
+        print(resumo.drop(columns=['Candidato']).to_string(index=False)) # Uma linha por candidato
+    print(f"🏆 Melhor da fronteira de Pareto: {escolher_candidato(resumo)}") # Candidato publicado por padrão
+
+def main(argv=None): # Ponto de entrada da CLI
+    parser = argparse.ArgumentParser(description="Benchmark dos candidatos a modelo de risco de defasagem.")
+    sub = parser.add_subparsers(dest='comando', required=True) # Subcomandos
+    p_ava = sub.add_parser('avaliar', help="Validação cruzada estratificada dos candidatos")
+    p_ava.add_argument('--base', default=str(CAMINHO_BASE), help="CSV da base unificada")
+    p_ava.add_argument('--candidatos', nargs='+', choices=list(CANDIDATOS), default=list(CANDIDATOS), help="Candidatos avaliados")
+    p_ava.add_argument('--dobras', type=int, default=DOBRAS, help="Dobras da validação cruzada")
+    p_ava.add_argument('--n-jobs', type=int, default=-1, help="Processos do joblib (-1 = todos os núcleos)")
+    p_ava.add_argument('--cache', default=str(DIRETORIO_CACHE), help="Pasta do cache de pré-processamentos e modelos")
+    p_ava.add_argument('--sem-cache', action='store_true', help="Treina tudo sem consultar nem gravar o cache")
+    p_ava.add_argument('--saida', help="Também grava a tabela por dobra neste CSV")
+    p_pub = sub.add_parser('publicar', help="Treina na base inteira, salva em models/ e registra no manifesto")
+    p_pub.add_argument('--base', default=str(CAMINHO_BASE), help="CSV da base unificada")
+    p_pub.add_argument('--candidato', choices=['pareto', *CANDIDATOS], default='pareto', help="Candidato publicado (pareto = avalia e escolhe)")
+    p_pub.add_argument('--dobras', type=int, default=DOBRAS, help="Dobras da avaliação usada pela escolha")
+    p_pub.add_argument('--n-jobs', type=int, default=-1, help="Processos do joblib (-1 = todos os núcleos)")
+    p_pub.add_argument('--cache', default=str(DIRETORIO_CACHE), help="Pasta do cache de pré-processamentos e modelos")
+    p_pub.add_argument('--atual', action='store_true', help="Marca a nova versão como a servida pelo app")
+    p_bus = sub.add_parser('buscar', help="Busca de hiperparâmetros por divisões sucessivas (ensaios em SQLite)")
+    p_bus.add_argument('--base', default=str(CAMINHO_BASE), help="CSV da base unificada")
+    p_bus.add_argument('--candidatos', nargs='+', choices=list(ESPACOS), default=list(ESPACOS), help="Candidatos buscados")
+    p_bus.add_argument('--n-configuracoes', type=int, default=N_CONFIGURACOES, help="Configurações da primeira rodada")
+    p_bus.add_argument('--fator', type=int, default=FATOR, help="Redução de configurações (e aumento do treino) por rodada")
+    p_bus.add_argument('--recurso-minimo', type=int, default=RECURSO_MINIMO, help="Linhas de treino da primeira rodada")
+    p_bus.add_argument('--aquecimento', type=int, default=AQUECIMENTO, help="Melhores configurações de bases anteriores reaproveitadas")
+    p_bus.add_argument('--dobras', type=int, default=DOBRAS, help="Dobras da validação cruzada")
+    p_bus.add_argument('--n-jobs', type=int, default=-1, help="Processos do joblib (-1 = todos os núcleos)")
+    p_bus.add_argument('--banco', default=str(CAMINHO_ENSAIOS), help="Banco SQLite dos ensaios")
+    p_bus.add_argument('--publicar', action='store_true', help="Publica a melhor configuração encontrada")
+    p_bus.add_argument('--atual', action='store_true', help="Com --publicar, passa a servir a nova versão no app")
+    p_lim = sub.add_parser('limpar-cache', help="Apaga os modelos e pré-processamentos memorizados")
+    p_lim.add_argument('--cache', default=str(DIRETORIO_CACHE), help="Pasta do cache")
+    args = parser.parse_args(argv) # Lê os argumentos
+    logging.basicConfig(format="%(levelname)s %(name)s: %(message)s") # Logs no console
+    logging.getLogger('pede_analytics').setLevel(logging.INFO) # Base e tempo total
+
+    if args.comando == 'limpar-cache': # Remove o cache inteiro
+        shutil.rmtree(args.cache, ignore_errors=True)
+        print(f"🗑️ Cache removido: {args.cache}")
+        return 0 # Sucesso
+
+    inicio = time.perf_counter() # Marca o início
+    X, y = carregar_base_treino(args.base) # Recorte do notebook + rótulo
+    if args.comando == 'publicar': # Escolha (opcional) + treino final + registro
+        candidato = args.candidato # Candidato explícito dispensa a avaliação
+        if candidato == 'pareto': # Avalia todos e escolhe pela fronteira de Pareto
+            resumo = resumir(avaliar_candidatos(X, y, list(CANDIDATOS), args.dobras, args.n_jobs, args.cache))
+            _exibir(resumo) # Mostra a base da escolha
+            candidato = escolher_candidato(resumo) # Melhor qualidade, menor custo
+        versao, caminho = publicar(candidato, X, y, atual=args.atual) # Artefato versionado
+        print(f"📦 {CANDIDATOS[candidato]['nome']} publicado como v{versao}: {caminho}")
+        print(f"⏱️ Concluído em {time.perf_counter() - inicio:.2f}s") # Tempo total
+        return 0 # Sucesso
+
+    if args.comando == 'buscar': # Uma busca por candidato, ensaios persistidos a cada conclusão
+        finais = [] # Melhor configuração de cada candidato
+        for candidato in args.candidatos: # Candidatos em sequência; ensaios de cada rodada em paralelo
+            historico = buscar(X, y, candidato, args.n_configuracoes, args.fator, args.recurso_minimo, args.dobras,
+                               args.n_jobs, args.banco, args.aquecimento) # Divisões sucessivas
+            ultima = historico[historico['rodada'] == historico['rodada'].max()] # Rodada com o treino inteiro
+            padrao = ultima[ultima['origem'] == 'padrao'].iloc[0] # Parâmetros do catálogo (referência)
+            finais.append(ultima.iloc[0]) # Vencedora do candidato
+            print(f"🔎 {CANDIDATOS[candidato]['nome']}: F2 {ultima.iloc[0]['f2']:.3f} | recall {ultima.iloc[0]['recall']:.3f}"
+                  f" | AUC {ultima.iloc[0]['auc']:.3f} (catálogo: F2 {padrao['f2']:.3f}, recall {padrao['recall']:.3f},"
+                  f" AUC {padrao['auc']:.3f}) -> {ultima.iloc[0]['parametros']}")
+        melhor = max(finais, key=lambda r: (r['f2'], r['recall'], r['auc'])) # Melhor entre os candidatos
+        print(f"🏆 Melhor configuração: {melhor['candidato']} {melhor['parametros']}")
+        if args.publicar: # Treina a vencedora na base inteira e registra
+            versao, caminho = publicar(melhor['candidato'], X, y, atual=args.atual, parametros=json.loads(melhor['parametros']))
+            print(f"📦 {CANDIDATOS[melhor['candidato']]['nome']} publicado como v{versao}: {caminho}")
+        print(f"⏱️ Concluído em {time.perf_counter() - inicio:.2f}s") # Tempo total
+        return 0 # Sucesso
+
+    por_dobra = avaliar_candidatos(X, y, args.candidatos, args.dobras, args.n_jobs, None if args.sem_cache else args.cache)
+    if args.saida: por_dobra.to_csv(args.saida, index=False) # Resultados completos
+    _exibir(resumir(por_dobra)) # Tabela + escolha
+    print(f"⏱️ Concluído em {time.perf_counter() - inicio:.2f}s") # Tempo total
+    return 0 # Sucesso
+
+if __name__ == "__main__": # Execução via python -m pede_analytics.treino
+    raise SystemExit(main()) # Executa a CLI
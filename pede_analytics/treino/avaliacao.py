@@ -0,0 +1,127 @@
+# ==========================================================================
+# Validação cruzada estratificada dos candidatos (paralela e com cache)
+# ==========================================================================
+
+# Bibliotecas do Sistema e Utilitários
+import logging       # Tempo total da avaliação
+import pickle        # Tamanho do pipeline serializado
+import time          # Tempos de ajuste e de predição
+
+# Processamento e Manipulação de Dados
+import numpy as np   # Mediana das latências
+import pandas as pd  # Tabela de resultados
+from joblib import Memory, Parallel, delayed # Cache em disco e paralelismo por (candidato, dobra)
+
+# Modelos e métricas
+from sklearn.base import clone # Cópias não ajustadas dos estimadores
+from sklearn.metrics import accuracy_score, f1_score, precision_score, recall_score, roc_auc_score # Métricas do notebook
+from sklearn.model_selection import StratifiedKFold # Dobras com a proporção de risco preservada
+from sklearn.pipeline import Pipeline # Mesmo formato do artefato salvo
+
+# Módulos do projeto
+from pede_analytics.treino.base import RAIZ_PROJETO # Raiz do repositório
+from pede_analytics.treino.candidatos import CANDIDATOS, criar_estimador, criar_preprocessador # Catálogo de candidatos
+from pede_analytics.treino.selecao import fronteira_pareto # Qualidade x custo
+
+logger = logging.getLogger(__name__) # Logger do módulo
+
+# ==========================================================================
+# Constantes
+# ==========================================================================
+
+DIRETORIO_CACHE = RAIZ_PROJETO / '.cache' / 'treino' # Pré-processamentos e modelos memorizados (fora do git)
+DOBRAS = 5 # Dobras da validação cruzada
+SEMENTE = 123 # Mesma semente do notebook
+AMOSTRAS_LATENCIA = 20 # Predições de linha única cronometradas por dobra
+METRICAS = ['Acurácia', 'Precisão', 'Recall', 'F1-score', 'AUC-ROC'] # Métricas de qualidade do relatório
+
+# ==========================================================================
+# Etapas memorizadas
+# ==========================================================================
+
+def _tamanho(objeto): # Bytes serializados (medidos antes do cache: a releitura muda a memoização do pickle)
+    return len(pickle.dumps(objeto, protocol=pickle.HIGHEST_PROTOCOL))
+
+def _preprocessar(preprocessador, X_treino, X_teste): # Chave: parâmetros do pré-processador + dados da dobra
+    """Ajusta o pré-processador no treino da dobra e devolve (pré-processador, treino, teste, bytes)."""
+    preprocessador = clone(preprocessador).fit(X_treino) # Ajuste sem vazamento do teste
+    return preprocessador, preprocessador.transform(X_treino), preprocessador.transform(X_teste), _tamanho(preprocessador)
+
+def _ajustar(estimador, Xt, y): # Chave: hash de (parâmetros do estimador, dados transformados, alvo)
+    """Ajusta uma cópia do estimador e devolve (modelo, segundos de ajuste, bytes)."""
+    inicio = time.perf_counter() # Marca o início do ajuste
+    modelo = clone(estimador).fit(Xt, y) # Treino do classificador
+    return modelo, time.perf_counter() - inicio, _tamanho(modelo) # Tempo original, mesmo quando servido do cache
+
+def _latencia_linha(pipeline, X, amostras=AMOSTRAS_LATENCIA): # Cenário do formulário (uma linha por chamada)
+    tempos = [] # Durações individuais
+    for i in range(min(amostras, len(X))): # Linhas distintas do teste
+        linha = X.iloc[[i]] # DataFrame de uma linha
+        inicio = time.perf_counter() # Marca o início
+        pipeline.predict_proba(linha) # Pré-processamento + modelo
+        tempos.append(time.perf_counter() - inicio)
+    return float(np.median(tempos)) # Mediana é robusta a ruídos
+
+# ==========================================================================
+# Avaliação
+# ==========================================================================
+
+def avaliar_dobra(candidato, X, y, treino, teste, dobra, diretorio_cache=DIRETORIO_CACHE): # Uma tarefa do paralelismo
+    """Treina e avalia `candidato` em uma dobra, reaproveitando pré-processamento e modelo do cache."""
+    memoria = Memory(diretorio_cache, verbose=0) # None desativa o cache
+    preprocessar, ajustar = memoria.cache(_preprocessar), memoria.cache(_ajustar) # Funções memorizadas
+    X_treino, X_teste = X.iloc[treino], X.iloc[teste] # Preditores da dobra
+    y_treino, y_teste = y.iloc[treino].to_numpy(), y.iloc[teste].to_numpy() # Alvo da dobra
+
+    preprocessador, Xt_treino, Xt_teste, bytes_prep = preprocessar(criar_preprocessador(candidato), X_treino, X_teste) # Uma vez por dobra
+    estimador = criar_estimador(candidato) # Parâmetros fazem parte da chave
+    reaproveitado = diretorio_cache is not None and ajustar.check_call_in_cache(estimador, Xt_treino, y_treino) # Acerto de cache
+    modelo, segundos, bytes_modelo = ajustar(estimador, Xt_treino, y_treino) # Treino (ou leitura do cache)
+
+    inicio = time.perf_counter() # Predição do lote de teste
+    proba = modelo.predict_proba(Xt_teste)[:, 1] # Probabilidade da classe de risco
+    lote = (time.perf_counter() - inicio) / len(teste) # Segundos por linha em lote
+    pred = modelo.predict(Xt_teste) # Rótulos do teste
+    pipeline = Pipeline(steps=[('preprocessor', preprocessador), ('classifier', modelo)]) # Formato do artefato
+
+    return { # Uma linha do relatório por (candidato, dobra)
+        'Candidato': candidato, 'Modelo': CANDIDATOS[candidato]['nome'], 'Dobra': dobra,
+        'Acurácia': accuracy_score(y_teste, pred), 'Precisão': precision_score(y_teste, pred, zero_division=0),
+        'Recall': recall_score(y_teste, pred), 'F1-score': f1_score(y_teste, pred), 'AUC-ROC': roc_auc_score(y_teste, proba),
+        'Overfit (%)': (accuracy_score(y_treino, modelo.predict(Xt_treino)) - accuracy_score(y_teste, pred)) * 100,
+        'Ajuste (s)': segundos, 'Latência (ms)': _latencia_linha(pipeline, X_teste) * 1e3, 'Lote (µs/linha)': lote * 1e6,
+        'Tamanho (KB)': (bytes_prep + bytes_modelo) / 1024, 'Cache': reaproveitado,
+    } # Encerra a linha
+
+def avaliar_candidatos(X, y, candidatos=tuple(CANDIDATOS), dobras=DOBRAS, n_jobs=-1, diretorio_cache=DIRETORIO_CACHE, semente=SEMENTE): # Benchmark completo
+    """Validação cruzada estratificada de todos os `candidatos`, com cada (candidato, dobra) em paralelo.
+
+    Pré-processamentos e modelos ajustados ficam memorizados em `diretorio_cache` (joblib.Memory):
+    repetir a avaliação, acrescentar um candidato ou mudar os parâmetros de um deles só treina o
+    que mudou. Retorna uma linha por (candidato, dobra), na ordem de `candidatos`.
+    """
+    inicio = time.perf_counter() # Marca o início
+    divisoes = list(StratifiedKFold(n_splits=dobras, shuffle=True, random_state=semente).split(X, y)) # Mesmas dobras para todos
+    linhas = Parallel(n_jobs=n_jobs)( # Ordem dos resultados = ordem das tarefas
+        delayed(avaliar_dobra)(c, X, y, treino, teste, i, diretorio_cache)
+        for c in candidatos for i, (treino, teste) in enumerate(divisoes)
+    ) # Encerra o paralelismo
+    por_dobra = pd.DataFrame(linhas) # Tabela longa
+    logger.info("%d candidatos x %d dobras avaliados em %.1f s (%d de %d modelos vindos do cache)",
+                len(candidatos), dobras, time.perf_counter() - inicio, por_dobra['Cache'].sum(), len(por_dobra))
+    return por_dobra # Resultados por dobra
+
+def resumir(por_dobra): # Uma linha por candidato
+    """Média das dobras (e desvio-padrão de Recall e AUC), ordenada pelo AUC-ROC como no notebook.
+
+    A coluna `Pareto` marca os candidatos que nenhum outro supera ao mesmo tempo em recall, AUC,
+    latência de uma linha e tempo de ajuste.
+    """
+    grupos = por_dobra.groupby(['Candidato', 'Modelo'], sort=False) # Mantém a ordem do catálogo
+    resumo = grupos.mean(numeric_only=True).drop(columns=['Dobra', 'Cache']) # Médias das dobras
+    resumo.insert(resumo.columns.get_loc('Recall') + 1, 'Recall (dp)', grupos['Recall'].std()) # Estabilidade do recall
+    resumo.insert(resumo.columns.get_loc('AUC-ROC') + 1, 'AUC-ROC (dp)', grupos['AUC-ROC'].std()) # Estabilidade do AUC
+    resumo['Cache (%)'] = grupos['Cache'].mean() * 100 # Dobras servidas sem treinar
+    resumo = resumo.reset_index().sort_values('AUC-ROC', ascending=False, ignore_index=True) # Melhor AUC primeiro
+    resumo['Pareto'] = fronteira_pareto(resumo) # Candidatos não dominados
+    return resumo # Uma linha por candidato
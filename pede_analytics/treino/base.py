@@ -0,0 +1,43 @@
+# ==========================================================================
+# Base de modelagem (mesmo recorte do notebook) e rótulo risco_defasagem
+# ==========================================================================
+
+# Bibliotecas do Sistema e Utilitários
+import logging       # Registro do tamanho da base
+from pathlib import Path # Manipulação de caminhos independente do diretório de execução
+
+# Processamento e Manipulação de Dados
+import pandas as pd  # Leitura da base unificada
+
+# Módulos do projeto
+from pede_analytics.esquema import FEATURES_CAT, FEATURES_NUM # Colunas usadas pelo pré-processamento
+from pede_analytics.regras import risco_defasagem # Rótulo declarado como tabela de regras
+
+logger = logging.getLogger(__name__) # Logger do módulo
+
+# ==========================================================================
+# Constantes
+# ==========================================================================
+
+RAIZ_PROJETO = Path(__file__).resolve().parents[2] # Raiz do repositório
+CAMINHO_BASE = RAIZ_PROJETO / 'data_processed' / 'df_unificado.csv' # Base tratada pelo ETL
+INDICADORES_OBRIGATORIOS = [ # Registros sem estes campos ficam fora da modelagem (notebook)
+    'INDE', 'IAA', 'IEG', 'IPS', 'IDA', 'IPV', 'IAN', 'IPP', 'IDADE', 'PEDRA', 'PONTO_VIRADA',
+] # Encerra a lista de indicadores
+FEATURES_TREINO = FEATURES_NUM + FEATURES_CAT # Colunas lidas pelo ColumnTransformer
+
+# ==========================================================================
+# Carga
+# ==========================================================================
+
+def preparar_base_treino(df): # DataFrame unificado -> (X, y)
+    """Aplica o recorte do notebook (indicadores completos) e gera o alvo `risco_defasagem`."""
+    base = df.dropna(subset=INDICADORES_OBRIGATORIOS).reset_index(drop=True) # Integridade estatística
+    y = risco_defasagem(base) # Alvo 0/1 pelas regras de negócio
+    return base[FEATURES_TREINO], y # Preditores sem INDE, ANO, DEFASAGEM e IAN (evita vazamento)
+
+def carregar_base_treino(caminho=CAMINHO_BASE): # Lê o CSV e prepara a modelagem
+    """Lê a base unificada e retorna (X, y) prontos para a validação cruzada."""
+    X, y = preparar_base_treino(pd.read_csv(caminho)) # Recorte e rótulo
+    logger.info("Base de treino: %d alunos (%.1f%% em risco) de %s", len(X), 100 * y.mean(), Path(caminho).name)
+    return X, y # Preditores e alvo
@@ -0,0 +1,156 @@
+# ==========================================================================
+# Busca de hiperparâmetros por divisões sucessivas (successive halving)
+# ==========================================================================
+
+# Bibliotecas do Sistema e Utilitários
+import json          # Configurações guardadas como JSON canônico
+import logging       # Progresso das rodadas
+import math          # Rodadas e sobreviventes do cronograma
+import time          # Tempos de ajuste, de predição e das rodadas
+
+# Processamento e Manipulação de Dados
+import joblib        # Hash da base (chave dos ensaios)
+import pandas as pd  # Tabela de resultados
+from joblib import Parallel, delayed # Ensaios em paralelo
+from scipy.stats import loguniform, randint, uniform # Distribuições dos hiperparâmetros
+
+# Modelos e métricas
+from sklearn.metrics import fbeta_score, precision_score, recall_score, roc_auc_score # Métricas de cada dobra
+from sklearn.model_selection import ParameterSampler, StratifiedKFold, train_test_split # Sorteio, dobras e subamostras
+from sklearn.pipeline import Pipeline # Mesmo formato do artefato salvo
+
+# Módulos do projeto
+from pede_analytics.treino.avaliacao import DOBRAS, SEMENTE # Mesmas dobras do benchmark
+from pede_analytics.treino.candidatos import criar_estimador, criar_preprocessador # Catálogo de candidatos
+from pede_analytics.treino.ensaios import CAMINHO_ENSAIOS, abrir, canonico, concluidos, gravar, melhores_anteriores # Banco SQLite
+
+logger = logging.getLogger(__name__) # Logger do módulo
+
+# ==========================================================================
+# Constantes
+# ==========================================================================
+
+N_CONFIGURACOES = 27 # Configurações na primeira rodada
+FATOR = 3 # A cada rodada: 1/FATOR das configurações sobrevivem e o treino cresce FATOR vezes
+RECURSO_MINIMO = 50 # Linhas de treino da primeira rodada
+AQUECIMENTO = 5 # Melhores configurações de buscas anteriores incluídas na primeira rodada
+BETA = 2 # F2: o recall pesa 4x mais que a precisão (evita o "todos em risco", que tem recall 1)
+
+ESPACOS = { # Candidato -> distribuições dos hiperparâmetros (demais parâmetros vêm do catálogo)
+    'logistica': {'C': loguniform(1e-3, 1e2), 'class_weight': [None, 'balanced']},
+    'random_forest': {
+        'n_estimators': randint(100, 401), 'max_depth': [None, 4, 6, 8, 12],
+        'min_samples_leaf': randint(1, 11), 'max_features': ['sqrt', 'log2', 0.5],
+    },
+    'gradient_boosting': {
+        'n_estimators': randint(50, 401), 'learning_rate': loguniform(0.01, 0.3), 'max_depth': randint(2, 6),
+        'subsample': uniform(0.6, 0.4), 'min_samples_leaf': randint(1, 21),
+    },
+    'hist_gradient_boosting': {
+        'learning_rate': loguniform(0.02, 0.3), 'max_leaf_nodes': randint(7, 64), 'min_samples_leaf': randint(5, 41),
+        'l2_regularization': loguniform(1e-3, 10), 'max_features': uniform(0.5, 0.5),
+    },
+    'xgboost': {
+        'learning_rate': loguniform(0.02, 0.3), 'max_depth': randint(2, 8), 'min_child_weight': loguniform(0.5, 10),
+        'subsample': uniform(0.6, 0.4), 'colsample_bytree': uniform(0.5, 0.5), 'reg_lambda': loguniform(0.1, 10),
+    },
+} # Encerra os espaços de busca
+
+# ==========================================================================
+# Cronograma e ensaios
+# ==========================================================================
+
+def chave_dados(X, y, dobras=DOBRAS, semente=SEMENTE): # Identifica a base da busca
+    """Hash de (X, y, dobras, semente): uma nova extração da PEDE gera uma nova chave."""
+    return joblib.hash((X, y, dobras, semente)) # Mesmo hash usado pelo joblib.Memory
+
+def cronograma(n_configuracoes, recurso_maximo, fator=FATOR, recurso_minimo=RECURSO_MINIMO): # Rodadas da busca
+    """Lista de (configurações avaliadas, linhas de treino) por rodada; a última usa o treino inteiro."""
+    por_recurso = int(math.log(recurso_maximo / recurso_minimo, fator)) if recurso_maximo > recurso_minimo else 0 # Quantas vezes o treino cresce
+    por_configuracao = math.ceil(math.log(n_configuracoes, fator)) if n_configuracoes > 1 else 0 # Até sobrar uma
+    rodadas = 1 + min(por_recurso, por_configuracao) # Limitado pelo que acabar primeiro
+    return [(math.ceil(n_configuracoes / fator ** r), int(recurso_maximo / fator ** (rodadas - 1 - r))) for r in range(rodadas)]
+
+def avaliar_ensaio(candidato, parametros, X, y, treino, teste, recurso, semente=SEMENTE): # Um ensaio
+    """Ajusta Pipeline(preprocessor, classifier) em `recurso` linhas do treino da dobra e mede o teste inteiro.
+
+    `recurso=None` usa o treino inteiro da dobra (última rodada, mesmo com dobras de tamanhos diferentes).
+    """
+    if recurso is not None and recurso < len(treino): # Subamostra estratificada e determinística (retomada reproduz o mesmo ensaio)
+        treino, _ = train_test_split(treino, train_size=recurso, stratify=y.iloc[treino], random_state=semente)
+    pipeline = Pipeline(steps=[('preprocessor', criar_preprocessador(candidato)),
+                               ('classifier', criar_estimador(candidato, **parametros))]) # Formato do artefato
+    inicio = time.perf_counter() # Marca o início do ajuste
+    pipeline.fit(X.iloc[treino], y.iloc[treino]) # Treino da rodada
+    ajuste = time.perf_counter() - inicio # Segundos de ajuste
+    inicio = time.perf_counter() # Marca o início da predição
+    proba = pipeline.predict_proba(X.iloc[teste])[:, 1] # Probabilidade da classe de risco
+    predicao = time.perf_counter() - inicio # Segundos de predição do teste
+    y_teste, pred = y.iloc[teste].to_numpy(), (proba >= 0.5).astype(int) # Mesmo limiar padrão da InferenciaRisco
+    return { # Métricas da dobra
+        'f2': fbeta_score(y_teste, pred, beta=BETA), 'recall': recall_score(y_teste, pred),
+        'precisao': precision_score(y_teste, pred, zero_division=0), 'auc': roc_auc_score(y_teste, proba),
+        'ajuste_s': ajuste, 'predicao_s': predicao,
+    } # Encerra as métricas
+
+def _tarefa(parametros, dobra, candidato, X, y, divisao, recurso, semente): # Uma tarefa do paralelismo
+    metricas = avaliar_ensaio(candidato, json.loads(parametros), X, y, *divisao, recurso, semente) # Ensaio
+    return parametros, dobra, metricas # Identifica o ensaio na ordem de conclusão
+
+# ==========================================================================
+# Busca
+# ==========================================================================
+
+def _populacao(conexao, chave, candidato, n_configuracoes, aquecimento, semente): # Configurações da primeira rodada
+    espaco = ESPACOS[candidato] # Distribuições do candidato
+    configuracoes = {canonico({}): 'padrao'} # Parâmetros do catálogo: referência fora da contagem
+    for parametros in melhores_anteriores(conexao, chave, candidato, aquecimento): # Melhores de bases anteriores
+        if set(parametros) <= set(espaco): configuracoes.setdefault(canonico(parametros), 'aquecido') # Ignora espaços antigos
+    for parametros in ParameterSampler(espaco, n_iter=n_configuracoes, random_state=semente): # Sorteio reprodutível
+        if len(configuracoes) > n_configuracoes: break # População completa (+ referência)
+        configuracoes.setdefault(canonico(parametros), 'aleatorio') # Sem duplicatas
+    return configuracoes # JSON canônico -> origem (na ordem de inserção)
+
+def buscar(X, y, candidato, n_configuracoes=N_CONFIGURACOES, fator=FATOR, recurso_minimo=RECURSO_MINIMO, dobras=DOBRAS,
+           n_jobs=-1, caminho=CAMINHO_ENSAIOS, aquecimento=AQUECIMENTO, semente=SEMENTE): # Busca de um candidato
+    """Divisões sucessivas sobre `n_configuracoes` do `candidato`, com cada ensaio gravado no SQLite.
+
+    Cada rodada avalia as configurações vivas em validação cruzada estratificada com `recurso`
+    linhas de treino por dobra; só a fração 1/`fator` de maior F2 passa para a rodada seguinte,
+    que usa `fator` vezes mais linhas. Ensaios (configuração, recurso, dobra) já presentes no banco
+    para a mesma base não são refeitos, então uma busca interrompida retoma de onde parou. Com uma
+    base nova, as `aquecimento` melhores configurações das buscas anteriores entram na primeira
+    rodada ao lado das sorteadas. Os parâmetros do catálogo passam por todas as rodadas como
+    referência (sem ocupar vaga das sobreviventes). Retorna uma linha por
+    (rodada, configuração), com a última rodada ordenada da melhor para a pior.
+    """
+    chave = chave_dados(X, y, dobras, semente) # Base atual
+    divisoes = list(StratifiedKFold(n_splits=dobras, shuffle=True, random_state=semente).split(X, y)) # Mesmas dobras do benchmark
+    conexao = abrir(caminho) # Banco de ensaios
+    try:
+        feitos = concluidos(conexao, chave, candidato) # Ensaios de buscas anteriores com esta base
+        configuracoes = _populacao(conexao, chave, candidato, n_configuracoes, aquecimento, semente) # Primeira rodada
+        vivas, linhas = list(configuracoes), [] # Configurações na disputa e tabela de resultados
+        recurso_maximo = min(len(t) for t, _ in divisoes) # Menor treino entre as dobras (topo do cronograma)
+        for rodada, (quantidade, recurso) in enumerate(cronograma(len(vivas) - 1, recurso_maximo, fator, recurso_minimo)):
+            inicio = time.perf_counter() # Marca o início da rodada
+            linhas_treino = recurso if recurso < recurso_maximo else None # Última rodada: dobra inteira (sem subamostra de n-1 linhas)
+            vivas = [p for p in vivas if configuracoes[p] != 'padrao'][:quantidade] + [canonico({})] # Sobreviventes + referência
+            pendentes = [(p, d) for p in vivas for d in range(dobras) if (p, recurso, d) not in feitos] # Falta calcular
+            tarefas = Parallel(n_jobs=n_jobs, return_as='generator_unordered')( # Grava cada ensaio assim que termina
+                delayed(_tarefa)(p, d, candidato, X, y, divisoes[d], linhas_treino, semente) for p, d in pendentes
+            ) if pendentes else [] # Rodada inteira já está no banco
+            for parametros, dobra, metricas in tarefas: # Na ordem de conclusão
+                gravar(conexao, chave, candidato, parametros, recurso, dobra, metricas, configuracoes[parametros]) # Persistência imediata
+                feitos[(parametros, recurso, dobra)] = metricas # Disponível para a seleção
+            medias = pd.DataFrame([{'parametros': p, **pd.DataFrame([feitos[(p, recurso, d)] for d in range(dobras)]).mean()}
+                                   for p in vivas]).sort_values(['f2', 'recall', 'auc'], ascending=False, kind='stable') # Ranking da rodada
+            vivas = medias['parametros'].tolist() # Melhores primeiro
+            linhas.extend({'rodada': rodada, 'recurso': recurso, 'origem': configuracoes[r['parametros']], **r} for r in medias.to_dict('records'))
+            logger.info("%s | rodada %d: %d configurações x %d dobras com %d linhas de treino (%d ensaios do banco) em %.1f s",
+                        candidato, rodada, len(vivas), dobras, recurso, len(vivas) * dobras - len(pendentes), time.perf_counter() - inicio)
+    finally:
+        conexao.close() # Libera o banco
+    resultado = pd.DataFrame(linhas) # Histórico da busca
+    resultado.insert(0, 'candidato', candidato) # Identifica o candidato
+    return resultado # Uma linha por (rodada, configuração)
@@ -0,0 +1,131 @@
+# ==========================================================================
+# Catálogo de candidatos e pré-processadores do benchmark de modelos
+# ==========================================================================
+
+# Processamento e Manipulação de Dados
+import numpy as np   # Marcador de categoria ausente ou desconhecida
+
+# Modelos e pré-processamento
+from sklearn.base import BaseEstimator, ClassifierMixin # Interface de estimador do sklearn
+from sklearn.compose import ColumnTransformer # Transformações por grupo de colunas
+from sklearn.ensemble import GradientBoostingClassifier, HistGradientBoostingClassifier, RandomForestClassifier # Ensembles de árvores
+from sklearn.linear_model import LogisticRegression # Modelo linear de base
+from sklearn.model_selection import train_test_split # Conjunto de validação da parada antecipada
+from sklearn.preprocessing import OneHotEncoder, OrdinalEncoder, StandardScaler # Escala e codificações
+from xgboost import XGBClassifier # Boosting por histogramas (tree_method='hist')
+
+# Módulos do projeto
+from pede_analytics.esquema import FEATURES_CAT, FEATURES_NUM # Colunas do modelo
+
+# ==========================================================================
+# Pré-processadores
+# ==========================================================================
+
+def preprocessador_onehot(): # Mesmo ColumnTransformer do notebook
+    """StandardScaler nos indicadores numéricos e OneHotEncoder nas categorias."""
+    return ColumnTransformer(transformers=[ # Não ajustado
+        ('num', StandardScaler(), FEATURES_NUM), # Z-score das métricas numéricas
+        ('cat', OneHotEncoder(handle_unknown='ignore'), FEATURES_CAT), # Colunas binárias por categoria
+    ]) # Encerra o transformador
+
+def preprocessador_nativo(): # Entrada dos boostings com suporte nativo a categorias
+    """Numéricas sem transformação (árvores não precisam de escala) e categorias como códigos 0..k-1.
+
+    Nulos e categorias não vistas no treino viram NaN, que os boostings por histograma tratam como
+    ausentes. As categorias ocupam as últimas colunas (`INDICES_CAT`).
+    """
+    return ColumnTransformer(transformers=[ # Não ajustado
+        ('num', 'passthrough', FEATURES_NUM), # Indicadores como estão
+        ('cat', OrdinalEncoder(handle_unknown='use_encoded_value', unknown_value=np.nan, encoded_missing_value=np.nan),
+         FEATURES_CAT), # Um código inteiro por categoria
+    ]) # Encerra o transformador
+
+PREPROCESSADORES = {'onehot': preprocessador_onehot, 'nativo': preprocessador_nativo} # Nome -> fábrica do pré-processador
+INDICES_CAT = list(range(len(FEATURES_NUM), len(FEATURES_NUM) + len(FEATURES_CAT))) # Colunas categóricas na saída do 'nativo'
+
+# ==========================================================================
+# XGBoost com parada antecipada
+# ==========================================================================
+
+class XGBoostParadaAntecipada(ClassifierMixin, BaseEstimator): # Cabe no Pipeline como qualquer classificador
+    """XGBClassifier (`tree_method='hist'`, categorias nativas) com parada antecipada.
+
+    O `fit` do XGBoost só para cedo com um `eval_set`, que o Pipeline não repassa; aqui uma fração
+    estratificada do treino é separada como validação, como o `validation_fraction` do
+    HistGradientBoostingClassifier. A predição usa a melhor iteração encontrada.
+    """
+
+    def __init__(self, n_estimators=500, learning_rate=0.1, max_depth=4, min_child_weight=1.0, subsample=1.0,
+                 colsample_bytree=1.0, reg_lambda=1.0, validation_fraction=0.1, n_iter_no_change=10,
+                 categoricas=None, random_state=None, n_jobs=None): # Parâmetros do sklearn
+        self.n_estimators = n_estimators # Limite superior de árvores
+        self.learning_rate = learning_rate # Contração de cada árvore
+        self.max_depth = max_depth # Profundidade máxima
+        self.min_child_weight = min_child_weight # Peso (hessiana) mínimo por folha
+        self.subsample = subsample # Fração de linhas por árvore
+        self.colsample_bytree = colsample_bytree # Fração de colunas por árvore
+        self.reg_lambda = reg_lambda # Regularização L2 das folhas
+        self.validation_fraction = validation_fraction # Fração do treino reservada à validação
+        self.n_iter_no_change = n_iter_no_change # Rodadas sem melhora antes de parar
+        self.categoricas = categoricas # Índices das colunas categóricas
+        self.random_state = random_state # Semente da divisão e do XGBoost
+        self.n_jobs = n_jobs # Threads do XGBoost
+
+    def fit(self, X, y): # Treino com validação interna
+        X_treino, X_val, y_treino, y_val = train_test_split( # Validação estratificada
+            X, y, test_size=self.validation_fraction, stratify=y, random_state=self.random_state)
+        n_colunas = X.shape[1] # Tipos por posição ('c' categórica, 'q' numérica)
+        tipos = ['c' if i in (self.categoricas or ()) else 'q' for i in range(n_colunas)]
+        self.modelo_ = XGBClassifier( # Booster real
+            n_estimators=self.n_estimators, learning_rate=self.learning_rate, max_depth=self.max_depth,
+            min_child_weight=self.min_child_weight, subsample=self.subsample, colsample_bytree=self.colsample_bytree,
+            reg_lambda=self.reg_lambda,
+            tree_method='hist', enable_categorical=True, feature_types=tipos, eval_metric='logloss',
+            early_stopping_rounds=self.n_iter_no_change, random_state=self.random_state, n_jobs=self.n_jobs,
+        ).fit(X_treino, y_treino, eval_set=[(X_val, y_val)], verbose=False) # Para na melhor rodada
+        self.classes_ = self.modelo_.classes_ # Ordem das colunas de predict_proba
+        self.n_features_in_ = n_colunas # Convenção do sklearn
+        self.n_iter_ = self.modelo_.best_iteration + 1 # Árvores efetivamente usadas
+        return self # Encadeável
+
+    def predict_proba(self, X): # Probabilidades na melhor iteração
+        return self.modelo_.predict_proba(X)
+
+    def predict(self, X): # Classe mais provável
+        return self.classes_[self.predict_proba(X).argmax(axis=1)]
+
+# ==========================================================================
+# Candidatos
+# ==========================================================================
+
+CANDIDATOS = { # id -> nome exibido, classe, parâmetros e pré-processador (configurações do notebook)
+    'logistica': {
+        'nome': 'Logistic Regression', 'classe': LogisticRegression,
+        'parametros': {'random_state': 123, 'max_iter': 1000}, 'preprocessador': 'onehot',
+    },
+    'random_forest': {
+        'nome': 'Random Forest', 'classe': RandomForestClassifier,
+        'parametros': {'n_estimators': 200, 'random_state': 123}, 'preprocessador': 'onehot',
+    },
+    'gradient_boosting': {
+        'nome': 'Gradient Boosting', 'classe': GradientBoostingClassifier,
+        'parametros': {'n_estimators': 200, 'random_state': 123}, 'preprocessador': 'onehot',
+    },
+    'hist_gradient_boosting': { # Histogramas + categorias nativas + parada antecipada
+        'nome': 'Hist Gradient Boosting', 'classe': HistGradientBoostingClassifier,
+        'parametros': {'max_iter': 500, 'early_stopping': True, 'validation_fraction': 0.1, 'n_iter_no_change': 10,
+                       'categorical_features': INDICES_CAT, 'random_state': 123}, 'preprocessador': 'nativo',
+    },
+    'xgboost': { # tree_method='hist' + categorias nativas + parada antecipada
+        'nome': 'XGBoost', 'classe': XGBoostParadaAntecipada,
+        'parametros': {'n_estimators': 500, 'categoricas': INDICES_CAT, 'random_state': 123}, 'preprocessador': 'nativo',
+    },
+} # Encerra o catálogo
+
+def criar_estimador(candidato, **parametros): # Estimador não ajustado
+    """Instancia o classificador do candidato, com `parametros` sobrescrevendo os padrões."""
+    spec = CANDIDATOS[candidato] # KeyError para candidato desconhecido
+    return spec['classe'](**{**spec['parametros'], **parametros}) # Padrões + ajustes
+
+def criar_preprocessador(candidato): # Pré-processador não ajustado do candidato
+    return PREPROCESSADORES[CANDIDATOS[candidato]['preprocessador']]() # Nova instância a cada chamada
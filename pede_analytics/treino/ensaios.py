@@ -0,0 +1,86 @@
+# ==========================================================================
+# Registro persistente dos ensaios da busca de hiperparâmetros (SQLite local)
+# ==========================================================================
+
+# Bibliotecas do Sistema e Utilitários
+import json          # Parâmetros em forma canônica
+import sqlite3       # Banco local, sem servidor
+from datetime import datetime, timezone # Momento de cada ensaio
+from pathlib import Path # Caminho do banco
+
+# Módulos do projeto
+from pede_analytics.treino.base import RAIZ_PROJETO # Raiz do repositório
+
+# ==========================================================================
+# Constantes
+# ==========================================================================
+
+CAMINHO_ENSAIOS = RAIZ_PROJETO / '.cache' / 'ensaios.sqlite' # Fora de .cache/treino: limpar-cache não apaga o histórico
+COLUNAS_METRICAS = ['f2', 'recall', 'precisao', 'auc', 'ajuste_s', 'predicao_s'] # Resultado de cada dobra
+
+ESQUEMA = """
+CREATE TABLE IF NOT EXISTS ensaios (
+    chave_dados TEXT NOT NULL,     -- Hash da base (X, y), das dobras e da semente
+    candidato   TEXT NOT NULL,     -- Id do catálogo de candidatos
+    parametros  TEXT NOT NULL,     -- JSON canônico dos hiperparâmetros
+    recurso     INTEGER NOT NULL,  -- Linhas de treino da rodada (a última usa a dobra inteira)
+    dobra       INTEGER NOT NULL,  -- Dobra da validação cruzada
+    f2          REAL, recall REAL, precisao REAL, auc REAL, -- Métricas no teste da dobra
+    ajuste_s    REAL, predicao_s REAL, -- Tempos de ajuste e de predição do teste
+    origem      TEXT NOT NULL,     -- 'padrao' (catálogo), 'aleatorio' ou 'aquecido' (vindo de buscas anteriores)
+    criado_em   TEXT NOT NULL,
+    PRIMARY KEY (chave_dados, candidato, parametros, recurso, dobra)
+);
+"""
+
+# ==========================================================================
+# Acesso ao banco
+# ==========================================================================
+
+def canonico(parametros): # Mesma configuração -> mesmo texto
+    """JSON com chaves ordenadas e escalares NumPy convertidos para tipos nativos."""
+    return json.dumps({k: v.item() if hasattr(v, 'item') else v for k, v in parametros.items()}, sort_keys=True)
+
+def abrir(caminho=CAMINHO_ENSAIOS): # Conexão pronta para uso
+    """Abre (criando se preciso) o banco de ensaios."""
+    Path(caminho).parent.mkdir(parents=True, exist_ok=True) # Pasta .cache
+    conexao = sqlite3.connect(caminho) # Um único escritor: o processo da busca
+    conexao.execute('PRAGMA journal_mode=WAL') # Leituras concorrentes enquanto a busca grava
+    conexao.executescript(ESQUEMA) # Tabela idempotente
+    return conexao # Conexão aberta
+
+def gravar(conexao, chave_dados, candidato, parametros, recurso, dobra, metricas, origem): # Um ensaio concluído
+    """Persiste o resultado de uma (configuração, recurso, dobra) imediatamente (commit por ensaio)."""
+    conexao.execute( # Reexecuções do mesmo ensaio substituem o registro
+        f"INSERT OR REPLACE INTO ensaios VALUES (?, ?, ?, ?, ?, {', '.join('?' * len(COLUNAS_METRICAS))}, ?, ?)",
+        (chave_dados, candidato, parametros, recurso, dobra, *(metricas[c] for c in COLUNAS_METRICAS), origem,
+         datetime.now(timezone.utc).isoformat(timespec='seconds')),
+    ) # Encerra a inserção
+    conexao.commit() # Uma interrupção perde no máximo os ensaios em andamento
+
+def concluidos(conexao, chave_dados, candidato): # Ensaios que não precisam ser refeitos
+    """Dicionário (parâmetros, recurso, dobra) -> métricas dos ensaios já gravados para esta base."""
+    cursor = conexao.execute( # Tudo que a busca interrompida já calculou
+        f"SELECT parametros, recurso, dobra, {', '.join(COLUNAS_METRICAS)} FROM ensaios WHERE chave_dados = ? AND candidato = ?",
+        (chave_dados, candidato),
+    ) # Encerra a consulta
+    return {(p, r, d): dict(zip(COLUNAS_METRICAS, valores)) for p, r, d, *valores in cursor} # Chave do ensaio -> métricas
+
+def melhores_anteriores(conexao, chave_dados, candidato, quantidade): # Sementes do aquecimento
+    """Até `quantidade` configurações de buscas feitas com outras bases, das mais promissoras às menos.
+
+    Configurações que chegaram às rodadas com mais dados vêm primeiro; dentro da mesma rodada,
+    vence a maior média de F2 nas dobras.
+    """
+    if quantidade <= 0: return [] # Aquecimento desligado
+    cursor = conexao.execute( # Média por (base, configuração, rodada)
+        "SELECT parametros, recurso, AVG(f2) FROM ensaios"
+        " WHERE candidato = ? AND chave_dados != ? GROUP BY chave_dados, parametros, recurso"
+        " ORDER BY recurso DESC, 3 DESC",
+        (candidato, chave_dados),
+    ) # Encerra a consulta
+    escolhidos = [] # Sem repetições, na ordem do ranking
+    for parametros, _, _ in cursor: # Melhores primeiro
+        if parametros not in escolhidos: escolhidos.append(parametros)
+        if len(escolhidos) == quantidade: break
+    return [json.loads(p) for p in escolhidos] # Dicionários de hiperparâmetros
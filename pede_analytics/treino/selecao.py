@@ -0,0 +1,87 @@
+# ==========================================================================
+# Seleção do candidato (fronteira de Pareto) e publicação no registro
+# ==========================================================================
+
+# Bibliotecas do Sistema e Utilitários
+import logging       # Resumo do artefato publicado
+from pathlib import Path # Caminho do artefato
+
+# Processamento e Manipulação de Dados
+import joblib        # Serialização do pipeline (sem compressão, compatível com memory-map)
+import numpy as np   # Comparações entre candidatos
+
+# Modelos
+from sklearn.pipeline import Pipeline # Mesmo formato do artefato do notebook
+
+# Módulos do projeto
+from pede_analytics.registro import DIRETORIO_MODELOS, MODELO_PADRAO, ler_manifesto, registrar # Registro local de modelos
+from pede_analytics.treino.candidatos import criar_estimador, criar_preprocessador # Catálogo de candidatos
+
+logger = logging.getLogger(__name__) # Logger do módulo
+
+# ==========================================================================
+# Critérios
+# ==========================================================================
+
+MAXIMIZAR = ['Recall', 'AUC-ROC'] # Qualidade: recall primeiro (alunos em risco não podem passar despercebidos)
+MINIMIZAR = ['Latência (ms)', 'Ajuste (s)'] # Custo: latência do formulário primeiro, depois o tempo de treino
+TOLERANCIA = 0.005 # Diferença de recall/AUC considerada empate (abaixo do desvio-padrão entre dobras)
+
+# ==========================================================================
+# Fronteira de Pareto
+# ==========================================================================
+
+def fronteira_pareto(resumo, maximizar=MAXIMIZAR, minimizar=MINIMIZAR): # Candidatos não dominados
+    """Máscara booleana dos candidatos de `resumo` que nenhum outro domina.
+
+    Um candidato é dominado quando outro é pelo menos tão bom em todos os critérios e
+    estritamente melhor em algum.
+    """
+    custos = np.column_stack([-resumo[c].to_numpy(dtype=float) for c in maximizar] + # Tudo vira "menor é melhor"
+                             [resumo[c].to_numpy(dtype=float) for c in minimizar])
+    nao_pior = (custos[:, None, :] <= custos[None, :, :]).all(axis=2) # [i, j]: i é pelo menos tão bom quanto j
+    melhor = (custos[:, None, :] < custos[None, :, :]).any(axis=2) # [i, j]: i supera j em algum critério
+    dominado = (nao_pior & melhor).any(axis=0) # j é dominado se algum i o domina
+    return ~dominado # Fronteira de Pareto
+
+def escolher_candidato(resumo, tolerancia=TOLERANCIA): # Candidato publicado por padrão
+    """Id do candidato da fronteira de Pareto com melhor qualidade e, entre empates, menor custo.
+
+    Os critérios de `MAXIMIZAR` filtram em sequência (até `tolerancia` abaixo do melhor); entre os
+    que restam vence o menor custo, na ordem de `MINIMIZAR`.
+    """
+    restantes = resumo[fronteira_pareto(resumo)] # Só candidatos não dominados
+    for coluna in MAXIMIZAR: # Qualidade em ordem de prioridade
+        restantes = restantes[restantes[coluna] >= restantes[coluna].max() - tolerancia] # Empates técnicos
+    return restantes.sort_values(MINIMIZAR).iloc[0]['Candidato'] # Mais barato entre os melhores
+
+# ==========================================================================
+# Publicação
+# ==========================================================================
+
+def treinar_pipeline(candidato, X, y, parametros=None): # Modelo final na base inteira
+    """Ajusta Pipeline(preprocessor, classifier) do `candidato` em toda a base, como o artefato do notebook.
+
+    `parametros` (por exemplo, os da busca de hiperparâmetros) sobrescrevem os padrões do catálogo.
+    """
+    classificador = criar_estimador(candidato, **(parametros or {})) # Catálogo + ajustes
+    pipeline = Pipeline(steps=[('preprocessor', criar_preprocessador(candidato)), ('classifier', classificador)])
+    return pipeline.fit(X, y) # Pipeline pronto para InferenciaRisco
+
+def publicar(candidato, X, y, nome=MODELO_PADRAO, diretorio=DIRETORIO_MODELOS, atual=False, parametros=None): # Treina, salva e registra
+    """Treina o `candidato` na base inteira, grava o artefato em `diretorio` e o registra no manifesto.
+
+    O arquivo leva o número da versão, então artefatos já registrados nunca são sobrescritos. Com
+    `atual=False` a versão fica disponível (`--versao` / `resolver`) sem trocar o modelo servido.
+    Retorna (versão, caminho).
+    """
+    versoes = ler_manifesto(diretorio)['modelos'].get(nome, {}).get('versoes', {}) # Versões existentes
+    versao = str(len(versoes) + 1) # Mesma numeração sequencial de `registrar`
+    caminho = Path(diretorio) / f'modelo_{candidato}_v{versao}.joblib' # Um arquivo por versão
+    if caminho.exists(): # Nunca substitui um artefato existente
+        raise FileExistsError(f"Artefato já existe: {caminho}")
+    joblib.dump(treinar_pipeline(candidato, X, y, parametros), caminho) # Sem compressão: carregar() usa memory-map
+    registrar(caminho, nome, versao, diretorio, atual) # SHA-256 + manifesto
+    logger.info("Candidato %s publicado como %s v%s (%s, %.0f KB)%s", candidato, nome, versao, caminho.name,
+                caminho.stat().st_size / 1024, " e marcado como atual" if atual else "")
+    return versao, caminho # Versão registrada e artefato
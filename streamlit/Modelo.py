@@ -3,13 +3,12 @@
 # ==========================================================================
 
 # Bibliotecas do Sistema e Utilitários
-import io            # Gerencia fluxos de dados (entrada/saída) em memória binária
-import requests      # Permite realizar requisições HTTP para buscar o modelo no GitHub
-import time          # Fornece funções de controle de tempo para pausas e animações
+import logging       # Exibe no console a origem e o tempo de carga do modelo
+import sys           # Permite registrar a raiz do projeto no caminho de importação
 import unicodedata   # Utilizado para normalizar textos e remover acentos de strings
+from pathlib import Path # Manipulação de caminhos independente do diretório de execução
 
 # Processamento e Manipulação de Dados
-import joblib        # Carrega e salva objetos serializados, como modelos de IA (.joblib)
 import numpy as np   # Biblioteca para cálculos matemáticos e operações com arrays
 import pandas as pd  # Ferramenta principal para criação e manipulação de DataFrames
 
@@ -18,6 +17,19 @@ import matplotlib.pyplot as plt # Interface base para geração de gráficos est
 import seaborn as sns           # Biblioteca de visualização estatística refinada
 import streamlit as st          # Framework para converter o script em aplicação web interativa
 
+# Módulos do projeto (pacote pede_analytics na raiz do repositório)
+sys.path.insert(0, str(Path(__file__).resolve().parents[1])) # Torna o pacote importável via streamlit run
+from pede_analytics.inferencia import InferenciaRisco # Rótulo, probabilidade e faixa em passada única
+from pede_analytics.modelo import carregar_modelo # Carga do modelo
+from pede_analytics.figuras import renderizar_png # Rasteriza e fecha a figura
+from pede_analytics.previsoes import CachePrevisoes, assinatura_modelo # Perfis repetidos não passam pelo modelo
+from pede_analytics.regras import diagnostico_risco # Faixas de diagnóstico do formulário
+from pede_analytics.sensibilidade import INDICADORES, curvas, mapa, melhorias # Simulação "e se?" em passada única
+from pede_analytics.telemetria import Cronometro, JanelaLatencia # Medição real dos tempos de inferência
+
+logging.basicConfig(format="%(asctime)s %(levelname)s %(name)s: %(message)s") # Logs no console do servidor
+logging.getLogger('pede_analytics').setLevel(logging.INFO) # Origem e tempo de carga do modelo e da base
+
 # ==========================================================================
 # Config página
 # ==========================================================================
@@ -43,25 +55,13 @@ def setup_options(lista): # Define função para padronizar e ordenar listas de
 
 @st.cache_resource # Mantém o modelo carregado na memória para evitar reprocessamento constante
 def load_model(): # Define função para carregamento do arquivo do modelo
-    """Carrega o modelo treinado (.joblib) com fallback para GitHub."""
-    local_path = 'models/modelo_final_gradient_boosting.joblib' # Define caminho do arquivo no ambiente local
-    github_url = "https://raw.githubusercontent.com/geoferreira1/fiap_tech_challenge_fase_5/main/models/modelo_final_gradient_boosting.joblib" # URL do repositório remoto
-
-    # 1. Tentativa de carregamento a partir do diretório local
-    try: # Inicia bloco de captura de erros
-        return joblib.load(local_path) # Tenta carregar o modelo localmente
-    except (FileNotFoundError, Exception) as e: # Captura erro se o arquivo não existir
-        print(f"Aviso: Modelo local não encontrado ou erro no carregamento: {e}") # Exibe aviso no console
-
-    # 2. Tentativa Remota (GitHub) como alternativa de segurança
-    try: # Inicia bloco de tentativa remota
-        response = requests.get(github_url, timeout=15) # Realiza o download do modelo via HTTP
-        response.raise_for_status() # Lança erro se a requisição não for bem-sucedida
-        return joblib.load(io.BytesIO(response.content)) # Carrega o modelo a partir dos bytes baixados
-    except Exception as e: # Captura qualquer falha no processo remoto
-        print(f"Erro crítico: Não foi possível carregar o modelo remotamente: {e}") # Exibe erro fatal no console
-    
-    return None # Retorna nulo caso todas as tentativas falhem
+    """Carrega o modelo do registro local (checksum + memory-map), com download apenas se o artefato faltar."""
+    return carregar_modelo() # Reutiliza o carregador compartilhado com a pontuação em lote
+
+@st.cache_resource # Um único cache de previsões compartilhado por todas as sessões
+def load_previsoes(_model): # O sublinhado evita que o Streamlit tente gerar hash do pipeline
+    """Envolve o modelo em um cache LRU de previsões chaveado pelo perfil do aluno e pela versão do artefato."""
+    return CachePrevisoes(InferenciaRisco(_model), assinatura_modelo()) # Somente memória: o formulário tem poucos perfis distintos
 
 def config_page(): # Define função para construir a barra lateral (sidebar)
     """Desenha os elementos na barra lateral esquerda."""
@@ -79,13 +79,6 @@ def config_page(): # Define função para construir a barra lateral (sidebar)
             <a href="https://github.com/geoferreira1/fiap_tech_challenge_fase_5" target="_blank" class="github-icon">
             <i class="fa-brands fa-github"></i></a>""", unsafe_allow_html=True) # Insere ícone do GitHub via HTML/CSS
 
-def classificar_nivel_risco(prob): # Função auxiliar para rotular o risco (lógica de apoio)
-    """Classifica o nível de risco baseado na probabilidade"""
-    if prob < 0.30: return 'Sem Risco', '✅', 'risk-low' # Risco baixo
-    elif prob < 0.60: return 'Atenção', '⚡', 'risk-attention' # Atenção
-    elif prob < 0.85: return 'Risco Moderado', '⚠️', 'risk-moderate' # Moderado
-    else: return 'Risco Alto', '🚨', 'risk-high' # Risco alto
-
 # ==========================================================================
 # Coleta de Dados (Formulário)
 # ==========================================================================
@@ -148,6 +141,85 @@ def get_clinic_input(): # Define função para construir o formulário de entrad
     
     return pd.DataFrame(data, index=[0]) # Retorna os dados convertidos em um DataFrame do Pandas
 
+# ==========================================================================
+# Resultado da Análise
+# ==========================================================================
+
+def renderizar_resultado(prob_risco): # Desenha o bloco de resultado da análise
+    """Exibe o diagnóstico e a recomendação conforme a probabilidade de risco (em %)."""
+    st.markdown("---") # Divisor
+    st.header("Resultado da Análise") # Título da seção de resultados
+
+    # Diagnóstico pela tabela de faixas compartilhada (pede_analytics.regras)
+    titulo, emoji, alerta, caixa, recomendacao = diagnostico_risco(prob_risco) # Faixa atingida pela probabilidade
+    getattr(st, alerta)(f"{emoji} **{titulo}**") # Mensagem colorida (erro, atenção ou sucesso)
+    st.metric(label="A probabilidade do aluno ficar defasado futuramente é de:", value=f"{prob_risco:.1f}%") # Exibe métrica
+    getattr(st, caixa)(f"💭 **Recomendação:** {recomendacao}") # Recomendação da faixa
+
+def renderizar_explicacao(previsoes, input_df): # Mostra o que levou à probabilidade
+    """Barras com a contribuição (log-odds) de cada atributo do aluno: vermelho aumenta o risco, verde reduz."""
+    st.subheader("🧭 O que pesou nesta previsão") # Título da explicação
+    try: # Explicações por caminho existem apenas para o GradientBoosting
+        contribuicoes = previsoes.explicar(input_df).iloc[0] # CONTRIB_BASE + um valor por atributo
+    except TypeError: # Outro classificador publicado no registro
+        st.info("Explicações por atributo estão disponíveis apenas para o modelo Gradient Boosting.") # Aviso
+        return
+    base = contribuicoes.pop('CONTRIB_BASE') # Ponto de partida comum a todos os alunos
+    campos = contribuicoes.rename(lambda c: c.removeprefix('CONTRIB_')) # Nome original do atributo
+    campos = campos[campos.abs().sort_values().index] # Maior efeito no topo do gráfico de barras
+    aluno = input_df.iloc[0] # Valores informados no formulário
+    rotulos = [f"{c} = {aluno[c]:g}" if isinstance(aluno[c], (int, float, np.number)) else f"{c} = {aluno[c]}" for c in campos.index]
+    fig, ax = plt.subplots(figsize=(8, 5)) # Figura das contribuições
+    ax.barh(rotulos, campos.to_numpy(), color=np.where(campos.to_numpy() > 0, '#e74c3c', '#2ecc71')) # Vermelho = aumenta o risco
+    ax.axvline(0, color='.3', linewidth=1) # Referência (sem efeito)
+    ax.set_xlabel("Contribuição para o risco (log-odds)") # Eixo X
+    st.image(renderizar_png(fig), width='stretch') # Exibe e libera a figura
+    st.caption(f"Ponto de partida: log-odds médio do treino ({base:.2f}). Barras vermelhas aumentam o risco e verdes reduzem; "
+               f"partida + barras = {base + campos.sum():.2f} log-odds, ou seja, a probabilidade exibida.") # Leitura do gráfico
+
+# ==========================================================================
+# Análise de Sensibilidade ("e se?")
+# ==========================================================================
+
+def renderizar_sensibilidade(inferencia, input_df): # Simula melhorias nos indicadores do aluno
+    """Curvas de risco por indicador ou mapa de calor de dois indicadores, com uma única passada do modelo."""
+    if not st.toggle("🔍 Simular melhorias nos indicadores (e se?)"): return # Simulação sob demanda
+    modo = st.radio("Tipo de simulação", ["Um indicador por vez", "Dois indicadores combinados"], horizontal=True) # Curvas ou mapa
+    cronometro = Cronometro() # Mede a varredura
+    if modo == "Um indicador por vez": # Seis curvas de 0 a 10
+        with cronometro.etapa('varredura'): # Todos os cenários em um único predict_proba
+            tabela = curvas(inferencia, input_df) # INDICADOR, VALOR, PROB_RISCO
+        fig, ax = plt.subplots(figsize=(10, 5)) # Figura das curvas
+        for (indicador, curva), cor in zip(tabela.groupby('INDICADOR', sort=False), sns.color_palette('Set2')): # Uma curva por indicador
+            ax.plot(curva['VALOR'], curva['PROB_RISCO'] * 100, color=cor, label=indicador) # Risco ao longo da grade
+            atual = input_df[indicador].iloc[0] # Valor informado no formulário
+            ax.scatter([atual], [np.interp(atual, curva['VALOR'], curva['PROB_RISCO']) * 100], color=cor, zorder=3) # Posição atual
+        ax.set_xlabel("Valor do indicador") # Eixo X
+        ax.set_ylabel("Probabilidade de risco (%)") # Eixo Y
+        ax.set_ylim(0, 100) # Escala fixa entre alunos
+        ax.legend(title="Indicador", loc="upper left", bbox_to_anchor=(1, 1)) # Legenda lateral
+        st.image(renderizar_png(fig), width='stretch') # Exibe e libera a figura
+        st.markdown("**Indicadores que mais reduzem o risco** (subindo a partir do valor atual):") # Título da tabela
+        st.dataframe(melhorias(tabela, input_df).round(1), hide_index=True, width='stretch') # Ranking das melhorias
+        cenarios_avaliados = len(tabela) # Total de cenários
+    else: # Mapa de calor de dois indicadores
+        col_x, col_y = st.columns(2) # Seleção dos eixos
+        eixo_x = col_x.selectbox("Eixo horizontal", INDICADORES, index=0) # Primeiro indicador
+        eixo_y = col_y.selectbox("Eixo vertical", [c for c in INDICADORES if c != eixo_x], index=0) # Segundo indicador
+        with cronometro.etapa('varredura'): # 101 x 101 cenários em um único predict_proba
+            matriz = mapa(inferencia, input_df, eixo_x, eixo_y) # Linhas = eixo_y, colunas = eixo_x
+        fig, ax = plt.subplots(figsize=(8, 6)) # Figura do mapa
+        imagem = ax.imshow(matriz.to_numpy() * 100, origin='lower', extent=(-0.05, 10.05, -0.05, 10.05), aspect='auto',
+                           cmap='RdYlGn_r', vmin=0, vmax=100) # Verde = menor risco
+        fig.colorbar(imagem, ax=ax, label="Probabilidade de risco (%)") # Escala de cores
+        ax.scatter([input_df[eixo_x].iloc[0]], [input_df[eixo_y].iloc[0]], marker='X', s=120, color='black', label="Aluno") # Posição atual
+        ax.set_xlabel(eixo_x) # Eixo X
+        ax.set_ylabel(eixo_y) # Eixo Y
+        ax.legend(loc="upper left") # Identifica o aluno
+        st.image(renderizar_png(fig), width='stretch') # Exibe e libera a figura
+        cenarios_avaliados = matriz.size # Total de cenários
+    st.caption(f"{cenarios_avaliados:,} cenários avaliados em {cronometro.total:.0f} ms (uma única passada do modelo).") # Custo da simulação
+
 # ==========================================================================
 # 6. Execução Principal (Main)
 # ==========================================================================
@@ -161,49 +233,44 @@ def main(): # Define função principal que coordena o app
     st.markdown("Preencha o formulário a seguir para que o modelo calcule a probabilidade do risco de defasagem dos alunos.") # Texto
     st.markdown("---") # Divisor
 
-    input_df = get_clinic_input() # Chama a função de formulário e armazena os dados do usuário
+    cronometro = Cronometro() # Mede as etapas reais desta execução
+    with cronometro.etapa('montagem_entrada'): # Tempo de montagem do formulário e do DataFrame
+        input_df = get_clinic_input() # Chama a função de formulário e armazena os dados do usuário
     st.markdown("###") # Espaçamento vertical
 
+    if 'latencias' not in st.session_state: # Janela de latências da sessão
+        st.session_state['latencias'] = JanelaLatencia() # Guarda as últimas medições para p50/p95
+
     # Botão para disparar o cálculo da inteligência artificial
     if st.button("🎯 Clique aqui para fazer a previsão", type="primary", use_container_width=True): # Inicia se clicado
         if model is not None: # Verifica se o modelo está pronto para uso
             try: # Bloco de execução da predição
-                progress_text = "Analisando dados do aluno. Por favor, aguarde..." # Texto da barra de progresso
-                my_bar = st.progress(0, text=progress_text) # Inicializa barra de progresso em 0%
-                for percent_complete in range(100): # Loop para simular o tempo de processamento
-                    time.sleep(0.01) # Pausa curta para animação
-                    my_bar.progress(percent_complete + 1, text=progress_text) # Atualiza progresso da barra
-                time.sleep(0.5) # Pausa final
-                my_bar.empty() # Remove a barra da tela
-
-                prediction = model.predict(input_df) # Realiza a classificação (Risco vs Não Risco)
-                probability = model.predict_proba(input_df) # Extrai as probabilidades de cada classe
-                prob_risco = probability[0][1]*100 # Converte probabilidade da classe de risco para porcentagem
-
-                st.markdown("---") # Divisor
-                st.header("Resultado da Análise") # Título da seção de resultados
-
-                # Lógica de diagnóstico baseada no resultado da probabilidade
-                if prob_risco >= 51: # Regra de Alto Risco
-                    st.error(f"🚨 **ALTO RISCO DE DEFASAGEM**") # Mensagem de erro (vermelha)
-                    st.metric(label="A probabilidade do aluno ficar defasado futuramente é de:", value=f"{prob_risco:.1f}%") # Exibe métrica
-                    st.warning("💭 **Recomendação:** Aluno necessita de plano de recuperação imediato e reunião com responsáveis.") # Aviso
-
-                elif prob_risco == 50: # Regra de Médio Risco
-                    st.warning(f"⚠️ **MÉDIO RISCO**") # Mensagem de atenção (amarela)
-                    st.metric(label="A probabilidade do aluno ficar defasado futuramente é de:", value=f"{prob_risco:.1f}%") # Métrica
-                    st.info("💭 **Recomendação:** Sugere-se monitoramento semanal e oferta de aulas de reforço em contraturno.") # Info
-
-                else: # Regra de Baixo Risco
-                    st.success(f"🥳 **BAIXO RISCO DE DEFASAGEM**") # Mensagem de sucesso (verde)
-                    st.metric(label="A probabilidade do aluno ficar defasado futuramente é de:", value=f"{prob_risco:.1f}%") # Métrica
-                    st.info("💭 **Recomendação:** O aluno demonstra forte engajamento e resultados sólidos. Manter acompanhamento regular.") # Info
+                previsoes = load_previsoes(model) # Cache de previsões do modelo carregado
+                do_cache = bool(previsoes.em_memoria(input_df)[0]) # Perfil já avaliado (por esta ou outra sessão)
+                with cronometro.etapa('inferencia'): # Tempo da passada única (ou da consulta ao cache)
+                    resultado = previsoes.prever(input_df).iloc[0] # Rótulo, probabilidade e faixa
+                prob_risco = resultado['PROB_RISCO']*100 # Converte probabilidade da classe de risco para porcentagem
+
+                with cronometro.etapa('renderizacao'): # Tempo de desenho do resultado
+                    renderizar_resultado(prob_risco) # Exibe o diagnóstico na tela
+                with cronometro.etapa('explicacao'): # Tempo da explicação por atributo
+                    renderizar_explicacao(previsoes, input_df) # Contribuições do caminho nas árvores
+
+                st.session_state['latencias'].registrar(cronometro) # Alimenta a janela deslizante
+                with st.expander("⏱️ Tempos de inferência (debug)"): # Painel opcional de instrumentação
+                    st.caption(f"Última previsão: {cronometro.total:.2f} ms no total, "
+                               f"{'reaproveitada do cache' if do_cache else 'calculada pelo modelo'}. Cache do servidor "
+                               f"(todas as sessões): {previsoes.reaproveitadas} de {previsoes.linhas} perfis reaproveitados.") # Origem e total
+                    st.dataframe(st.session_state['latencias'].resumo(), hide_index=True, width='stretch') # p50/p95 por etapa
 
             except Exception as e: # Captura erros durante o cálculo
                 st.error(f"Ocorreu um erro técnico ao realizar a predição: {e}") # Exibe erro técnico
         else: # Se o modelo falhou no carregamento
             st.error("📣 O modelo de predição não foi carregado corretamente.") # Alerta de erro de carregamento
 
+    if model is not None: # Simulação disponível com o modelo carregado
+        renderizar_sensibilidade(load_previsoes(model).inferencia, input_df) # Mesmo perfil do formulário
+
     st.markdown("---") # Divisor final
     st.caption("Projeto do curso de Pós Graduação de Data Analytics da FIAP.") # Crédito acadêmico
     st.caption("* PEDE analytics | Ong Passos Mágicos é um nome fictício utilizado para fins acadêmicos.") # Disclaimer
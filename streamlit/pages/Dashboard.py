@@ -3,20 +3,26 @@
 # ==========================================================================
 
 # Bibliotecas do Sistema e Utilitários
-import io            # Manipulação de fluxos de dados (entrada/saída) em memória
-import requests      # Realização de requisições HTTP para buscar arquivos externos
-import time          # Funções relacionadas a tempo e controle de execução
-import unicodedata   # Manipulação de caracteres Unicode e normalização de strings
-
-# Processamento e Manipulação de Dados
-import numpy as np   # Suporte a arrays multidimensionais e funções matemáticas
-import pandas as pd  # Manipulação e análise de dados estruturados (DataFrames)
+import logging       # Exibe no console a origem e o tempo de carga da base
+import sys           # Permite registrar a raiz do projeto no caminho de importação
+from pathlib import Path # Manipulação de caminhos independente do diretório de execução
 
 # Visualização de Dados
 import matplotlib.pyplot as plt # Criação de gráficos estáticos e customização de figuras
 import seaborn as sns           # Visualização de dados estatísticos baseada em Matplotlib
 import streamlit as st          # Framework para criação de dashboards e aplicações web
 
+# Módulos do projeto (pacote pede_analytics na raiz do repositório)
+sys.path.insert(0, str(Path(__file__).resolve().parents[2])) # Torna o pacote importável via streamlit run
+from pede_analytics.agregados import METODOS_IC, calcular_agregados, normalizar_filtro # Tabelas-resumo por filtro
+from pede_analytics.cache import CacheLRU # Cache LRU compartilhado entre sessões
+from pede_analytics.cubo import CuboPEDE # Estatísticas suficientes por célula (ANO x PEDRA x GENERO)
+from pede_analytics.dados import CAMINHO_CSV, carregar_base # Camada de dados local (Parquet tipado)
+from pede_analytics.figuras import CacheFiguras, barras_com_ic, curva_densidade # Gráficos renderizados uma vez por filtro
+
+logging.basicConfig(format="%(asctime)s %(levelname)s %(name)s: %(message)s") # Logs no console do servidor
+logging.getLogger('pede_analytics').setLevel(logging.INFO) # Origem e tempo de carga do modelo e da base
+
 # ==========================================================================
 # Config página
 # ==========================================================================
@@ -28,55 +34,42 @@ st.set_page_config( # Define as configurações globais da página web
 ) # Encerra a configuração da página
 
 # Estilo global Set2 para harmonia visual
-sns.set_theme(style="whitegrid") # Define o tema visual do Seaborn com fundo branco e grade
+TEMA_GRAFICOS = "whitegrid" # Estilo do Seaborn (faz parte da chave das figuras em cache)
+sns.set_theme(style=TEMA_GRAFICOS) # Define o tema visual do Seaborn com fundo branco e grade
 PALETA = sns.color_palette("Set2") # Cria uma paleta de cores fixa baseada no esquema Set2
+MAX_FILTROS_EM_CACHE = 32 # Combinações de filtros mantidas no cache de agregados
 
 # ==========================================================================
 # Funções de Dados (ETL)
 # ==========================================================================
 
 @st.cache_data # Decorador para armazenar os dados em cache e otimizar a performance
-def load_data(): # Inicia a definição da função de carga e limpeza
-    """Carrega dados via URL e prepara indicadores para a narrativa.""" # Docstring da função
-    url = "https://raw.githubusercontent.com/geoferreira1/fiap_tech_challenge_fase_5/main/data_processed/df_unificado.csv" # URL do dataset
-    df = pd.read_csv(url) # Lê o arquivo CSV remoto e converte em objeto DataFrame
-    
-    # Saneamento e Tipagem
-    df['IDADE'] = pd.to_numeric(df['IDADE'], errors='coerce').fillna(0).astype(int) # Converte idade para inteiro tratando erros
-    df['GENERO'] = df['GENERO'].astype(str).str.capitalize() # Padroniza gênero com a primeira letra em maiúscula
-    df['PEDRA'] = df['PEDRA'].fillna('NÃO CLASSIFICADO') # Garante preenchimento de nulos para não quebrar filtros
-    df['PONTO_VIRADA'] = df['PONTO_VIRADA'].fillna('Não Inf.') # Padroniza nulos do ponto de virada como informação inexistente
-    df['ANO'] = df['ANO'].astype(int) # Certifica que o ano é tratado como número inteiro
-    
-    return df # Retorna o DataFrame processado
+def load_data(versao_fonte): # Inicia a definição da função de carga e limpeza
+    """Carrega a base tipada da cópia Parquet local (regerada apenas quando o CSV muda).""" # Docstring da função
+    return carregar_base() # Saneamento, categorias e tipos compactos ficam na camada de dados
 
-df = load_data() # Executa a função de carga e armazena o resultado na variável df
+@st.cache_resource # Construído uma vez por versão do CSV e compartilhado entre sessões
+def load_cubo(versao_fonte): # Materializa o cubo OLAP da base
+    """Pré-calcula contagens, somas, produtos cruzados e histogramas por célula de filtros."""
+    return CuboPEDE(load_data(versao_fonte)) # Filtros viram roll-ups sobre poucas células
 
-def classificar_indicador(valor, nome_indicador, manual=None): # Função para rotular indicadores com base em regras
-    """Mapeia valores numéricos para categorias qualitativas utilizando um dicionário de regras.""" # Docstring
-    if pd.notna(manual): return manual # Retorna a marcação manual imediatamente caso ela exista
-    if pd.isna(valor): return "N/A" # Retorna "N/A" caso o valor de entrada seja nulo
-    
-    # Dicionário central contendo todas as regras de negócio do projeto Passos Mágicos
-    mapa_regras = { # Inicia a estrutura de catálogo que agrupa os critérios de todos os indicadores
-        'IAN': {10.0: 'Adequado', 5.0: 'Mod. Defasado', 0.0: 'Sev. Defasado'}, # Regras de adequação escolar
-        'IEG': {8.5: 'Alto', 6.0: 'Médio', 0.0: 'Baixo'}, # Regras de engajamento do aluno
-        'IDA': {7.5: 'Alto (>=7.5)', 5.0: 'Médio (5-7.5)', 0.0: 'Baixo (<5)'}, # Regras de desempenho acadêmico
-        'IPS': {7.5: 'Adequado', 5.0: 'Em Alerta', 0.0: 'Crítico'}, # Regras de índice psicossocial
-        'IPP': {8.0: 'Excelente', 7.0: 'Adequado', 0.0: 'Insuficiente'}, # Regras de potencial psicopedagógico
-        'IAA': {8.5: 'Alta', 6.0: 'Média', 0.0: 'Baixa'}, # Regras de autoavaliação do aluno
-        'IPV': {7.0: 'Sim', 0.0: 'Não'} # Regras para o indicador de Ponto de Virada
-    } # Finaliza o dicionário de regras
-    
-    nome_indicador = nome_indicador.upper() # Normaliza o nome do indicador para maiúsculas
-    regras = mapa_regras.get(nome_indicador) # Recupera o conjunto específico de limites solicitado
-    
-    if not regras: return "Indicador Inválido" # Retorna erro caso o nome do indicador não exista
-        
-    for limite, rotulo in regras.items(): # Percorre os limites definidos, do maior para o menor
-        if valor >= limite: return rotulo # Retorna o primeiro rótulo que satisfaça a condição
-        
-    return "N/A" # Retorna padrão caso não atinja nenhuma das faixas
+@st.cache_resource # Uma única instância por processo, compartilhada entre sessões
+def cache_agregados(): # Cache LRU dos agregados por combinação de filtros
+    """Mantém as tabelas-resumo das últimas combinações (filtros, ato) consultadas."""
+    return CacheLRU(max_itens=MAX_FILTROS_EM_CACHE * 5) # Descarta a combinação usada há mais tempo
+
+@st.cache_resource # Imagens compartilhadas entre sessões, com teto de memória
+def cache_figuras(): # Cache LRU dos gráficos renderizados
+    """Mantém os PNGs dos gráficos por (gráfico, versão da base + filtros, tema)."""
+    return CacheFiguras() # Limitado em bytes; figuras fechadas após a renderização
+
+def exibir_figura(id_grafico, chave, desenhar): # Serve o gráfico a partir do cache de imagens
+    """Exibe o PNG do gráfico; `desenhar()` só roda (e sua figura é fechada) quando a imagem não está em cache."""
+    st.image(cache_figuras().obter(id_grafico, chave, TEMA_GRAFICOS, desenhar), width='stretch') # Sem rasterizar a cada rerun
+
+versao_fonte = CAMINHO_CSV.stat().st_mtime_ns if CAMINHO_CSV.exists() else None # Muda quando o CSV é atualizado
+df = load_data(versao_fonte) # Executa a função de carga e armazena o resultado na variável df
+cubo = load_cubo(versao_fonte) # Cubo de estatísticas suficientes da mesma versão da base
 
 # ==========================================================================
 # Barra Lateral (Filtros Estratégicos)
@@ -98,71 +91,46 @@ with st.sidebar: # Inicia o bloco de componentes da barra lateral esquerda
     generos = sorted(df['GENERO'].unique()) # Obtém e ordena os gêneros únicos presentes
     gen_sel = st.multiselect("Gênero", generos, default=generos) # Cria seleção múltipla para gêneros
     
-    # Filtro dinâmico
-    df_f = df[ # Inicia a aplicação dos filtros no DataFrame principal
-        (df['ANO'].isin(ano_sel)) & # Filtra as linhas que correspondem aos anos selecionados
-        (df['PEDRA'].isin(pedra_sel if pedra_sel else df['PEDRA'].unique())) & # Filtra as pedras selecionadas
-        (df['GENERO'].isin(gen_sel)) # Filtra os gêneros selecionados
-    ].copy() # Cria uma cópia independente do DataFrame resultante
+    # Filtro dinâmico: chave canônica usada pelo cubo e pelo cache de agregados
+    filtro = normalizar_filtro(ano_sel, pedra_sel, gen_sel) # Ordem de seleção não importa
 
 # ==========================================================================
-# Dashboard - A Jornada de Transformação (Storytelling)
+# Atos narrativos (cada ato só é calculado e desenhado quando selecionado)
 # ==========================================================================
 
-st.caption("✨ PEDE Analytics | Ong Passos Mágicos <sup>1</sup>", unsafe_allow_html=True) # Exibe legenda superior estilizada
-st.title("✨ Passos Mágicos: A Jornada da Transformação") # Exibe o título principal do dashboard
-st.markdown("""
-    *Toda criança possui um talento escondido. Nossa missão é lapidar esse potencial. 
-    Abaixo, narramos como os indicadores do PEDE revelam o impacto real na vida dos nossos alunos.*
-""") # Adiciona texto de introdução do storytelling
-st.divider() # Adiciona uma linha divisória horizontal
-
-if df_f.empty: # Verifica se o resultado dos filtros é um conjunto vazio
-    st.warning("Selecione os filtros para iniciar a narrativa.") # Exibe aviso caso não existam dados selecionados
-else: # Inicia a renderização caso existam dados
-    # --- ORGANIZAÇÃO EM ATOS NARRATIVOS ---
-    ato1, ato2, ato3, ato4, ato5 = st.tabs([ # Cria as abas de navegação para os atos narrativos
-        "📍 A Chegada", 
-        "📈 O Desenvolvimento", 
-        "🧠 A Virada de Chave", 
-        "🏆 A Consolidação",
-        "🌟 Síntese final"
-    ]) # Encerra a criação das abas
-
-    # --------------------------------------------------------------------------
-    # A chegada (Q1 e Q6)
-    # --------------------------------------------------------------------------
-    with ato1: # Define o conteúdo da primeira aba
-        st.header("Identificando a Vulnerabilidade") # Cabeçalho do Ato I
-        st.write("""
-            Nossa história começa no acolhimento. O primeiro desafio é a **defasagem**. 
-            Muitos chegam com anos de atraso escolar, mas será que essa barreira é apenas acadêmica?
-        """) # Descrição do contexto narrativo do Ato I
+# --------------------------------------------------------------------------
+# A chegada (Q1 e Q6)
+# --------------------------------------------------------------------------
+def ato_chegada(agg, chave): # Ato I: acolhimento e defasagem (Q1 e Q6)
+    """Desenha o conteúdo do ato a partir das tabelas-resumo `agg`; `chave` identifica a versão e os filtros."""
+    st.header("Identificando a Vulnerabilidade") # Cabeçalho do Ato I
+    st.write("""
+        Nossa história começa no acolhimento. O primeiro desafio é a **defasagem**. 
+        Muitos chegam com anos de atraso escolar, mas será que essa barreira é apenas acadêmica?
+    """) # Descrição do contexto narrativo do Ato I
+    
+    col1, col2 = st.columns(2) # Divide a interface em duas colunas verticais
+    with col1: # Inicia a primeira coluna
+        st.subheader("1. Adequação do nível (IAN)") # Subtítulo do indicador IAN
+        st.markdown("Qual é o perfil geral de defasagem dos alunos (IAN) e como ele evolui ao longo do ano?") # Pergunta analítica
         
-        col1, col2 = st.columns(2) # Divide a interface em duas colunas verticais
-        with col1: # Inicia a primeira coluna
-            st.subheader("1. Adequação do nível (IAN)") # Subtítulo do indicador IAN
-            st.markdown("Qual é o perfil geral de defasagem dos alunos (IAN) e como ele evolui ao longo do ano?") # Pergunta analítica
-            
-            # 1. REMOVEMOS O DROPNA: Para os números baterem com o Excel, não podemos deletar linhas nulas.
-            df_ian = df_f.copy() # Cria cópia local para análise de IAN
-            
-            # Garantimos que o ANO seja tratado como texto para evitar o erro de decimais (2022.0, 2022.5)
-            df_ian['ANO'] = df_ian['ANO'].astype(str) # Converte ano para string
-
-            # 2. Aplica a função: Alunos sem nota agora viram "N/A" em vez de sumirem
-            df_ian['IAN_Descricao'] = df_ian['IAN'].apply(lambda x: classificar_indicador(x, 'IAN')) # Classifica scores
-
-            # 3. Define a ordem: Adicionei o 'N/A' para você enxergar onde estão os alunos que faltavam
-            ordem = ['Sev. Defasado', 'Mod. Defasado', 'Adequado', 'N/A'] # Define ordem categórica
-
-            # --- GRÁFICO ÚNICO ---
+        # 1. REMOVEMOS O DROPNA: Para os números baterem com o Excel, não podemos deletar linhas nulas.
+        # 2. Contagem por ano (texto) e nível: alunos sem nota aparecem como "N/A" em vez de sumirem
+        df_ian = agg['ian_por_ano'] # Tabela ANO x IAN_Descricao -> Quantidade
+
+        # 3. Define a ordem: Adicionei o 'N/A' para você enxergar onde estão os alunos que faltavam
+        ordem = ['Sev. Defasado', 'Mod. Defasado', 'Adequado', 'N/A'] # Define ordem categórica
+
+        # --- GRÁFICO ÚNICO ---
+        def desenhar(): # Desenha o gráfico (só executa quando a imagem não está em cache)
             fig, ax = plt.subplots(figsize=(8, 5)) # Cria a figura e o eixo do Matplotlib
-            
+        
             sns.histplot( # Gera o gráfico de barras empilhadas
                 data=df_ian, # Dados utilizados
                 x='ANO', # Eixo X baseado no ano
+                weights='Quantidade', # Barras a partir das contagens pré-calculadas
                 hue='IAN_Descricao', # Cores baseadas na classificação
+                hue_order=ordem, # Segue a ordem categórica (inclui N/A)
                 multiple='stack', # Empilha as categorias
                 palette='Set2', # Aplica a paleta visual
                 shrink=0.7, # Ajusta largura das barras
@@ -188,37 +156,37 @@ else: # Inicia a renderização caso existam dados
 
             # 8. FINALIZAÇÃO
             plt.tight_layout() # Ajusta automaticamente o layout da figura
-            st.pyplot(fig) # Renderiza o gráfico na aplicação Streamlit
-            
-            st.markdown("""
-                ### 🎬 O Início da Jornada
+            return fig # Figura renderizada e fechada pelo cache
+        exibir_figura('ian_por_ano', chave, desenhar) # PNG em cache por (gráfico, filtros, tema)
+        
+        st.markdown("""
+            ### 🎬 O Início da Jornada
 
-                Este gráfico revela o ponto de partida do aluno dentro do programa.
+            Este gráfico revela o ponto de partida do aluno dentro do programa.
 
-                📌 A concentração nos níveis **Severamente Defasado** e **Moderadamente Defasado** mostra o tamanho do desafio assumido pela ONG.
+            📌 A concentração nos níveis **Severamente Defasado** e **Moderadamente Defasado** mostra o tamanho do desafio assumido pela ONG.
 
-                💡 Quando observamos crescimento na categoria **Adequado** ao longo dos anos, temos evidência concreta de transformação educacional.
+            💡 Quando observamos crescimento na categoria **Adequado** ao longo dos anos, temos evidência concreta de transformação educacional.
 
-                🎯 Estratégia: quanto maior a vulnerabilidade inicial, maior deve ser a intensidade do reforço pedagógico nas fases iniciais da jornada.
-            """)
-        with col2: # Inicia a segunda coluna
-            st.subheader("6. Aspectos psicopedagógicos (IPP)") # Subtítulo do indicador IPP
-            st.markdown("As avaliações psicopedagógicas (IPP) confirmam ou contradizem a defasagem identificada pelo IAN?") # Pergunta analítica
+            🎯 Estratégia: quanto maior a vulnerabilidade inicial, maior deve ser a intensidade do reforço pedagógico nas fases iniciais da jornada.
+        """)
+    with col2: # Inicia a segunda coluna
+        st.subheader("6. Aspectos psicopedagógicos (IPP)") # Subtítulo do indicador IPP
+        st.markdown("As avaliações psicopedagógicas (IPP) confirmam ou contradizem a defasagem identificada pelo IAN?") # Pergunta analítica
 
-            # 1. Preparação: Filtramos e classificamos
-            df_ipp = df_f.dropna(subset=['IPP', 'IAN']).copy() # Remove nulos apenas para análise de médias
-            df_ipp['IAN_Descricao'] = df_ipp['IAN'].apply(lambda x: classificar_indicador(x, 'IAN')) # Categoriza conforme IAN
-            ordem_ian = ['Sev. Defasado', 'Mod. Defasado', 'Adequado'] # Define ordem do eixo X
+        # 1. Preparação: médias de IPP por nível de IAN (sem nulos) vêm do cache de agregados
+        ordem_ian = ['Sev. Defasado', 'Mod. Defasado', 'Adequado'] # Define ordem do eixo X
 
-            # 2. Criação da Figura (Média do IPP por Nível de IAN)
+        # 2. Criação da Figura (Média do IPP por Nível de IAN)
+        def desenhar(): # Desenha o gráfico (só executa quando a imagem não está em cache)
             fig, ax = plt.subplots(figsize=(8, 5)) # Inicia figura de barras
-            
-            # Cálculo da média para o gráfico de barras
-            ipp_por_ian = df_ipp.groupby('IAN_Descricao')['IPP'].mean().reindex(ordem_ian).reset_index() # Calcula médias agrupadas
-            
+        
+            # Média para o gráfico de barras
+            ipp_por_ian = agg['ipp_por_ian'] # Médias agrupadas por nível de IAN
+        
             # 3. Gráfico de Barras (Opção 2 do seu material)
-            sns.barplot(data=ipp_por_ian, x='IAN_Descricao', y='IPP', palette='Set2', ax=ax) # Gera barras de médias
-            
+            sns.barplot(data=ipp_por_ian, x='IAN_Descricao', y='IPP', order=ordem_ian, palette='Set2', ax=ax) # Gera barras de médias
+        
             # Remove grades e contornos conforme seu padrão
             ax.grid(False) # Desativa grade visual
             for patch in ax.patches: # Itera sobre as barras
@@ -232,47 +200,51 @@ else: # Inicia a renderização caso existam dados
             ax.set_title('Média do IPP por Nível de IAN', fontsize=14, fontweight='bold') # Define título
             ax.set_xlabel('Nível de Adequação Escolar (IAN)') # Rótulo X
             ax.set_ylabel('Média do IPP') # Rótulo Y
-            
+        
             plt.tight_layout() # Ajusta layout final
-            st.pyplot(fig) # Renderiza no Streamlit
-            
-            st.markdown("""
-                ### 🧠 Potencial Além da Defasagem
+            return fig # Figura renderizada e fechada pelo cache
+        exibir_figura('ipp_por_ian', chave, desenhar) # PNG em cache por (gráfico, filtros, tema)
+        
+        st.markdown("""
+            ### 🧠 Potencial Além da Defasagem
 
-                Mesmo alunos com defasagem podem apresentar alto potencial psicopedagógico.
+            Mesmo alunos com defasagem podem apresentar alto potencial psicopedagógico.
 
-                Isso significa que o problema não é incapacidade — é falta de oportunidade estruturada.
+            Isso significa que o problema não é incapacidade — é falta de oportunidade estruturada.
 
-                🎯 Estratégia: investir no desenvolvimento emocional e cognitivo pode acelerar a recuperação acadêmica.
-            """)
-    # --------------------------------------------------------------------------
-    # O DESENVOLVIMENTO (Q2, Q3 E Q4)
-    # --------------------------------------------------------------------------
-    with ato2: # Define o bloco de conteúdo da segunda aba
-        st.header("Lapidando o Conhecimento") # Cabeçalho do Ato II
-        st.write("""
-            Com o apoio da ONG, o aluno começa a evoluir. Monitoramos não apenas as notas (IDA), 
-            mas o brilho nos olhos: o **Engajamento**.
-        """) # Descrição do contexto do Ato II
-        
+            🎯 Estratégia: investir no desenvolvimento emocional e cognitivo pode acelerar a recuperação acadêmica.
+        """)
+
+
+# --------------------------------------------------------------------------
+# O DESENVOLVIMENTO (Q2, Q3 E Q4)
+# --------------------------------------------------------------------------
+def ato_desenvolvimento(agg, chave): # Ato II: desempenho, engajamento e autoavaliação (Q2, Q3 e Q4)
+    """Desenha o conteúdo do ato a partir das tabelas-resumo `agg`; `chave` identifica a versão e os filtros."""
+    st.header("Lapidando o Conhecimento") # Cabeçalho do Ato II
+    st.write("""
+        Com o apoio da ONG, o aluno começa a evoluir. Monitoramos não apenas as notas (IDA), 
+        mas o brilho nos olhos: o **Engajamento**.
+    """) # Descrição do contexto do Ato II
+    
     # --- PERGUNTA 2: IDA POR FASE E ANO ---
-        st.subheader("2. Desempenho acadêmico (IDA)") # Título da Pergunta 2
-        st.markdown("O desempenho acadêmico médio (IDA) está melhorando, estagnado ou caindo ao longo das fases e anos?") # Pergunta analítica
-        
-        # 1. Preparação dos dados
-        df_ida = df_f.dropna(subset=['IDA']).copy() # Filtra apenas alunos com nota IDA registrada
-        df_ida['ANO'] = df_ida['ANO'].astype(str) # Padroniza ano como texto
-        
-        # 2. Classificação
-        df_ida['IDA_Categoria'] = df_ida['IDA'].apply(lambda x: classificar_indicador(x, 'IDA')) # Classifica scores IDA
-        ordem_ida = ['Baixo (<5)', 'Médio (5-7.5)', 'Alto (>=7.5)'] # Define categorias ordinais
+    st.subheader("2. Desempenho acadêmico (IDA)") # Título da Pergunta 2
+    st.markdown("O desempenho acadêmico médio (IDA) está melhorando, estagnado ou caindo ao longo das fases e anos?") # Pergunta analítica
+    
+    # 1. Preparação dos dados: contagem por ano e faixa de IDA (apenas alunos com nota)
+    df_ida = agg['ida_por_ano'] # Tabela ANO x IDA_Categoria -> Quantidade
+    
+    # 2. Classificação
+    ordem_ida = ['Baixo (<5)', 'Médio (5-7.5)', 'Alto (>=7.5)'] # Define categorias ordinais
 
-        # 3. Execução do Gráfico
+    # 3. Execução do Gráfico
+    def desenhar(): # Desenha o gráfico (só executa quando a imagem não está em cache)
         fig, ax = plt.subplots(figsize=(12, 5)) # Cria moldura larga para distribuição
-        
+    
         sns.histplot( # Gera o histograma de desempenho
             data=df_ida, # Dados filtrados
             x='ANO', # Eixo X temporal
+            weights='Quantidade', # Barras a partir das contagens pré-calculadas
             hue='IDA_Categoria', # Cores por nível
             hue_order=ordem_ida, # Segue ordem de categorias
             multiple='stack', # Empilha barras
@@ -282,130 +254,133 @@ else: # Inicia a renderização caso existam dados
             discrete=True, # Eixo X discreto
             ax=ax # Vincula ao eixo
         ) # Encerra plot
-        
+    
         # 4. Rótulos de dados
         for container in ax.containers: # Itera containers
             ax.bar_label(container, label_type='center', fontsize=10, fontweight='bold') # Insere contagens
-        
+    
         # 5. Personalização
         ax.set_title('Distribuição de Alunos por Nível de IDA', fontsize=14, fontweight='bold') # Define título
         ax.set_xlabel('Ano Letivo') # Rótulo X
         ax.set_ylabel('Quantidade de Alunos') # Rótulo Y
         ax.grid(False) # Mantém o fundo limpo
-        
+    
         # Legenda externa para não poluir
         sns.move_legend(ax, "upper left", bbox_to_anchor=(1, 1), title='Nível IDA') # Move legenda
-        
+    
         plt.tight_layout() # Ajusta layout
-        st.pyplot(fig) # Renderiza no Streamlit
-        
-        st.markdown("""
-        ### 📈 Crescimento Mensurável
+        return fig # Figura renderizada e fechada pelo cache
+    exibir_figura('ida_por_ano', chave, desenhar) # PNG em cache por (gráfico, filtros, tema)
+    
+    st.markdown("""
+    ### 📈 Crescimento Mensurável
 
-        Aqui avaliamos se o esforço virou resultado concreto.
+    Aqui avaliamos se o esforço virou resultado concreto.
 
-        O aumento da categoria **Alto (>=7.5)** ao longo dos anos indica que a metodologia aplicada está funcionando.
+    O aumento da categoria **Alto (>=7.5)** ao longo dos anos indica que a metodologia aplicada está funcionando.
 
-        📌 Se houver concentração persistente na faixa "Baixo", isso sinaliza necessidade de intervenção direcionada.
+    📌 Se houver concentração persistente na faixa "Baixo", isso sinaliza necessidade de intervenção direcionada.
 
-        🎯 Estratégia: identificar quais práticas pedagógicas foram aplicadas nos ciclos de melhor desempenho e replicá-las.
-        """)
+    🎯 Estratégia: identificar quais práticas pedagógicas foram aplicadas nos ciclos de melhor desempenho e replicá-las.
+    """)
 
-        st.divider() # Linha de separação
+    st.divider() # Linha de separação
 
-        col3, col4 = st.columns(2) # Divide em duas colunas para engajamento e autoavaliação
+    col3, col4 = st.columns(2) # Divide em duas colunas para engajamento e autoavaliação
+    
+    with col3: # Terceira coluna
+        # --- PERGUNTA 3: ENGAJAMENTO (APENAS SIM E NÃO) ---
+        st.subheader("3. Engajamento nas atividades (IEG)") # Título da Pergunta 3
+        st.markdown("O grau de engajamento dos alunos (IEG) tem relação direta com seus indicadores de desempenho (IDA) e do ponto de virada (IPV)?") # Pergunta analítica
+        
+        # Filtro rigoroso para exibir apenas Sim e Não (removemos 'Não Inf.' e nulos)
+        ieg_pv_media = agg['ieg_por_pv'] # Média de IEG por virada (Sim/Não)
         
-        with col3: # Terceira coluna
-            # --- PERGUNTA 3: ENGAJAMENTO (APENAS SIM E NÃO) ---
-            st.subheader("3. Engajamento nas atividades (IEG)") # Título da Pergunta 3
-            st.markdown("O grau de engajamento dos alunos (IEG) tem relação direta com seus indicadores de desempenho (IDA) e do ponto de virada (IPV)?") # Pergunta analítica
-            
-            # Filtro rigoroso para exibir apenas Sim e Não (removemos 'Não Inf.' e nulos)
-            df_pv = df_f[df_f['PONTO_VIRADA'].isin(['Sim', 'Não'])].dropna(subset=['IEG']).copy() # Filtra sim/não
-            ieg_pv_media = df_pv.groupby('PONTO_VIRADA')['IEG'].mean().reindex(['Não', 'Sim']).reset_index() # Média por virada
-            
+        def desenhar(): # Desenha o gráfico (só executa quando a imagem não está em cache)
             fig, ax = plt.subplots(figsize=(8, 6)) # Cria figura de comparação
-            ax_bar = sns.barplot(data=ieg_pv_media, x='PONTO_VIRADA', y='IEG', palette='Set2', ax=ax) # Plot de barras comparativo
-            
+            ax_bar = sns.barplot(data=ieg_pv_media, x='PONTO_VIRADA', y='IEG', order=['Não', 'Sim'], palette='Set2', ax=ax) # Plot de barras comparativo
+        
             # Rótulos nas barras
             for container in ax_bar.containers: # Itera containers
                 ax_bar.bar_label(container, fmt='%.2f', padding=3, fontweight='bold') # Rótulos das médias
-            
+        
             ax.set_title('Média de Engajamento: Sim vs Não', fontweight='bold') # Título gráfico
             ax.set_xlabel('Atingiu Ponto de Virada?') # Rótulo X
             ax.set_ylabel('Média do IEG') # Rótulo Y
             ax.grid(False) # Remove grade
-            
+        
             for patch in ax_bar.patches: # Itera barras individuais
                 patch.set_edgecolor('none') # Remove contornos
-            
-            st.pyplot(fig) # Renderiza
+        
+            return fig # Figura renderizada e fechada pelo cache
+        exibir_figura('ieg_por_pv', chave, desenhar) # PNG em cache por (gráfico, filtros, tema)
 
-            st.markdown("""
-            ### 🚀 O Motor da Transformação
+        st.markdown("""
+        ### 🚀 O Motor da Transformação
 
-            Alunos que atingem o ponto de virada apresentam engajamento significativamente maior.
+        Alunos que atingem o ponto de virada apresentam engajamento significativamente maior.
 
-            Isso reforça que o sucesso acadêmico começa na atitude, não apenas na técnica.
+        Isso reforça que o sucesso acadêmico começa na atitude, não apenas na técnica.
 
-            🎯 Estratégia: programas de mentoria e incentivo comportamental são fundamentais para acelerar a virada.
-            """)
+        🎯 Estratégia: programas de mentoria e incentivo comportamental são fundamentais para acelerar a virada.
+        """)
 
-        with col4: # Quarta coluna
-            # --- PERGUNTA 4: AUTOAVALIAÇÃO VS REALIDADE ---
-            st.subheader("4. Autoavaliação (IAA)") # Título da Pergunta 4
-            st.markdown("As percepções dos alunos sobre si mesmos (IAA) são coerentes com seu desempenho real (IDA) e engajamento (IEG)?") # Pergunta analítica
-            
+    with col4: # Quarta coluna
+        # --- PERGUNTA 4: AUTOAVALIAÇÃO VS REALIDADE ---
+        st.subheader("4. Autoavaliação (IAA)") # Título da Pergunta 4
+        st.markdown("As percepções dos alunos sobre si mesmos (IAA) são coerentes com seu desempenho real (IDA) e engajamento (IEG)?") # Pergunta analítica
+        
+        def desenhar(): # Desenha o gráfico (só executa quando a imagem não está em cache)
             fig, ax = plt.subplots(figsize=(8, 6)) # Cria figura para análise de densidade
-            sns.kdeplot(df_f['IAA'], label='Autoavaliação (IAA)', fill=True, color=PALETA[0], ax=ax) # Curva de densidade subjetiva
-            sns.kdeplot(df_f['IDA'], label='Nota Real (IDA)', fill=True, color=PALETA[1], ax=ax) # Curva de densidade objetiva
-            
+            curva_densidade(ax, agg['iaa'], PALETA[0], 'Autoavaliação (IAA)') # Curva de densidade subjetiva (pré-calculada no cubo)
+            curva_densidade(ax, agg['ida'], PALETA[1], 'Nota Real (IDA)') # Curva de densidade objetiva
+        
             ax.grid(False) # Remove linhas de fundo
             ax.set_title("Subjetivo (IAA) vs Objetivo (IDA)", fontweight='bold') # Título gráfico
             ax.set_xlabel("Nota") # Rótulo X
             ax.set_ylabel("Densidade") # Rótulo Y
             ax.legend() # Ativa legenda explicativa
-            
-            st.pyplot(fig) # Renderiza no Streamlit
+        
+            return fig # Figura renderizada e fechada pelo cache
+        exibir_figura('iaa_vs_ida', chave, desenhar) # PNG em cache por (gráfico, filtros, tema)
 
-            st.markdown("""
-            ### 🧠 Percepção vs Realidade
+        st.markdown("""
+        ### 🧠 Percepção vs Realidade
 
-            Quando a autoavaliação (IAA) está alinhada com a nota real (IDA), temos maturidade emocional.
+        Quando a autoavaliação (IAA) está alinhada com a nota real (IDA), temos maturidade emocional.
 
-            📌 Desalinhamentos indicam:
-            - IAA maior que IDA → excesso de confiança
-            - IAA menor que IDA → baixa autoestima
+        📌 Desalinhamentos indicam:
+        - IAA maior que IDA → excesso de confiança
+        - IAA menor que IDA → baixa autoestima
 
-            🎯 Estratégia: trabalhar inteligência emocional para alinhar percepção e desempenho.
-            """)
+        🎯 Estratégia: trabalhar inteligência emocional para alinhar percepção e desempenho.
+        """)
 
-    # --------------------------------------------------------------------------
-    # O PONTO DE VIRADA (Q5 e Q7)
-    # --------------------------------------------------------------------------
-    with ato3: # Define o bloco de conteúdo da terceira aba
-        st.header("O Ponto de Virada") # Cabeçalho do Ato III
-        st.write("""
-            Chegamos ao momento mais crítico: a mudança de mentalidade. 
-            O apoio **psicossocial** é o que garante que o aluno não desista no meio do caminho.
-        """) # Descrição do contexto do Ato III
-        
-        col5, col6 = st.columns(2) # Divide em colunas para IPS e Correlação
-        with col5: # Quinta coluna
-            st.subheader("5. Aspectos psicossociais (IPS)") # Título da Pergunta 5
-            st.markdown("Há padrões psicossociais (IPS) que antecedem quedas de desempenho acadêmico ou de engajamento?") # Pergunta analítica
-            df_ips = df_f.dropna(subset=['IPS', 'IDA', 'IEG']).copy() # Filtra dados psicossociais válidos
-
-            # 2. Aplica a função para criar a coluna de descrição
-            df_ips['ANO'] = df_ips['ANO'].astype(str) # Converte ano para texto
-            df_ips['IPS_Nivel'] = df_ips['IPS'].apply(lambda x: classificar_indicador(x, 'IPS')) # Classifica níveis IPS
-            ordem_ips = ['Crítico', 'Em Alerta', 'Adequado'] # Define escala qualitativa
-
-            # 3. Início da Figura
+
+# --------------------------------------------------------------------------
+# O PONTO DE VIRADA (Q5 e Q7)
+# --------------------------------------------------------------------------
+def ato_virada(agg, chave): # Ato III: aspectos psicossociais e ponto de virada (Q5 e Q7)
+    """Desenha o conteúdo do ato a partir das tabelas-resumo `agg`; `chave` identifica a versão e os filtros."""
+    st.header("O Ponto de Virada") # Cabeçalho do Ato III
+    st.write("""
+        Chegamos ao momento mais crítico: a mudança de mentalidade. 
+        O apoio **psicossocial** é o que garante que o aluno não desista no meio do caminho.
+    """) # Descrição do contexto do Ato III
+    
+    col5, col6 = st.columns(2) # Divide em colunas para IPS e Correlação
+    with col5: # Quinta coluna
+        st.subheader("5. Aspectos psicossociais (IPS)") # Título da Pergunta 5
+        st.markdown("Há padrões psicossociais (IPS) que antecedem quedas de desempenho acadêmico ou de engajamento?") # Pergunta analítica
+        df_ips = agg['ips_por_ano'] # Contagem por ano e nível IPS (dados psicossociais válidos)
+        ordem_ips = ['Crítico', 'Em Alerta', 'Adequado'] # Define escala qualitativa
+
+        # 3. Início da Figura
+        def desenhar(): # Desenha o gráfico (só executa quando a imagem não está em cache)
             fig, ax = plt.subplots(figsize=(8, 6)) # Inicia figura
 
             # --- GRÁFICO 1: DISTRIBUIÇÃO CATEGÓRICA (Histplot) ---
-            ax = sns.histplot(data=df_ips, x='ANO', hue='IPS_Nivel', hue_order=ordem_ips,
+            ax = sns.histplot(data=df_ips, x='ANO', weights='Quantidade', hue='IPS_Nivel', hue_order=ordem_ips,
                               multiple='stack', palette='Set2', shrink=0.7, linewidth=0,
                               discrete=True, stat='percent', common_norm=False, ax=ax) # Plota distribuição percentual
             for container in ax.containers: # Itera containers
@@ -414,29 +389,30 @@ else: # Inicia a renderização caso existam dados
             ax.set_xlabel('Ano Letivo') # Rótulo X
             ax.set_ylabel('Percentual de Alunos (%)') # Rótulo Y
             ax.grid(False) # Remove grade
-            st.pyplot(fig) # Renderiza
+            return fig # Figura renderizada e fechada pelo cache
+        exibir_figura('ips_por_ano', chave, desenhar) # PNG em cache por (gráfico, filtros, tema)
 
-            st.markdown("""
-            ### ⚠️ O Pilar Invisível da Jornada
+        st.markdown("""
+        ### ⚠️ O Pilar Invisível da Jornada
 
-            Sem estabilidade emocional, o aprendizado não se sustenta.
+        Sem estabilidade emocional, o aprendizado não se sustenta.
 
-            A redução do percentual na categoria **Crítico** ao longo do tempo é um indicador silencioso de sucesso estrutural.
+        A redução do percentual na categoria **Crítico** ao longo do tempo é um indicador silencioso de sucesso estrutural.
 
-            🎯 Estratégia: fortalecer acompanhamento psicossocial nos ciclos iniciais.
-            """)
+        🎯 Estratégia: fortalecer acompanhamento psicossocial nos ciclos iniciais.
+        """)
 
-        with col6: # Sexta coluna
-            st.subheader("7. Ponto de virada (IPV)") # Título da Pergunta 7
-            st.markdown("Quais comportamentos - acadêmicos, emocionais ou de engajamento - mais influenciam o IPV ao longo do tempo?") # Pergunta analítica
-            
-            # 1. Preparação: Cálculo da correlação
-            colunas_analise = ['IDA', 'IEG', 'IPS', 'IAA', 'IPP', 'IPV'] # Seleciona métricas numéricas
-            correl_pv = df_f[colunas_analise].corrwith(df_f['INDE']).sort_values(ascending=False) # Calcula correlação com INDE
-            
-            # 2. Execução do Gráfico
+    with col6: # Sexta coluna
+        st.subheader("7. Ponto de virada (IPV)") # Título da Pergunta 7
+        st.markdown("Quais comportamentos - acadêmicos, emocionais ou de engajamento - mais influenciam o IPV ao longo do tempo?") # Pergunta analítica
+        
+        # 1. Preparação: correlação de IDA, IEG, IPS, IAA, IPP e IPV com o INDE
+        correl_pv = agg['correl_pv'] # Correlações ordenadas
+        
+        # 2. Execução do Gráfico
+        def desenhar(): # Desenha o gráfico (só executa quando a imagem não está em cache)
             fig, ax = plt.subplots(figsize=(7.6, 6)) # Figura para barras de força
-            
+        
             # Criamos o gráfico de barras horizontais usando a paleta Set2
             sns.barplot(
                 x=correl_pv.values, # Valores da correlação
@@ -446,16 +422,16 @@ else: # Inicia a renderização caso existam dados
                 ax=ax, # Vincula ao eixo
                 legend=False # Oculta legenda redundante
             ) # Encerra plot
-            
+        
             # 3. Rótulos de dados
             for i, v in enumerate(correl_pv.values): # Itera sobre valores
                 ax.text(v + 0.02, i, f'{v:.2f}', va='center', fontweight='bold', fontsize=10) # Rótulos de força lateral
-            
+        
             # 4. Personalização
             ax.set_title("Drivers do Sucesso (Correlação com INDE)", fontsize=14, fontweight='bold') # Título gráfico
             ax.set_xlabel("Força da Correlação") # Rótulo X
             ax.set_ylabel("Indicadores") # Rótulo Y
-            
+        
             # Remove grades e bordas das barras
             ax.grid(False) # Remove grade
             for patch in ax.patches: # Itera barras
@@ -465,55 +441,45 @@ else: # Inicia a renderização caso existam dados
             ax.set_xlim(0, 1.1) # Define escala do eixo X
 
             plt.tight_layout() # Ajusta layout
-            st.pyplot(fig) # Renderiza no Streamlit
+            return fig # Figura renderizada e fechada pelo cache
+        exibir_figura('correl_pv', chave, desenhar) # PNG em cache por (gráfico, filtros, tema)
 
-            st.markdown("""
-            ### 🏆 O Que Realmente Move o Sucesso
+        st.markdown("""
+        ### 🏆 O Que Realmente Move o Sucesso
 
-            Este gráfico revela quais indicadores possuem maior influência sobre o INDE.
+        Este gráfico revela quais indicadores possuem maior influência sobre o INDE.
 
-            Quanto maior a correlação, maior o impacto estratégico daquele indicador no resultado final.
+        Quanto maior a correlação, maior o impacto estratégico daquele indicador no resultado final.
 
-            🎯 Estratégia: priorizar investimentos e esforços nos pilares com maior força de correlação.
-            """)
+        🎯 Estratégia: priorizar investimentos e esforços nos pilares com maior força de correlação.
+        """)
 
-    # --------------------------------------------------------------------------
-    # O IMPACTO REAL (Q8 e Q10)
-    # --------------------------------------------------------------------------
-    with ato4: # Define o conteúdo da quarta aba
-        st.header("Colhendo Frutos") # Cabeçalho do Ato IV
-        st.write("""
-            Ao final do ciclo, provamos que o sucesso é **multidimensional**. 
-            Não é apenas uma nota, é a união de mente, atitude e esforço.
-        """) # Descrição do contexto do Ato IV
-        
-        col7, col8 = st.columns(2) # Cria colunas finais de performance e evolução
-        with col7: # Sétima coluna
-            st.subheader("8. Multidimensionalidade dos indicadores") # Título da Pergunta 8
-            st.markdown("Quais combinações de indicadores (IDA + IEG + IPS + IPP) melhor explicam o desempenho global do aluno (INDE)?") # Pergunta analítica
-
-            # 1. Preparação dos dados
-            indicadores = ['IDA', 'IEG', 'IPS', 'IPP'] # Define pilares
-            df_8 = df_f.dropna(subset=indicadores + ['INDE']).copy() # Filtra nulos essenciais
-
-            if df_8.empty: # Caso não existam dados
-                st.warning("Dados insuficientes para gerar a análise de combinações com os filtros atuais.") # Exibe aviso
-            else: # Caso existam dados
-                # Calculamos a média do grupo geral
-                media_geral = df_8[indicadores].mean().to_frame().reset_index() # Média geral
-                media_geral.columns = ['Indicador', 'Nota'] # Renomeia colunas
-                media_geral['Grupo'] = 'Média Geral' # Identifica grupo
-
-                # Calculamos a média dos alunos que estão no Top 20% do INDE (Elite)
-                threshold = df_8['INDE'].quantile(0.8) # Define nota de corte dos melhores
-                media_elite = df_8[df_8['INDE'] >= threshold][indicadores].mean().to_frame().reset_index() # Média elite
-                media_elite.columns = ['Indicador', 'Nota'] # Renomeia colunas
-                media_elite['Grupo'] = 'Alunos Alta Performance (Top 20%)' # Identifica elite
-
-                # Unimos os dois para comparação
-                df_plot_8 = pd.concat([media_geral, media_elite]) # Concatena para gráfico
-
-                # 2. Criação da Figura
+
+# --------------------------------------------------------------------------
+# O IMPACTO REAL (Q8 e Q10)
+# --------------------------------------------------------------------------
+def ato_consolidacao(agg, chave): # Ato IV: perfil da elite e efetividade por pedra (Q8 e Q10)
+    """Desenha o conteúdo do ato a partir das tabelas-resumo `agg`; `chave` identifica a versão e os filtros."""
+    st.header("Colhendo Frutos") # Cabeçalho do Ato IV
+    st.write("""
+        Ao final do ciclo, provamos que o sucesso é **multidimensional**. 
+        Não é apenas uma nota, é a união de mente, atitude e esforço.
+    """) # Descrição do contexto do Ato IV
+    
+    col7, col8 = st.columns(2) # Cria colunas finais de performance e evolução
+    with col7: # Sétima coluna
+        st.subheader("8. Multidimensionalidade dos indicadores") # Título da Pergunta 8
+        st.markdown("Quais combinações de indicadores (IDA + IEG + IPS + IPP) melhor explicam o desempenho global do aluno (INDE)?") # Pergunta analítica
+
+        # 1. Preparação dos dados: médias de IDA, IEG, IPS e IPP da média geral e do Top 20% do INDE
+        df_plot_8 = agg['perfil_elite'] # None quando não há alunos com todos os pilares
+
+        if df_plot_8 is None: # Caso não existam dados
+            st.warning("Dados insuficientes para gerar a análise de combinações com os filtros atuais.") # Exibe aviso
+        else: # Caso existam dados
+
+            # 2. Criação da Figura
+            def desenhar(): # Desenha o gráfico (só executa quando a imagem não está em cache)
                 fig, ax = plt.subplots(figsize=(10, 6)) # Inicia figura
 
                 # Gráfico de barras comparativo
@@ -545,42 +511,39 @@ else: # Inicia a renderização caso existam dados
 
                 plt.tight_layout() # Ajusta layout
 
-                # COMANDO CRÍTICO: Exibe no Streamlit
-                st.pyplot(fig) # Renderiza
-
-                st.markdown("""
-                ### 🌟 O DNA da Alta Performance
+                return fig # Figura renderizada e fechada pelo cache
+            exibir_figura('perfil_elite', chave, desenhar) # PNG em cache por (gráfico, filtros, tema)
 
-                Comparar a média geral com os alunos Top 20% revela o diferencial competitivo.
+            st.markdown("""
+            ### 🌟 O DNA da Alta Performance
 
-                Os maiores saltos geralmente aparecem em:
-                - Engajamento (IEG)
-                - Desempenho Acadêmico (IDA)
+            Comparar a média geral com os alunos Top 20% revela o diferencial competitivo.
 
-                🎯 Estratégia: mapear práticas e comportamentos da elite para replicar nos demais alunos.
-                """)
-    
+            Os maiores saltos geralmente aparecem em:
+            - Engajamento (IEG)
+            - Desempenho Acadêmico (IDA)
 
-        with col8: # Oitava coluna
-            st.subheader("10. Efetividade do programa") # Título da Pergunta 10
-            st.markdown("Os indicadores mostram melhora consistente ao longo do ciclo nas diferentes fases (Quartzo, Ágata, Ametista e Topázio), confirmando o impacto real do programa?") # Pergunta analítica
+            🎯 Estratégia: mapear práticas e comportamentos da elite para replicar nos demais alunos.
+            """)
 
-            # 1. Preparação: Médias por Pedra
-            indicadores_pedras = ['INDE', 'IDA', 'IEG', 'IPS', 'IPP'] # Métricas para jornada
-            ordem_pedras = ['QUARTZO', 'AGATA', 'AMETISTA', 'TOPAZIO'] # Jornada evolutiva
 
-            df_pedras = df_f.groupby('PEDRA')[indicadores_pedras].mean().reindex(ordem_pedras).reset_index() # Agrupa médias
+    with col8: # Oitava coluna
+        st.subheader("10. Efetividade do programa") # Título da Pergunta 10
+        st.markdown("Os indicadores mostram melhora consistente ao longo do ciclo nas diferentes fases (Quartzo, Ágata, Ametista e Topázio), confirmando o impacto real do programa?") # Pergunta analítica
 
-            # Transformamos para o formato longo para o Seaborn
-            df_plot_10 = df_pedras.melt(id_vars='PEDRA', var_name='Indicador', value_name='Média') # Transpõe dados
+        # 1. Preparação: Médias de INDE, IDA, IEG, IPS e IPP por Pedra (formato longo para o Seaborn)
+        ordem_pedras = ['QUARTZO', 'AGATA', 'AMETISTA', 'TOPAZIO'] # Jornada evolutiva
+        df_plot_10 = agg['medias_pedra'] # Médias transpostas
 
-            # 2. Execução do Gráfico (Barras Agrupadas)
+        # 2. Execução do Gráfico (Barras Agrupadas)
+        def desenhar(): # Desenha o gráfico (só executa quando a imagem não está em cache)
             fig, ax = plt.subplots(figsize=(10, 6)) # Inicia figura final
 
             sns.barplot(
                 data=df_plot_10, # Dados transpostos
                 x='PEDRA', # Eixo X por estágio
                 y='Média', # Nota média Y
+                order=ordem_pedras, # Apenas as quatro pedras, na ordem da jornada
                 hue='Indicador', # Cores por métrica
                 palette='Set2', # Aplica paleta
                 ax=ax # Vincula eixo
@@ -605,57 +568,50 @@ else: # Inicia a renderização caso existam dados
                 patch.set_edgecolor('none') # Suaviza barras
 
             plt.tight_layout() # Ajusta layout
-            st.pyplot(fig) # Renderiza no Streamlit
+            return fig # Figura renderizada e fechada pelo cache
+        exibir_figura('medias_pedra', chave, desenhar) # PNG em cache por (gráfico, filtros, tema)
 
-            st.markdown("""
-            ### 📈 A Jornada Estruturada Funciona
+        st.markdown("""
+        ### 📈 A Jornada Estruturada Funciona
 
-            Cada Pedra representa um estágio de desenvolvimento.
+        Cada Pedra representa um estágio de desenvolvimento.
 
-            A progressão consistente dos indicadores valida a metodologia da ONG como estruturada e escalável.
+        A progressão consistente dos indicadores valida a metodologia da ONG como estruturada e escalável.
 
-            🎯 Estratégia: utilizar essa evidência para captação de recursos e fortalecimento institucional.
-            """)
+        🎯 Estratégia: utilizar essa evidência para captação de recursos e fortalecimento institucional.
+        """)
 
 
-    # --------------------------------------------------------------------------
-    # Síntese Final
-    # --------------------------------------------------------------------------
-    with ato5:# Define o conteúdo da quinta aba (Síntese Final)
-        st.header("Insights Adicionais e Síntese Final")# Cabeçalho principal da seção
-        st.write("""
-        A seguir vemos alguns insights adicionais para além dos indicadores propostos, bem como a síntese final passando por todos os pontos que foram abordados nas análises.
-        """)# Texto introdutório para contextualizar a síntese
-
-        col9, col10 = st.columns(2) # Cria colunas finais de performance e evolução
-        with col9: # Nona coluna
-
-            # ================================================================
-            # 1. PREPARAÇÃO DOS DADOS
-            # ================================================================
-            # Define a lista de indicadores para a análise de correlação final
-            indicadores = ['IDA', 'IEG', 'IAA', 'IPS', 'IPP', 'IPV']
-            # Define a ordem hierárquica das pedras para ordenação dos dados
-            ordem_pedras = ['QUARTZO', 'AGATA', 'AMETISTA', 'TOPAZIO']
-
-            # Cria uma cópia limpa do DataFrame filtrado, removendo nulos em colunas críticas
-            df_ins = df_f.dropna(subset=indicadores + ['PEDRA', 'ANO']).copy()
-
-            # ================================================================
-            # 2. PROCESSAMENTO DOS INSIGHTS
-            # ================================================================
-            # Calcula a correlação de Pearson entre os indicadores e o INDE (Nota Global)
-            correl_inde = df_ins[indicadores + ['INDE']].corr()['INDE'].drop(['INDE']).sort_values(ascending=False)
-
-            # Calcula a diferença entre Potencial (IPP) e Desempenho (IDA) para medir o "Gap de Oportunidade"
-            df_ins['Gap_Potencial'] = df_ins['IPP'] - df_ins['IDA']
-            # Agrupa a média desse gap por Pedra para entender a evolução do aproveitamento
-            gap_potencial = df_ins.groupby('PEDRA')['Gap_Potencial'].mean().reindex(ordem_pedras).reset_index()
-
-            # ================================================================
-            # 3. CRIAÇÃO DOS GRÁFICOS
-            # ================================================================
-            # Inicializa a figura Matplotlib para o primeiro gráfico de síntese
+# --------------------------------------------------------------------------
+# Síntese Final
+# --------------------------------------------------------------------------
+def ato_sintese(agg, chave): # Ato V: insights adicionais e síntese final
+    """Desenha o conteúdo do ato a partir das tabelas-resumo `agg`; `chave` identifica a versão e os filtros."""
+    st.header("Insights Adicionais e Síntese Final")# Cabeçalho principal da seção
+    st.write("""
+    A seguir vemos alguns insights adicionais para além dos indicadores propostos, bem como a síntese final passando por todos os pontos que foram abordados nas análises.
+    """)# Texto introdutório para contextualizar a síntese
+
+    col9, col10 = st.columns(2) # Cria colunas finais de performance e evolução
+    with col9: # Nona coluna
+
+        # ================================================================
+        # 1. PREPARAÇÃO DOS DADOS
+        # ================================================================
+        # Define a ordem hierárquica das pedras para ordenação dos dados
+        ordem_pedras = ['QUARTZO', 'AGATA', 'AMETISTA', 'TOPAZIO']
+
+        # ================================================================
+        # 2. PROCESSAMENTO DOS INSIGHTS (pré-calculados por combinação de filtros)
+        # ================================================================
+        # Correlação de Pearson entre IDA, IEG, IAA, IPS, IPP, IPV e o INDE (Nota Global), sem nulos
+        correl_inde = agg['correl_inde']
+
+        # ================================================================
+        # 3. CRIAÇÃO DOS GRÁFICOS
+        # ================================================================
+        # Inicializa a figura Matplotlib para o primeiro gráfico de síntese
+        def desenhar(): # Desenha o gráfico (só executa quando a imagem não está em cache)
             fig, ax = plt.subplots(figsize=(8,6))
 
             # Plota as correlações para identificar quais indicadores mais sustentam o INDE
@@ -680,26 +636,27 @@ else: # Inicia a renderização caso existam dados
                 patch.set_edgecolor('none')
 
             plt.tight_layout() # Ajusta o layout para evitar cortes de texto
-            st.pyplot(fig) # Renderiza o gráfico final no Streamlit
+            return fig # Figura renderizada e fechada pelo cache
+        exibir_figura('correl_inde', chave, desenhar) # PNG em cache por (gráfico, filtros, tema)
 
-            st.markdown("""
-            ### 🔎 Priorizar o que realmente move o sucesso
-            O ranking de correlação revela que nem todos os indicadores possuem o mesmo impacto sobre o INDE.
-            """) # Adiciona comentário estratégico abaixo do gráfico
+        st.markdown("""
+        ### 🔎 Priorizar o que realmente move o sucesso
+        O ranking de correlação revela que nem todos os indicadores possuem o mesmo impacto sobre o INDE.
+        """) # Adiciona comentário estratégico abaixo do gráfico
 
-        with col10: # Décima coluna
-            # Inicializa a figura Matplotlib para o segundo gráfico de síntese
+    with col10: # Décima coluna
+        # Inicializa a figura Matplotlib para o segundo gráfico de síntese
+        def desenhar(): # Desenha o gráfico (só executa quando a imagem não está em cache)
             fig, ax = plt.subplots(figsize=(8, 6))
 
             # ---------------- GRÁFICO 2: EVOLUÇÃO EMOCIONAL (IPS) ----------------
             # Analisa se a saúde psicossocial acompanha a evolução das Pedras
-            sns.barplot(
-                data=df_ins, # Utiliza os dados processados na coluna anterior
+            barras_com_ic( # Barras das médias com o intervalo de confiança pré-calculado (sem bootstrap a cada desenho)
+                ax, # Vincula ao eixo
+                agg['ips_pedra'], # Média e intervalo do IPS por pedra
                 x='PEDRA', # Eixo X com os estágios de pedra
                 y='IPS', # Eixo Y com a nota psicossocial
-                palette='Set2', # Paleta Set2 para consistência visual
-                order=ordem_pedras, # Garante a ordem Quartzo -> Topázio
-                ax=ax # Vincula ao eixo
+                ordem=ordem_pedras, # Garante a ordem Quartzo -> Topázio
             ) # Encerra plotagem
 
             # Adiciona rótulos de média no topo de cada barra para leitura precisa
@@ -714,88 +671,128 @@ else: # Inicia a renderização caso existam dados
             # Remove bordas das barras
             for patch in ax.patches:
                 patch.set_edgecolor('none')
-            
+        
             plt.tight_layout() # Ajusta layout
-            st.pyplot(fig) # Renderiza no Streamlit
+            return fig # Figura renderizada e fechada pelo cache
+        exibir_figura('ips_pedra', chave, desenhar) # PNG em cache por (gráfico, filtros, tema)
 
-            st.markdown("""
-            ##### 💎 A Jornada por Pedra Valida a Metodologia
+        st.markdown("""
+        ##### 💎 A Jornada por Pedra Valida a Metodologia
 
-            A progressão consistente dos indicadores ao longo das **Pedras (Quartzo → Ágata → Ametista → Topázio)** comprova que a evolução não é aleatória.
+        A progressão consistente dos indicadores ao longo das **Pedras (Quartzo → Ágata → Ametista → Topázio)** comprova que a evolução não é aleatória.
 
-            Ela é estruturada, é replicável e metodológica.
-            """)# Adiciona comentário estratégico abaixo do gráfico
+        Ela é estruturada, é replicável e metodológica.
+        """)# Adiciona comentário estratégico abaixo do gráfico
 
 
-        st.divider()
+    st.divider()
 
-        st.markdown("""
-        ### 🏆 A Jornada Completa da Transformação
+    st.markdown("""
+    ### 🏆 A Jornada Completa da Transformação
 
-        Ao percorrer cada etapa desta análise, observamos que a jornada do aluno não é linear — ela é estruturada:
+    Ao percorrer cada etapa desta análise, observamos que a jornada do aluno não é linear — ela é estruturada:
 
-        ##### 📍 1. O Ponto de Partida Não Define o Destino
+    ##### 📍 1. O Ponto de Partida Não Define o Destino
 
-        Os dados de **Adequação Escolar (IAN)** mostram que muitos alunos iniciam sua trajetória com defasagem significativa.  
-        Entretanto, ao cruzarmos com o **Potencial Psicopedagógico (IPP)**, percebemos algo fundamental:
+    Os dados de **Adequação Escolar (IAN)** mostram que muitos alunos iniciam sua trajetória com defasagem significativa.  
+    Entretanto, ao cruzarmos com o **Potencial Psicopedagógico (IPP)**, percebemos algo fundamental:
 
-        > A vulnerabilidade inicial não representa ausência de talento — representa ausência de oportunidade.
+    > A vulnerabilidade inicial não representa ausência de talento — representa ausência de oportunidade.
 
-        A ONG entra exatamente nesse ponto crítico.
+    A ONG entra exatamente nesse ponto crítico.
 
-        ---
+    ---
 
-        ##### 📈 2. O Crescimento é Mensurável
+    ##### 📈 2. O Crescimento é Mensurável
 
-        A evolução do **Desempenho Acadêmico (IDA)** ao longo dos anos demonstra que o reforço educacional gera impacto real.
+    A evolução do **Desempenho Acadêmico (IDA)** ao longo dos anos demonstra que o reforço educacional gera impacto real.
 
-        Mas o dado mais revelador surge quando analisamos o **Engajamento (IEG)**:
+    Mas o dado mais revelador surge quando analisamos o **Engajamento (IEG)**:
 
-        > Alunos que atingem o ponto de virada apresentam níveis significativamente maiores de engajamento.
+    > Alunos que atingem o ponto de virada apresentam níveis significativamente maiores de engajamento.
 
-        Isso indica que o sucesso acadêmico não começa na nota — começa na atitude.
+    Isso indica que o sucesso acadêmico não começa na nota — começa na atitude.
 
-        ---
+    ---
 
-        ##### 🧠 3. O Pilar Invisível Sustenta a Jornada
+    ##### 🧠 3. O Pilar Invisível Sustenta a Jornada
 
-        A análise do **Indicador Psicossocial (IPS)** evidencia que estabilidade emocional é pré-condição para aprendizado sustentável.
+    A análise do **Indicador Psicossocial (IPS)** evidencia que estabilidade emocional é pré-condição para aprendizado sustentável.
 
-        Sem segurança emocional, não há progresso consistente.
+    Sem segurança emocional, não há progresso consistente.
 
-        Além disso, o alinhamento entre **Autoavaliação (IAA)** e desempenho real mostra que maturidade emocional acompanha evolução acadêmica.
+    Além disso, o alinhamento entre **Autoavaliação (IAA)** e desempenho real mostra que maturidade emocional acompanha evolução acadêmica.
 
-        ---
+    ---
 
-        ##### 🏆 4. O Que Realmente Move o Sucesso
+    ##### 🏆 4. O Que Realmente Move o Sucesso
 
-        Ao analisarmos a correlação com o **INDE**, identificamos que os maiores drivers de sucesso são:
+    Ao analisarmos a correlação com o **INDE**, identificamos que os maiores drivers de sucesso são:
 
-        - Engajamento (IEG)
-        - Desempenho Acadêmico (IDA)
+    - Engajamento (IEG)
+    - Desempenho Acadêmico (IDA)
 
-        Ou seja:
+    Ou seja:
 
-        > Alta performance é resultado da combinação entre comportamento e competência.
+    > Alta performance é resultado da combinação entre comportamento e competência.
 
-        Quando comparamos a média geral com os alunos Top 20%, essa diferença se torna ainda mais evidente.
+    Quando comparamos a média geral com os alunos Top 20%, essa diferença se torna ainda mais evidente.
 
-        ---
+    ---
 
-        ##### 🎯 Síntese
+    ##### 🎯 Síntese
 
-        Esta análise demonstra que:
+    Esta análise demonstra que:
 
-        ✔ A defasagem inicial não determina o futuro  
-        ✔ O engajamento é o principal motor de transformação  
-        ✔ O apoio psicossocial sustenta o crescimento  
-        ✔ Alta performance pode ser desenvolvida  
-        ✔ A metodologia da ONG é validada por dados
+    ✔ A defasagem inicial não determina o futuro  
+    ✔ O engajamento é o principal motor de transformação  
+    ✔ O apoio psicossocial sustenta o crescimento  
+    ✔ Alta performance pode ser desenvolvida  
+    ✔ A metodologia da ONG é validada por dados
 
-        ✨ A Passos Mágicos não apenas melhora indicadores, mas também transforma trajetórias de vida de forma estruturada e mensurável.
-        """)# Adiciona comentário estratégico final
+    ✨ A Passos Mágicos não apenas melhora indicadores, mas também transforma trajetórias de vida de forma estruturada e mensurável.
+    """)# Adiciona comentário estratégico final
 
 
+# ==========================================================================
+# Dashboard - A Jornada de Transformação (Storytelling)
+# ==========================================================================
+
+st.caption("✨ PEDE Analytics | Ong Passos Mágicos <sup>1</sup>", unsafe_allow_html=True) # Exibe legenda superior estilizada
+st.title("✨ Passos Mágicos: A Jornada da Transformação") # Exibe o título principal do dashboard
+st.markdown("""
+    *Toda criança possui um talento escondido. Nossa missão é lapidar esse potencial. 
+    Abaixo, narramos como os indicadores do PEDE revelam o impacto real na vida dos nossos alunos.*
+""") # Adiciona texto de introdução do storytelling
+st.divider() # Adiciona uma linha divisória horizontal
+
+# --- ORGANIZAÇÃO EM ATOS NARRATIVOS ---
+ATOS = { # Registro de atos: identificador (query param ?ato=) -> (rótulo, função de desenho)
+    'chegada': ("📍 A Chegada", ato_chegada),
+    'desenvolvimento': ("📈 O Desenvolvimento", ato_desenvolvimento),
+    'virada': ("🧠 A Virada de Chave", ato_virada),
+    'consolidacao': ("🏆 A Consolidação", ato_consolidacao),
+    'sintese': ("🌟 Síntese final", ato_sintese),
+} # Encerra o registro de atos
+
+if cubo.linhas(cubo.selecionar(filtro)) == 0: # Verifica se o resultado dos filtros é um conjunto vazio
+    st.warning("Selecione os filtros para iniciar a narrativa.") # Exibe aviso caso não existam dados selecionados
+else: # Inicia a renderização caso existam dados
+    ato_url = st.query_params.get('ato', 'chegada') # Ato compartilhável via link (?ato=virada)
+    ato_url = ato_url if ato_url in ATOS else 'chegada' # Ignora valores desconhecidos
+    st.session_state.setdefault('ato', ato_url) # O link só define o ato inicial da sessão
+    ato = st.segmented_control( # Navegação entre os atos (substitui as abas, que desenhavam todos os atos)
+        "Atos da jornada", options=list(ATOS), format_func=lambda k: ATOS[k][0],
+        key='ato', label_visibility='collapsed', width='stretch',
+    ) or ato_url # Clique no ato já selecionado não o desmarca
+    st.query_params['ato'] = ato # Mantém a URL em sincronia com o ato exibido
+
+    # Apenas o ato selecionado é calculado (memoizado por versão da base, filtros e ato) e desenhado
+    ic = st.query_params.get('ic', METODOS_IC[0]) # Intervalos analíticos; ?ic=bootstrap pede a reamostragem
+    ic = ic if ic in METODOS_IC else METODOS_IC[0] # Ignora valores desconhecidos
+    agg = cache_agregados().obter((versao_fonte, filtro, ato, ic), lambda: calcular_agregados(cubo, df, filtro, ato, ic)) # LRU compartilhado
+    ATOS[ato][1](agg, (versao_fonte, filtro, ic)) # Desenha o ato (figuras em cache pela mesma chave)
+
 # ==========================================================================
 # Rodapé
 # ==========================================================================
@@ -0,0 +1,15 @@
+# ==========================================================================
+# Busca de hiperparâmetros: dobras de tamanhos diferentes
+# ==========================================================================
+
+# Módulos do projeto
+from pede_analytics.treino.base import carregar_base_treino # Base de treino versionada
+from pede_analytics.treino.busca import buscar # Divisões sucessivas
+
+def test_ultima_rodada_com_dobras_desiguais(tmp_path): # len(X) % dobras != 0
+    X, y = carregar_base_treino() # Base completa
+    X, y = X.iloc[:-3], y.iloc[:-3] # Treinos das dobras com tamanhos diferentes
+    assert len(X) % 5 != 0 # Pré-condição do cenário
+    resultado = buscar(X, y, 'logistica', n_configuracoes=9, dobras=5, n_jobs=1, caminho=tmp_path / 'ensaios.sqlite')
+    ultima = resultado[resultado['rodada'] == resultado['rodada'].max()] # Rodada com a dobra inteira
+    assert len(ultima) > 0 and ultima['f2'].notna().all() # Todas as configurações avaliadas